@@ -0,0 +1,145 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Simulator Module
+
+Resolves large batches of attack-only battles at once for balance passes.
+
+Each fight follows exactly the same rules as combat_system.SimpleBattle
+when both sides only attack:
+- the player attacks first, then the enemy, once per round
+- damage = attacker strength - (defender strength // 4), minimum 1
+- the fight ends as soon as one side reaches 0 health
+
+Because the damage per hit never changes during a fight, the number of
+hits each side needs is a ceiling division, so whole batches can be
+resolved with NumPy array math instead of a Python turn loop.
+
+NumPy is optional for the rest of the game; it is only needed here.
+"""
+
+from custom_exceptions import CharacterDeadError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Winner codes used in the 'winner' result array
+WINNER_PLAYER = 1
+WINNER_ENEMY = 2
+
+WINNER_NAMES = {WINNER_PLAYER: 'player', WINNER_ENEMY: 'enemy'}
+
+# ============================================================================
+# BATCH SIMULATION
+# ============================================================================
+
+def simulate_battles(character_health, character_strength, enemy_health,
+                     enemy_strength, xp_reward=None, gold_reward=None):
+    """
+    Resolve N attack-only battles at once.
+
+    All arguments are 1-D sequences/arrays of length N (one row per fight).
+    xp_reward and gold_reward default to 0 for every fight.
+
+    Returns: Dictionary of NumPy arrays:
+            {'winner': WINNER_PLAYER|WINNER_ENEMY codes,
+             'turns': rounds fought (player attacks made),
+             'xp_gained': int, 'gold_gained': int,
+             'character_health': remaining player health,
+             'enemy_health': remaining enemy health}
+
+    'turns' counts rounds, so a SimpleBattle resolved the same way ends with
+    turn_counter == turns - 1 (the counter only advances on full rounds).
+
+    Raises: CharacterDeadError if any character starts with health <= 0
+            ImportError if NumPy is not installed
+    """
+    _require_numpy()
+
+    char_hp = _as_int_array(character_health)
+    char_str = _as_int_array(character_strength)
+    enemy_hp = _as_int_array(enemy_health)
+    enemy_str = _as_int_array(enemy_strength)
+    count = char_hp.shape[0]
+    xp = _as_int_array(xp_reward) if xp_reward is not None else np.zeros(count, dtype=np.int64)
+    gold = _as_int_array(gold_reward) if gold_reward is not None else np.zeros(count, dtype=np.int64)
+
+    for array in (char_str, enemy_hp, enemy_str, xp, gold):
+        if array.shape[0] != count:
+            raise ValueError("All stat arrays must have the same length.")
+
+    if np.any(char_hp <= 0):
+        dead = int(np.count_nonzero(char_hp <= 0))
+        raise CharacterDeadError(f"{dead} character(s) are already dead!")
+
+    # Same formula as SimpleBattle.calculate_damage, applied to every row
+    player_damage = np.maximum(1, char_str - enemy_str // 4)
+    enemy_damage = np.maximum(1, enemy_str - char_str // 4)
+
+    # Hits needed to bring each side to 0 (at least one: the player always swings)
+    player_hits = np.maximum(1, -(-np.maximum(enemy_hp, 0) // player_damage))
+    enemy_hits = np.maximum(1, -(-char_hp // enemy_damage))
+
+    # Player strikes first, so ties go to the player
+    player_wins = player_hits <= enemy_hits
+    turns = np.where(player_wins, player_hits, enemy_hits)
+
+    return {
+        'winner': np.where(player_wins, WINNER_PLAYER, WINNER_ENEMY),
+        'turns': turns,
+        'xp_gained': np.where(player_wins, xp, 0),
+        'gold_gained': np.where(player_wins, gold, 0),
+        'character_health': np.where(player_wins, char_hp - (turns - 1) * enemy_damage, 0),
+        'enemy_health': np.where(player_wins, 0, np.maximum(enemy_hp, 0) - turns * player_damage),
+    }
+
+def simulate_battle_pairs(characters, enemies):
+    """
+    Convenience wrapper: resolve fights from character/enemy dictionaries.
+
+    characters and enemies are equal-length sequences of the same dicts
+    SimpleBattle uses (missing keys default to 0, like SimpleBattle does).
+
+    Returns: Same result dictionary as simulate_battles()
+    """
+    _require_numpy()
+    if len(characters) != len(enemies):
+        raise ValueError("characters and enemies must have the same length.")
+
+    return simulate_battles(
+        [c.get('health', 0) for c in characters],
+        [c.get('strength', 0) for c in characters],
+        [e.get('health', 0) for e in enemies],
+        [e.get('strength', 0) for e in enemies],
+        [e.get('xp_reward', 0) for e in enemies],
+        [e.get('gold_reward', 0) for e in enemies],
+    )
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _require_numpy():
+    """Raise a clear error when NumPy is unavailable"""
+    if np is None:
+        raise ImportError("battle_simulator requires NumPy (pip install numpy).")
+
+def _as_int_array(values):
+    """Convert a sequence to a 1-D int64 array"""
+    array = np.asarray(values, dtype=np.int64)
+    if array.ndim != 1:
+        raise ValueError("Stat arrays must be one-dimensional.")
+    return array
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SIMULATOR TEST ===")
+
+    result = simulate_battles([120, 80], [15, 8], [50, 200], [8, 25], [25, 200], [10, 100])
+    for i in range(len(result['winner'])):
+        print(f"Fight {i}: winner={WINNER_NAMES[int(result['winner'][i])]}, "
+              f"turns={int(result['turns'][i])}, xp={int(result['xp_gained'][i])}")
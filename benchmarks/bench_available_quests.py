@@ -0,0 +1,66 @@
+"""
+Benchmark: get_available_quests on a large quest set
+
+Builds N quests (default 50k, 60% with a prerequisite) and times the
+original check-every-quest approach against get_available_quests given
+a QuestIndex (built once and reused).
+
+Usage: python benchmarks/bench_available_quests.py [quests]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+
+
+def make_quests(count, rng):
+    quests = {}
+    for i in range(count):
+        prereq = f"q{rng.randrange(i)}" if i and rng.random() < 0.6 else 'NONE'
+        quests[f"q{i}"] = {
+            'quest_id': f"q{i}", 'title': f"Quest {i}", 'description': "...",
+            'reward_xp': 100, 'reward_gold': 50,
+            'required_level': rng.randint(1, 50), 'prerequisite': prereq,
+        }
+    return quests
+
+
+def brute_force(character, quests):
+    return [q for qid, q in quests.items() if quest_handler.can_accept_quest(character, qid, quests)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(163)
+    quests = make_quests(count, rng)
+    character = character_manager.create_character("Bench", "Warrior")
+    character['level'] = 10
+    character['completed_quests'] = rng.sample(list(quests), 200)
+
+    start = time.perf_counter()
+    expected = brute_force(character, quests)
+    brute_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = quest_handler.QuestIndex(quests)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(10):
+        result = quest_handler.get_available_quests(character, index)
+    index_seconds = (time.perf_counter() - start) / 10
+
+    assert result == expected
+    print(f"quests: {count}, available: {len(result)}")
+    print(f"check every quest  {brute_seconds * 1000:.1f} ms")
+    print(f"QuestIndex         {index_seconds * 1000:.1f} ms  (one-time build {build_seconds * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
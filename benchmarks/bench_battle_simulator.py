@@ -0,0 +1,78 @@
+"""
+Benchmark: SimpleBattle loop vs battle_simulator.simulate_battles
+
+Runs the same 100k attack-only fights through both engines and reports
+the speedup. Battle output from SimpleBattle is discarded so the timing
+is not dominated by the terminal.
+
+Usage: python benchmarks/bench_battle_simulator.py [fights]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_simulator
+import combat_system
+
+
+def make_fights(count, seed=163):
+    """Build random character/enemy pairs"""
+    rng = random.Random(seed)
+    characters = []
+    enemies = []
+    for _ in range(count):
+        characters.append({'name': 'Hero', 'health': rng.randint(50, 200),
+                           'max_health': 200, 'strength': rng.randint(1, 30)})
+        enemies.append({'name': 'Enemy', 'health': rng.randint(20, 250), 'max_health': 250,
+                        'strength': rng.randint(1, 30), 'xp_reward': 25, 'gold_reward': 10})
+    return characters, enemies
+
+
+def run_loop(characters, enemies):
+    """Resolve every fight with SimpleBattle.start_battle"""
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for char, enemy in zip(characters, enemies):
+            battle = combat_system.SimpleBattle(dict(char), dict(enemy))
+            results.append(battle.start_battle()['winner'])
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    characters, enemies = make_fights(count)
+
+    start = time.perf_counter()
+    loop_winners = run_loop(characters, enemies)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = battle_simulator.simulate_battle_pairs(characters, enemies)
+    batch_time = time.perf_counter() - start
+
+    arrays = [[c['health'] for c in characters], [c['strength'] for c in characters],
+              [e['health'] for e in enemies], [e['strength'] for e in enemies]]
+    arrays = [battle_simulator.np.asarray(a, dtype=battle_simulator.np.int64) for a in arrays]
+    start = time.perf_counter()
+    battle_simulator.simulate_battles(*arrays)
+    array_time = time.perf_counter() - start
+
+    names = [battle_simulator.WINNER_NAMES[int(code)] for code in result['winner']]
+    assert names == loop_winners, "batch results disagree with SimpleBattle"
+
+    print(f"fights:          {count}")
+    print(f"SimpleBattle:    {loop_time:.3f}s")
+    print(f"simulate_battle: {batch_time:.4f}s (incl. dict -> array conversion)")
+    print(f"arrays only:     {array_time:.4f}s")
+    print(f"speedup:         {loop_time / batch_time:.0f}x end-to-end, "
+          f"{loop_time / array_time:.0f}x on prepared arrays")
+
+
+if __name__ == "__main__":
+    main()
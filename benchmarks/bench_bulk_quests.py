@@ -0,0 +1,80 @@
+"""
+Benchmark: completing many quests for many characters (a world event)
+
+Each of N characters (default 2000) has 30 active quests, all completed
+at once. Times a complete_quest loop against complete_quests_for_characters,
+with the quests in a plain dictionary and in a memory-mapped DataPack
+(where every lookup decodes a record).
+
+Usage: python benchmarks/bench_bulk_quests.py [characters]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import data_pack
+import quest_handler
+
+
+def make_quests(count, rng):
+    return {
+        f"q{i}": {
+            'quest_id': f"q{i}", 'title': f"Quest {i}", 'description': "...",
+            'reward_xp': rng.randint(50, 500), 'reward_gold': rng.randint(5, 100),
+            'required_level': 1, 'prerequisite': 'NONE',
+        }
+        for i in range(count)
+    }
+
+
+def make_characters(count, quest_ids):
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i}", "Warrior")
+        character['active_quests'].extend(quest_ids)
+        characters.append(character)
+    return characters
+
+
+def one_at_a_time(characters, quest_ids, quests):
+    for character in characters:
+        for quest_id in quest_ids:
+            quest_handler.complete_quest(character, quest_id, quests)
+
+
+def batched(characters, quest_ids, quests):
+    quest_handler.complete_quests_for_characters(
+        ((character, quest_ids) for character in characters), quests)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(163)
+    quests = make_quests(500, rng)
+    event_quests = rng.sample(list(quests), 30)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pack_path = os.path.join(directory, "quests.pack")
+        data_pack.compile_pack(quests, pack_path, data_pack.KIND_QUEST)
+        with data_pack.open_pack(pack_path) as pack:
+            print(f"characters: {count}, quests each: {len(event_quests)}")
+            for label, source in (("dict", quests), ("DataPack", pack)):
+                results = []
+                for function in (one_at_a_time, batched):
+                    characters = make_characters(count, event_quests)
+                    start = time.perf_counter()
+                    function(characters, event_quests, source)
+                    seconds = time.perf_counter() - start
+                    results.append([character.to_dict() for character in characters])
+                    print(f"{label:<9} {function.__name__:<14} {seconds * 1000:8.1f} ms")
+                assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
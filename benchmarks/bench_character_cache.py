@@ -0,0 +1,53 @@
+"""
+Benchmark: session resumes with and without CharacterCache
+
+Saves N characters (default 1k), then resumes each of them R times
+(default 20) with load_character and with a CharacterCache big enough
+to hold them all.
+
+Usage: python benchmarks/bench_character_cache.py [characters] [resumes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    resumes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    names = [f"Hero{i}" for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name in names:
+            character = character_manager.create_character(name, "Warrior")
+            for n in range(20):
+                character['inventory'].append(f"item_{n % 7}")
+            character_manager.save_character(character, folder)
+
+        start = time.perf_counter()
+        for _ in range(resumes):
+            for name in names:
+                character_manager.load_character(name, folder)
+        uncached = time.perf_counter() - start
+
+        cache = character_manager.CharacterCache(capacity=count, save_directory=folder)
+        start = time.perf_counter()
+        for _ in range(resumes):
+            for name in names:
+                cache.load(name)
+        cached = time.perf_counter() - start
+
+    loads = count * resumes
+    print(f"characters: {count}, resumes each: {resumes}")
+    print(f"load_character  {uncached:.3f}s  ({loads / uncached:,.0f} loads/s)")
+    print(f"CharacterCache  {cached:.3f}s  ({loads / cached:,.0f} loads/s)  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: memory of plain dict characters vs character_manager.Character
+
+Builds N characters both ways (default 200k) and reports the bytes
+allocated per character, measured with tracemalloc.
+
+Usage: python benchmarks/bench_character_memory.py [characters]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def measure(build, count):
+    """Return bytes allocated per character while keeping count of them alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    characters = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del characters
+    return (after - before) / count
+
+
+def build_dict(i):
+    """Character as the original plain dictionary"""
+    return character_manager.create_character(f"Hero{i}", "Warrior").to_dict()
+
+
+def build_compact(i):
+    """Character as the slotted Character object"""
+    return character_manager.create_character(f"Hero{i}", "Warrior")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dict_bytes = measure(build_dict, count)
+    compact_bytes = measure(build_compact, count)
+
+    print(f"characters:        {count}")
+    print(f"dict per char:     {dict_bytes:.0f} bytes")
+    print(f"Character per char:{compact_bytes:.0f} bytes")
+    print(f"saving:            {100 * (1 - compact_bytes / dict_bytes):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
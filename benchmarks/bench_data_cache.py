@@ -0,0 +1,58 @@
+"""
+Benchmark: cold vs warm game_data.load_quests with the parse cache
+
+Generates a quest file (100k quests by default) in a temporary folder,
+then times a plain parse, a cold cached load (parse + cache write) and a
+warm cached load (cache hit).
+
+Usage: python benchmarks/bench_data_cache.py [quests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+
+def write_quest_file(path, count):
+    """Write count quests in the data/quests.txt format"""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            prereq = f"quest_{i - 1}" if i % 10 else "NONE"
+            f.write(f"QUEST_ID: quest_{i}\nTITLE: Quest {i}\n"
+                    f"DESCRIPTION: Generated quest number {i}\n"
+                    f"REWARD_XP: {50 + i % 200}\nREWARD_GOLD: {10 + i % 90}\n"
+                    f"REQUIRED_LEVEL: {1 + i % 50}\nPREREQUISITE: {prereq}\n\n")
+
+
+def timed(func, *args, **kwargs):
+    """Return (seconds, result)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "quests.txt")
+        write_quest_file(path, count)
+
+        parse_time, parsed = timed(game_data.load_quests, path)
+        cold_time, _ = timed(game_data.load_quests, path, use_cache=True)
+        warm_time, warm = timed(game_data.load_quests, path, use_cache=True)
+        assert warm == parsed
+
+        print(f"quests:            {count}")
+        print(f"parse (no cache):  {parse_time:.3f}s")
+        print(f"cold (write cache):{cold_time:.3f}s")
+        print(f"warm (cache hit):  {warm_time:.3f}s")
+        print(f"warm speedup:      {parse_time / warm_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: full saves vs delta saves in an autosave loop
+
+N characters (default 2k) with 20-item inventories are saved once, then
+autosaved R times (default 10), changing only health and gold between
+autosaves. Compares save_character (full rewrite every time) with
+save_character_changes (append the changed fields, compact when the log
+passes DELTA_LOG_LIMIT).
+
+Usage: python benchmarks/bench_delta_saves.py [characters] [rounds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+
+
+def make_character(i):
+    character = character_manager.create_character(f"Hero{i}", "Warrior")
+    for n in range(20):
+        character['inventory'].append(f"item_{n % 7}")
+    character['active_quests'] = ["first_steps", "goblin_problem"]
+    character['completed_quests'] = ["tutorial"]
+    return character
+
+
+def folder_bytes(folder):
+    """Bytes in save files and delta logs (both approaches append the same index lines)"""
+    return sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder)
+               if f != save_backends.INDEX_FILENAME)
+
+
+def timed_autosaves(save, count, rounds):
+    """Return (seconds, bytes written) for rounds autosaves of count characters"""
+    characters = [make_character(i) for i in range(count)]
+    with tempfile.TemporaryDirectory() as folder:
+        for character in characters:
+            character_manager.save_character(character, folder)
+        written = 0
+        seconds = 0.0
+        for round_number in range(rounds):
+            for character in characters:
+                character['health'] -= 1
+                character['gold'] += round_number
+            before = folder_bytes(folder)
+            start = time.perf_counter()
+            for character in characters:
+                save(character, folder)
+            seconds += time.perf_counter() - start
+            # Full saves rewrite every file; deltas only grow the logs
+            after = folder_bytes(folder)
+            written += after if save is character_manager.save_character else max(after - before, 0)
+        return seconds, written
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"characters: {count}, autosaves each: {rounds}")
+    for label, save in (("full save", character_manager.save_character),
+                        ("delta save", character_manager.save_character_changes)):
+        seconds, written = timed_autosaves(save, count, rounds)
+        saves = count * rounds
+        print(f"{label:10} {seconds:.3f}s  ({saves / seconds:,.0f} saves/s)  "
+              f"{written / saves:.0f} bytes written per save")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: get_quests_by_level range queries
+
+For 10k, 100k and 1M quests (required levels 1-100), times the original
+list-comprehension scan against QuestIndex.quests_by_level for a narrow
+(one level) and a wide (ten levels) range.
+
+Usage: python benchmarks/bench_quests_by_level.py [quests ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+
+
+def make_quests(count, rng):
+    return {
+        f"q{i}": {
+            'quest_id': f"q{i}", 'title': f"Quest {i}", 'description': "...",
+            'reward_xp': 100, 'reward_gold': 50,
+            'required_level': rng.randint(1, 100), 'prerequisite': 'NONE',
+        }
+        for i in range(count)
+    }
+
+
+def scan(quests, min_level, max_level):
+    return [q for q in quests.values() if min_level <= q['required_level'] <= max_level]
+
+
+def time_calls(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    rng = random.Random(163)
+    print(f"{'quests':>9}  {'range':>6}  {'matches':>8}  {'scan ms':>9}  {'index ms':>9}  {'build ms':>9}")
+    for count in counts:
+        quests = make_quests(count, rng)
+        start = time.perf_counter()
+        index = quest_handler.QuestIndex(quests)
+        build_seconds = time.perf_counter() - start
+        repeat = max(1, 1_000_000 // count)
+
+        for low, high in ((50, 50), (41, 50)):
+            scan_seconds, expected = time_calls(lambda: scan(quests, low, high), repeat)
+            index_seconds, result = time_calls(lambda: index.quests_by_level(low, high), repeat)
+            assert result == expected
+            print(f"{count:>9}  {low:>3}-{high:<2}  {len(result):>8}  {scan_seconds * 1000:>9.2f}  "
+                  f"{index_seconds * 1000:>9.2f}  {build_seconds * 1000:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: text vs binary save encoding
+
+Encodes and decodes N characters (default 20k), each carrying a
+20-item inventory and a few quests, in both save formats.
+
+Usage: python benchmarks/bench_save_format.py [characters]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def make_character(i):
+    character = character_manager.create_character(f"Hero{i}", "Warrior")
+    for n in range(20):
+        character['inventory'].append(f"item_{n % 7}")
+    character['active_quests'] = ["first_steps", "goblin_problem"]
+    character['completed_quests'] = ["tutorial"]
+    return character
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    characters = [make_character(i) for i in range(count)]
+
+    print(f"characters: {count}")
+    for save_format in (character_manager.SAVE_FORMAT_TEXT, character_manager.SAVE_FORMAT_BINARY):
+        start = time.perf_counter()
+        blobs = [character_manager.encode_save_data(c, save_format) for c in characters]
+        encode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for blob in blobs:
+            character_manager.decode_save_data(blob)
+        decode_seconds = time.perf_counter() - start
+
+        size = sum(len(blob) for blob in blobs) / count
+        print(f"{save_format:7} encode {encode_seconds:.3f}s  decode {decode_seconds:.3f}s  "
+              f"{size:.0f} bytes/save")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: save_character throughput
+
+Saves N characters (default 10k) into a temporary folder with:
+- the old approach (open in place, twelve separate writes)
+- save_character (one buffered write to a temp file + os.replace)
+- save_character with fsync=True (durable, much slower on real disks)
+- save_characters (one call for the whole batch, thread-pool writes)
+
+Usage: python benchmarks/bench_save_throughput.py [characters]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def legacy_save(character, save_directory):
+    """The original in-place save: not crash safe"""
+    os.makedirs(save_directory, exist_ok=True)
+    filepath = os.path.join(save_directory, f"{character['name']}_save.txt")
+    with open(filepath, "w") as f:
+        for line in character_manager.format_save_data(character).splitlines(True):
+            f.write(line)
+
+
+def timed_run(save, characters):
+    """Save every character into a fresh folder; return seconds"""
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        for character in characters:
+            save(character, folder)
+        return time.perf_counter() - start
+
+
+def timed_batch(characters):
+    """Save every character with one save_characters call; return seconds"""
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        character_manager.save_characters(characters, folder)
+        return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    characters = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(count)]
+
+    runs = [
+        ("in-place, 12 writes", legacy_save),
+        ("atomic", character_manager.save_character),
+        ("atomic + fsync", lambda c, d: character_manager.save_character(c, d, fsync=True)),
+    ]
+    print(f"characters: {count}")
+    for label, save in runs:
+        seconds = timed_run(save, characters)
+        print(f"{label:22} {seconds:.3f}s  ({count / seconds:,.0f} saves/s)")
+    seconds = timed_batch(characters)
+    print(f"{'batch':22} {seconds:.3f}s  ({count / seconds:,.0f} saves/s)")
+
+
+if __name__ == "__main__":
+    main()
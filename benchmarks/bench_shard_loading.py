@@ -0,0 +1,57 @@
+"""
+Benchmark: sequential vs parallel loading of sharded quest files
+
+Writes N shard files (default 32 x 5k quests) to a temporary folder and
+times game_data.load_quest_shards with 1 worker and with one worker per CPU.
+The parallel speedup is bounded by the number of CPUs available.
+
+Usage: python benchmarks/bench_shard_loading.py [shards] [quests_per_shard]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+
+def write_shard(path, shard, count):
+    """Write one shard of generated quests"""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            quest_id = f"s{shard}_q{i}"
+            f.write(f"QUEST_ID: {quest_id}\nTITLE: Quest {quest_id}\n"
+                    f"DESCRIPTION: Generated quest {quest_id}\n"
+                    f"REWARD_XP: {50 + i % 200}\nREWARD_GOLD: {10 + i % 90}\n"
+                    f"REQUIRED_LEVEL: {1 + i % 50}\nPREREQUISITE: NONE\n\n")
+
+
+def main():
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_shard = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    with tempfile.TemporaryDirectory() as folder:
+        for shard in range(shards):
+            write_shard(os.path.join(folder, f"quests_{shard:03d}.txt"), shard, per_shard)
+        pattern = os.path.join(folder, "*.txt")
+
+        start = time.perf_counter()
+        sequential = game_data.load_quest_shards(pattern, max_workers=1)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = game_data.load_quest_shards(pattern)
+        parallel_time = time.perf_counter() - start
+        assert parallel == sequential
+
+    print(f"shards x quests: {shards} x {per_shard}")
+    print(f"cpus:            {os.cpu_count()}")
+    print(f"sequential:      {sequential_time:.3f}s")
+    print(f"parallel:        {parallel_time:.3f}s")
+    print(f"speedup:         {sequential_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
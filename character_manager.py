@@ -9,7 +9,24 @@ AI Usage: [Document any AI assistance used]
 This module handles character creation, loading, and saving.
 """
 
+import asyncio
+import math
 import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from inventory_system import Inventory
+from save_backends import TextFileBackend
+from save_format import (
+    encode_character,
+    decode_character,
+    is_binary_save,
+    snapshot_checksum,
+    encode_delta,
+    decode_deltas
+)
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +35,273 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# ============================================================================ 
+# CHARACTER MODEL
+# ============================================================================ 
+
+# Keys every character has, in save-file order
+CHARACTER_FIELDS = (
+    "name", "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold",
+    "inventory", "active_quests", "completed_quests"
+)
+
+# Keys other modules add later (missing until first assigned)
+OPTIONAL_CHARACTER_FIELDS = ("equipped_weapon", "equipped_armor", "special_cooldown")
+
+# Save formats (load_character detects which one a save uses); binary is
+# opt-in so save files stay readable by older copies of the game
+SAVE_FORMAT_TEXT = "text"
+SAVE_FORMAT_BINARY = "binary"
+DEFAULT_SAVE_FORMAT = SAVE_FORMAT_TEXT
+
+# save_character_changes() compacts the delta log into a full save past this size
+DELTA_LOG_LIMIT = 4096
+
+# Most blocking save/load calls the async API runs at once (per event loop)
+ASYNC_IO_LIMIT = 8
+
+_SLOT_ORDER = CHARACTER_FIELDS + OPTIONAL_CHARACTER_FIELDS
+_SLOT_FIELDS = frozenset(_SLOT_ORDER)
+
+class QuestLog:
+    """
+    Insertion-ordered set of quest ids (for active_quests / completed_quests)
+    
+    Backed by a dict, so 'in', append and remove are O(1) instead of list
+    scans, while iteration keeps the order quests were added (for display
+    and saving). It supports the list operations the quest functions use
+    (append, remove, in, len, iteration, == with lists), so code written
+    for plain lists keeps working. A quest id is stored at most once;
+    appending one that is already present does nothing.
+    
+    version counts the changes made to the log, so values derived from it
+    (like quest_handler's reward totals) can tell when they are stale.
+    """
+    
+    __slots__ = ("_ids", "version")
+    
+    def __init__(self, quest_ids=()):
+        """Create a quest log, optionally from a list of quest ids"""
+        self._ids = dict.fromkeys(quest_ids)
+        self.version = 0
+    
+    def append(self, quest_id):
+        """Add a quest id at the end (no-op if already present)"""
+        self._ids[quest_id] = None
+        self.version += 1
+    
+    def extend(self, quest_ids):
+        """Append several quest ids"""
+        for quest_id in quest_ids:
+            self._ids[quest_id] = None
+        self.version += 1
+    
+    def remove(self, quest_id):
+        """
+        Remove a quest id
+        
+        Raises: ValueError if it is not present (same as list.remove)
+        """
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"QuestLog.remove(x): {quest_id!r} not in quest log") from None
+        self.version += 1
+    
+    def discard(self, quest_id):
+        """Remove a quest id if present"""
+        self._ids.pop(quest_id, None)
+        self.version += 1
+    
+    def clear(self):
+        """Remove every quest id"""
+        self._ids.clear()
+        self.version += 1
+    
+    def copy(self):
+        """Independent copy of this quest log"""
+        duplicate = QuestLog()
+        duplicate._ids = self._ids.copy()
+        return duplicate
+    
+    def to_list(self):
+        """List of quest ids in order (the save-file format)"""
+        return list(self._ids)
+    
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __getitem__(self, position):
+        # Positional access is O(n); kept for list compatibility only
+        return list(self._ids)[position]
+    
+    def __eq__(self, other):
+        # Order matters, like comparing lists
+        if isinstance(other, QuestLog):
+            return list(self._ids) == list(other._ids)
+        if isinstance(other, (list, tuple)):
+            return list(self._ids) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"QuestLog({self.to_list()!r})"
+
+# Character fields holding quest ids
+_QUEST_LOG_FIELDS = ("active_quests", "completed_quests")
+
+class Character(MutableMapping):
+    """
+    Memory-compact character that behaves like the old character dictionary
+    
+    Known keys live in __slots__ instead of a per-character dict, which
+    keeps large numbers of resident characters small. Any other key
+    (e.g. a stat added by an item effect) goes into a small overflow dict
+    that is only created when needed.
+    
+    Supports character['key'], character['key'] = value, 'key' in character,
+    get, setdefault, keys/items/values, len and == with plain dicts, so
+    inventory_system, quest_handler and combat_system work unchanged.
+    
+    After mark_clean() the character also tracks which fields changed
+    (dirty_fields()), so save_character_changes() can write just those.
+    
+    quest_totals holds quest_handler's running reward totals. It is not a
+    key and is never saved; a loaded character starts without totals.
+    """
+    
+    __slots__ = _SLOT_ORDER + ("_extra", "_save_state", "quest_totals")
+    
+    def __init__(self, data=None):
+        """Create a character, optionally copying keys from a mapping"""
+        self._extra = None
+        self._save_state = None  # _SaveState once change tracking starts
+        self.quest_totals = None
+        if data is not None:
+            for key, value in data.items():
+                self[key] = value
+    
+    def __getitem__(self, key):
+        if key in _SLOT_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        if self._save_state is not None:
+            self._save_state.dirty.add(key)
+        if key in _SLOT_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key):
+        if self._save_state is not None:
+            self._save_state.dirty.add(key)
+        if key in _SLOT_FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+    
+    def __contains__(self, key):
+        if key in _SLOT_FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+    
+    def __iter__(self):
+        for key in _SLOT_ORDER:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from list(self._extra)
+    
+    def __len__(self):
+        return sum(1 for key in self)
+    
+    def get(self, key, default=None):
+        """Same as dict.get, without the exception round-trip of Mapping.get"""
+        if key in _SLOT_FIELDS:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+    
+    def copy(self):
+        """Shallow copy, like dict.copy"""
+        return Character(self)
+    
+    def to_dict(self):
+        """Plain dictionary version of this character"""
+        return dict(self.items())
+    
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+    
+    # --- Change tracking ---------------------------------------------------
+    
+    def mark_clean(self):
+        """Start (or restart) tracking changes from the current values"""
+        if self._save_state is None:
+            self._save_state = _SaveState()
+        state = self._save_state
+        state.dirty = set()
+        # Lists are changed in place (inventory.append(...)), which never
+        # reaches __setitem__, so remember their contents to compare later
+        state.containers = {}
+        values = [(key, getattr(self, key, None)) for key in ("inventory", "active_quests", "completed_quests")]
+        if self._extra is not None:
+            values.extend(self._extra.items())
+        for key, value in values:
+            if isinstance(value, (list, Inventory, QuestLog)):
+                state.containers[key] = value.copy()
+    
+    def dirty_fields(self):
+        """
+        Fields changed since the last mark_clean()
+        
+        Returns: Set of field names (including deleted ones),
+                 or None if changes are not being tracked
+        """
+        state = self._save_state
+        if state is None:
+            return None
+        dirty = set(state.dirty)
+        for key, saved in state.containers.items():
+            if key not in dirty and self.get(key) != saved:
+                dirty.add(key)
+        return dirty
+
+class _SaveState:
+    """Change-tracking data kept on a Character that has been saved or loaded"""
+    
+    __slots__ = ("dirty", "containers", "snapshot_crc", "log_size", "version")
+    
+    def __init__(self):
+        self.dirty = set()
+        self.containers = {}
+        self.snapshot_crc = None  # Checksum of the full save deltas apply to
+        self.log_size = None  # Bytes in the delta log; None = compact on next save
+        self.version = None  # backend.version() as this character last left it
+
 # ============================================================================ 
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================ 
@@ -29,7 +313,7 @@ def create_character(name, character_class):
     Valid classes: Warrior, Mage, Rogue, Cleric
     
     Returns:
-        Dictionary with character data including:
+        Character (dictionary-like) with character data including:
         - name, class, level, health, max_health, strength, magic
         - experience, gold, inventory, active_quests, completed_quests
     
@@ -55,8 +339,8 @@ def create_character(name, character_class):
         raise InvalidCharacterClassError(f"Invalid class: {character_class}")
 
     stats = valid_classes[character_class]
-    # Build the character as a dictionary
-    return {
+    # Build the character (a compact dictionary-like object)
+    return Character({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -66,21 +350,39 @@ def create_character(name, character_class):
         "magic": stats["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+        "inventory": Inventory(),
+        "active_quests": QuestLog(),
+        "completed_quests": QuestLog()
+    })
 
 # ============================================================================ 
 # SAVE / LOAD FUNCTIONS
 # ============================================================================ 
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", fsync=False, backend=None,
+                   save_format=DEFAULT_SAVE_FORMAT):
     """
     Save character to file.
     
     Filename format: {character_name}_save.txt
     
+    save_format is SAVE_FORMAT_TEXT (default: the original "KEY: value"
+    lines, core fields only) or SAVE_FORMAT_BINARY (opt-in: compact, keeps
+    optional and extra fields). The file name is the same for both and
+    load_character detects which one a save uses.
+    
+    The whole file is built in memory, written to a temp file in the same
+    folder with one write, then renamed over the old save with os.replace.
+    A crash part-way through leaves the previous save untouched, never a
+    half-written one. fsync=True also flushes the data to disk before the
+    rename (slower, but survives power loss).
+    
+    backend: optional storage backend from save_backends (e.g. SQLiteBackend);
+    when given, save_directory and fsync are ignored.
+    
+    A full save also clears the character's delta log (see
+    save_character_changes).
+    
     Returns:
         True if successful
     
@@ -91,49 +393,132 @@ def save_character(character, save_directory="data/save_games"):
     # Make sure the save folder exists. If it doesn't, Python creates it.
     # 'exist_ok=True' prevents errors if the folder is already there.
     validate_character_data(character)
-    os.makedirs(save_directory, exist_ok=True)  # used ai to import directories
+    if backend is None:
+        # Default: {save_directory}/{name}_save.txt, folder created if needed
+        backend = TextFileBackend(save_directory, fsync)
+
+    data = encode_save_data(character, save_format)
+    backend.write(character['name'], data)  # Also clears any delta log
+    backend.update_summaries([_save_summary(character)])
+    _track_changes(character, snapshot_checksum(data), 0, backend.version(character['name']))
+    return True
+
+def save_character_changes(character, save_directory="data/save_games", fsync=False,
+                           backend=None, max_log_bytes=DELTA_LOG_LIMIT):
+    """
+    Save only the fields that changed since the character was last saved or loaded.
+    
+    The changed fields are appended to the character's delta log instead
+    of rewriting the whole save. Falls back to a full save_character()
+    (which also compacts the log) when:
+    - the character was never saved/loaded as a Character
+    - the log would grow past max_log_bytes, or ends in a torn record
+    - the name changed
+    - the save on disk changed since this character was saved, loaded or
+      last appended to it (another copy of the character was saved since),
+      so a delta against it could be lost; this is checked with one cheap
+      backend.version() call, without reading the save
+    
+    The save index summary is not updated here; it catches up on the next
+    full save (including compaction).
+    
+    The version check and the append are separate steps, so two
+    processes saving the same character at the same moment are not
+    protected against each other.
+    
+    Nothing is written when no field changed.
+    
+    Returns:
+        True if successful
+    
+    Raises:
+        Same as save_character
+    """
+    state = character._save_state if isinstance(character, Character) else None
+    if state is None or state.log_size is None:
+        return save_character(character, save_directory, fsync, backend)
 
+    dirty = character.dirty_fields()
+    if not dirty:
+        return True
+    if 'name' in dirty:
+        return save_character(character, save_directory, fsync, backend)
 
-    # Create a file name using the character's name.
-    filename = f"{character['name']}_save.txt"
+    validate_character_data(character)
+    changes = {key: character[key] for key in dirty if key in character}
+    removed = [key for key in dirty if key not in character]
+    record = encode_delta(state.snapshot_crc, changes, removed)
+    if state.log_size + len(record) > max_log_bytes:
+        # Compact: one full save replaces the snapshot and the whole log
+        return save_character(character, save_directory, fsync, backend)
+
+    if backend is None:
+        backend = TextFileBackend(save_directory, fsync)
+    if state.version is None or backend.version(character['name']) != state.version:
+        return save_character(character, save_directory, fsync, backend)
 
-    # Join the folder path and file name into a full file path.
-    filepath = os.path.join(save_directory, filename)
+    log_size = backend.append_delta(character['name'], record)
+    character.mark_clean()
+    state.log_size = log_size
+    state.version = backend.version(character['name'])
+    return True
 
+def encode_save_data(character, save_format=DEFAULT_SAVE_FORMAT):
+    """
+    Build the bytes of a save in the given format.
+    
+    Returns:
+        bytes
+    
+    Raises:
+        ValueError: if save_format is unknown
+        InvalidSaveDataError: if a field cannot be stored in binary
+    """
+    if save_format == SAVE_FORMAT_BINARY:
+        return encode_character(character)
+    if save_format == SAVE_FORMAT_TEXT:
+        return format_save_data(character).encode("utf-8")
+    raise ValueError(f"Unknown save format: {save_format}")
+
+def format_save_data(character):
+    """
+    Build the text of a save file.
+    
+    Returns:
+        String with one "KEY: value" line per field
+    """
     # Convert lists into simple comma-separated text.
     # Text files can't store lists directly, so I turn them into strings.
     inventory_str = ",".join(character["inventory"])
     active_quests_str = ",".join(character["active_quests"])
     completed_quests_str = ",".join(character["completed_quests"])
 
-    # Open the file in write mode ("w"). If the file doesn't exist, Python creates it.
-    # Using 'with' automatically closes the file when we're done.
-    with open(filepath, "w") as f:
-        f.write(f"NAME: {character['name']}\n")
-        f.write(f"CLASS: {character['class']}\n")
-        f.write(f"LEVEL: {character['level']}\n")
-        f.write(f"HEALTH: {character['health']}\n")
-        f.write(f"MAX_HEALTH: {character['max_health']}\n")
-        f.write(f"STRENGTH: {character['strength']}\n")
-        f.write(f"MAGIC: {character['magic']}\n")
-        f.write(f"EXPERIENCE: {character['experience']}\n")
-        f.write(f"GOLD: {character['gold']}\n")
-        f.write(f"INVENTORY: {inventory_str}\n")
-        f.write(f"ACTIVE_QUESTS: {active_quests_str}\n")
-        f.write(f"COMPLETED_QUESTS: {completed_quests_str}\n")
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {inventory_str}\n"
+        f"ACTIVE_QUESTS: {active_quests_str}\n"
+        f"COMPLETED_QUESTS: {completed_quests_str}\n"
+    )
 
-    return True
-
-def load_character(character_name, save_directory="data/save_games"):
+def load_character(character_name, save_directory="data/save_games", backend=None):
     """
     Load character from save file.
     
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
+        backend: optional storage backend (overrides save_directory)
     
     Returns:
-        Character dictionary
+        Character (dictionary-like)
     
     Raises: 
         CharacterNotFoundError: if save file doesn't exist
@@ -141,20 +526,71 @@ def load_character(character_name, save_directory="data/save_games"):
         InvalidSaveDataError: if data format is wrong
     """
     # TODO: Implement load functionality
-    # Build the full path to the character's save file
-    filepath = os.path.join(save_directory, f"{character_name}_save.txt")
+    if backend is None:
+        backend = TextFileBackend(save_directory)
 
-    # Check if the file exists
-    if not os.path.exists(filepath):
-        raise CharacterNotFoundError(f"Save file for '{character_name}' not found.")
+    # Taken before reading, so a save made in between shows up as a change
+    version = backend.version(character_name)
+    # Raises CharacterNotFoundError / SaveFileCorruptedError
+    data = backend.read(character_name)
+    character = decode_save_data(data)
+    _apply_delta_log(character, data, backend.read_deltas(character_name), version)
+    return character
+
+def decode_save_data(data):
+    """
+    Turn save bytes in either format back into a character.
+    
+    Binary saves are recognised by their magic bytes; anything else is
+    read as a text save.
+    
+    Returns:
+        Character (dictionary-like)
+    
+    Raises:
+        SaveFileCorruptedError: if a text save is not valid UTF-8
+        InvalidSaveDataError: if data format is wrong
+    """
+    if is_binary_save(data):
+        return parse_binary_save_data(data)
 
-    # Try to read the file
     try:
-        with open(filepath, "r") as f:
-            lines = f.readlines()
-    except Exception as e:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
         raise SaveFileCorruptedError(f"Could not read save file: {e}")
 
+    return parse_save_data(text)
+
+def parse_binary_save_data(data):
+    """
+    Turn a binary save back into a character.
+    
+    Unknown fields are kept on the character, so saves from newer
+    versions of the game load without losing data.
+    
+    Returns:
+        Character (dictionary-like)
+    
+    Raises:
+        InvalidSaveDataError: if data is corrupted or from a newer format version
+    """
+    # The core fields are always present and typed; extras follow them
+    fields = decode_character(data)
+    fields["inventory"] = Inventory(fields["inventory"])
+    for field in _QUEST_LOG_FIELDS:
+        fields[field] = QuestLog(fields[field])
+    return Character(fields)
+
+def parse_save_data(text):
+    """
+    Turn the text of a save file back into a character.
+    
+    Returns:
+        Character (dictionary-like)
+    
+    Raises:
+        InvalidSaveDataError: if data format is wrong
+    """
     # List of all fields we expect to find in a save file
     expected_keys = {
         "NAME", "CLASS", "LEVEL", "HEALTH", "MAX_HEALTH",
@@ -165,7 +601,7 @@ def load_character(character_name, save_directory="data/save_games"):
     data = {}  # empty dictionary for key values
 
     # check for mistakes
-    for line in lines:
+    for line in text.splitlines():
         if ":" not in line:
             # If a line doesn't have a colon, the file is broken
             raise InvalidSaveDataError("Malformed line in save file.")
@@ -187,7 +623,7 @@ def load_character(character_name, save_directory="data/save_games"):
 
     # Convert text values to the correct types
     try:
-        character = {
+        character = Character({
             "name": data["NAME"],  # Already text
             "class": data["CLASS"],  # Already text
             "level": int(data["LEVEL"]),  # Convert string to integer
@@ -198,17 +634,112 @@ def load_character(character_name, save_directory="data/save_games"):
             "experience": int(data["EXPERIENCE"]),  # Convert string to integer
             "gold": int(data["GOLD"]),  # Convert string to integer
             # Convert comma-separated strings back to lists. If empty, use empty list
-            "inventory": data["INVENTORY"].split(",") if data["INVENTORY"] else [],
-            "active_quests": data["ACTIVE_QUESTS"].split(",") if data["ACTIVE_QUESTS"] else [],
-            "completed_quests": data["COMPLETED_QUESTS"].split(",") if data["COMPLETED_QUESTS"] else []
-        }
+            "inventory": Inventory(data["INVENTORY"].split(",") if data["INVENTORY"] else []),
+            "active_quests": QuestLog(data["ACTIVE_QUESTS"].split(",") if data["ACTIVE_QUESTS"] else []),
+            "completed_quests": QuestLog(data["COMPLETED_QUESTS"].split(",") if data["COMPLETED_QUESTS"] else [])
+        })
     except ValueError:
         # If conversion fails, the save file has bad numbers
         raise InvalidSaveDataError("Numeric fields in save data contain invalid values.")
 
     return character
 
-def list_saved_characters(save_directory="data/save_games"):
+def save_characters(characters, save_directory="data/save_games", backend=None,
+                    save_format=DEFAULT_SAVE_FORMAT):
+    """
+    Save many characters in one call (e.g. a periodic autosave).
+    
+    Every character is validated and formatted first; the valid ones are
+    then handed to the backend in one batch (one folder check and a
+    thread pool of file writes for text files, one transaction for SQLite).
+    A bad character does not stop the others from being saved.
+    
+    Returns:
+        List of {'name', 'success', 'error'} dicts, in input order
+        ('error' is the exception, or None on success)
+    """
+    if backend is None:
+        backend = TextFileBackend(save_directory)
+
+    results = []
+    pending = []  # (result, (name, data)) for characters that passed validation
+    for character in characters:
+        result = {'name': None, 'success': False, 'error': None}
+        results.append(result)
+        try:
+            validate_character_data(character)
+            result['name'] = character['name']
+            pending.append((character, result, (character['name'], encode_save_data(character, save_format))))
+        except Exception as e:
+            result['error'] = e
+
+    if pending:
+        errors = backend.write_many([entry for character, result, entry in pending])
+        for (character, result, entry), error in zip(pending, errors):
+            result['success'] = error is None
+            result['error'] = error
+            if error is None:
+                _track_changes(character, snapshot_checksum(entry[1]), 0, backend.version(entry[0]))
+        saved = [character for character, result, entry in pending if result['success']]
+        backend.update_summaries([_save_summary(character) for character in saved])
+
+    return results
+
+def load_characters(character_names, save_directory="data/save_games", backend=None):
+    """
+    Load many characters in one call.
+    
+    Reads are batched by the backend (thread pool for text files, batched
+    queries for SQLite); a missing or broken save only fails its own entry.
+    
+    Returns:
+        List of {'name', 'success', 'character', 'error'} dicts, in input order
+        ('character' is None and 'error' holds the exception on failure)
+    """
+    if backend is None:
+        backend = TextFileBackend(save_directory)
+
+    names = list(character_names)
+    versions = [backend.version(name) for name in names]  # Before reading, as in load_character
+    results = []
+    for name, version, data in zip(names, versions, backend.read_many(names)):
+        result = {'name': name, 'success': False, 'character': None, 'error': None}
+        try:
+            if isinstance(data, Exception):
+                raise data
+            result['character'] = decode_save_data(data)
+            _apply_delta_log(result['character'], data, backend.read_deltas(name), version)
+            result['success'] = True
+        except Exception as e:
+            result['error'] = e
+        results.append(result)
+    return results
+
+def _apply_delta_log(character, snapshot, log, version):
+    """Replay a delta log onto a freshly loaded character, then start tracking"""
+    snapshot_crc = snapshot_checksum(snapshot)
+    deltas, intact = decode_deltas(log, snapshot_crc)
+    for changes, removed in deltas:
+        for key, value in changes.items():
+            if key == "inventory":
+                value = Inventory(value)
+            elif key in _QUEST_LOG_FIELDS:
+                value = QuestLog(value)
+            character[key] = value
+        for key in removed:
+            character.pop(key, None)
+    # A torn log cannot be appended to safely: compact on the next save
+    _track_changes(character, snapshot_crc, len(log) if intact else None, version)
+
+def _track_changes(character, snapshot_crc, log_size, version):
+    """Record which full save a Character matches and start tracking changes"""
+    if isinstance(character, Character):
+        character.mark_clean()
+        character._save_state.snapshot_crc = snapshot_crc
+        character._save_state.log_size = log_size
+        character._save_state.version = version
+
+def list_saved_characters(save_directory="data/save_games", backend=None):
     """
     Get list of all saved character names.
     
@@ -216,21 +747,64 @@ def list_saved_characters(save_directory="data/save_games"):
         List of character names (without _save.txt extension)
     """
     # TODO: Implement this function
-    import os  # Needed to work with folders and files
+    if backend is None:
+        backend = TextFileBackend(save_directory)
+    return backend.list_names()
+
+def list_saved_character_summaries(save_directory="data/save_games", backend=None):
+    """
+    Get a summary of every saved character from the save index.
+    
+    Costs one small index read and one backend.saved_times() call (a
+    single folder scan or query, which also lists the saves). Saves the index does not know yet (e.g. made before the index
+    existed), and saves written after their index entry (a crash between
+    replacing the save and appending its summary), are loaded once and
+    their entry rewritten; a save that cannot be loaded is listed with
+    None values.
+    
+    Summaries describe the last full save: changes written with
+    save_character_changes() show up after the next full save or
+    compaction.
+    
+    Returns:
+        List of {'name', 'class', 'level', 'gold', 'saved_at'} dicts,
+        sorted by name
+    """
+    if backend is None:
+        backend = TextFileBackend(save_directory)
+
+    saved_times = backend.saved_times()
+    summaries = backend.read_summaries()
 
-    # If the save folder does not exist, return an empty list
-    if not os.path.exists(save_directory):
-        return []
+    missing = [name for name, saved_at in saved_times.items()
+               if name not in summaries or _summary_is_stale(summaries[name], saved_at)]
+    if missing:
+        rebuilt = []
+        for result in load_characters(missing, backend=backend):
+            if result['success']:
+                summary = _save_summary(result['character'])
+                summary['saved_at'] = saved_times[result['name']]
+                rebuilt.append(summary)
+                summaries[result['name']] = summary
+            else:
+                summaries[result['name']] = {'name': result['name'], 'class': None,
+                                             'level': None, 'gold': None, 'saved_at': None}
+        backend.update_summaries(rebuilt)
 
-    # List all files in the save folder
-    files = os.listdir(save_directory)
+    return [summaries[name] for name in sorted(saved_times)]
 
-    # Filter only files that end with "_save.txt" and remove that suffix
-    character_names = [f[:-9] for f in files if f.endswith("_save.txt")]
+def _summary_is_stale(summary, last_saved):
+    """True if the save was replaced after its index entry was written"""
+    saved_at = summary.get('saved_at')
+    return saved_at is None or last_saved > saved_at
 
-    return character_names
+def _save_summary(character):
+    """Index entry for a character being saved now"""
+    return {'name': character['name'], 'class': character['class'],
+            'level': character['level'], 'gold': character['gold'],
+            'saved_at': time.time()}
 
-def delete_character(character_name, save_directory="data/save_games"):
+def delete_character(character_name, save_directory="data/save_games", backend=None):
     """
     Delete a character's save file.
     
@@ -241,22 +815,318 @@ def delete_character(character_name, save_directory="data/save_games"):
         CharacterNotFoundError: if character doesn't exist
     """
     # TODO: Implement character deletion
-    import os  # Needed to work with files
+    if backend is None:
+        backend = TextFileBackend(save_directory)
 
-    # Build the path to the character's save file
-    filepath = os.path.join(save_directory, f"{character_name}_save.txt")
+    # Raises CharacterNotFoundError if there is no save; also drops the
+    # delta log and the index summary
+    backend.delete(character_name)
 
-    # Check if the file exists
-    if not os.path.exists(filepath):
-        # Raise an error if the character save does not exist
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+    return True  # Return True to indicate deletion was successful
 
-    # Delete the file
-    os.remove(filepath)
 
-    return True  # Return True to indicate deletion was successful
 
+# ============================================================================ 
+# ASYNC SAVE / LOAD FUNCTIONS
+# ============================================================================ 
+
+async def async_save_character(character, save_directory="data/save_games", fsync=False,
+                               backend=None, save_format=DEFAULT_SAVE_FORMAT):
+    """
+    save_character for asyncio code: the write runs in a worker thread.
+    
+    The character is validated and encoded right away (so later changes
+    to it are not saved by this call). Concurrent saves of the same
+    character are coalesced: while one write is running, further saves
+    only replace the data queued behind it, and every waiting caller
+    finishes when the newest data has been written.
+    
+    At most ASYNC_IO_LIMIT blocking calls run at once per event loop.
+    
+    Returns:
+        True if successful
+    
+    Raises:
+        Same exceptions as save_character
+    """
+    validate_character_data(character)
+    data = encode_save_data(character, save_format)
+    name = character['name']
+    if backend is None:
+        key = (os.path.abspath(save_directory), fsync, name)
+        backend = TextFileBackend(save_directory, fsync)
+    else:
+        key = (backend, name)
+
+    state = _async_state()
+    pending = state.saves.get(key)
+    if pending is None:
+        pending = _PendingSave()
+        state.saves[key] = pending
+        asyncio.get_running_loop().create_task(_drain_saves(state, key, backend, name))
+    # Newest data wins; everyone queued shares the result of writing it
+    pending.data = data
+    pending.summary = _save_summary(character)
+    if pending.queued is None:
+        pending.queued = asyncio.get_running_loop().create_future()
+    future = pending.queued
 
+    await asyncio.shield(future)
+    # The delta log was cleared by the full save, and the character may
+    # have changed since it was encoded: make the next delta save a full one
+    if isinstance(character, Character) and character._save_state is not None:
+        character._save_state.log_size = None
+    return True
+
+async def async_load_character(character_name, save_directory="data/save_games", backend=None):
+    """
+    load_character for asyncio code: the read runs in a worker thread.
+    
+    Waits for any async_save_character of the same character that is
+    still in progress, so a load always sees the latest async save.
+    
+    Returns:
+        Character (dictionary-like)
+    
+    Raises:
+        Same exceptions as load_character
+    """
+    if backend is None:
+        prefix = (os.path.abspath(save_directory),)
+    else:
+        prefix = (backend,)
+    state = _async_state()
+    for key, pending in list(state.saves.items()):
+        if key[0] == prefix[0] and key[-1] == character_name:
+            await pending.wait()
+
+    return await _run_blocking(load_character, character_name, save_directory, backend)
+
+async def async_list_saved_characters(save_directory="data/save_games", backend=None):
+    """
+    list_saved_characters for asyncio code: runs in a worker thread.
+    
+    Returns:
+        List of character names
+    """
+    return await _run_blocking(list_saved_characters, save_directory, backend)
+
+class _PendingSave:
+    """Coalescing slot for one character's async saves"""
+    
+    __slots__ = ("data", "summary", "queued", "running")
+    
+    def __init__(self):
+        self.data = None  # Newest save bytes waiting to be written
+        self.summary = None  # Save index entry for self.data
+        self.queued = None  # Future for the write of self.data
+        self.running = None  # Future for the write in progress
+    
+    async def wait(self):
+        """Wait until everything saved so far is written (errors ignored)"""
+        for future in (self.queued, self.running):
+            if future is not None:
+                try:
+                    await asyncio.shield(future)
+                except Exception:
+                    pass
+
+class _AsyncState:
+    """Per-event-loop concurrency limit and in-progress saves"""
+    
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(ASYNC_IO_LIMIT)
+        self.saves = {}  # key -> _PendingSave
+
+_async_states = weakref.WeakKeyDictionary()
+
+def _async_state():
+    """The _AsyncState for the running event loop"""
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is None:
+        state = _async_states[loop] = _AsyncState()
+    return state
+
+async def _run_blocking(function, *args):
+    """Run a blocking call in a worker thread, at most ASYNC_IO_LIMIT at once"""
+    async with _async_state().semaphore:
+        return await asyncio.to_thread(function, *args)
+
+def _write_save(backend, name, data, summary):
+    """Store save bytes and their index summary (runs in a worker thread)"""
+    backend.write(name, data)
+    # Stamped after the write, so the entry is not mistaken for a stale one
+    backend.update_summaries([dict(summary, saved_at=time.time())])
+
+async def _drain_saves(state, key, backend, name):
+    """Write a character's queued save data until no newer data is waiting"""
+    pending = state.saves[key]
+    try:
+        while pending.queued is not None:
+            pending.running, pending.queued = pending.queued, None
+            try:
+                await _run_blocking(_write_save, backend, name, pending.data, pending.summary)
+            except Exception as e:
+                pending.running.set_exception(e)
+            else:
+                pending.running.set_result(True)
+    finally:
+        pending.running = None
+        del state.saves[key]
+
+# ============================================================================ 
+# CHARACTER CACHE
+# ============================================================================ 
+
+class CharacterCache:
+    """
+    Bounded LRU cache of loaded characters in front of load/save
+    
+    load() returns the cached Character when its save has not changed on
+    disk (checked with one cheap backend.version() call), so resuming a
+    session skips reading and parsing the save.
+    
+    save() is write-back: the character is only marked for saving, and is
+    written (with save_character_changes) when it is evicted or on
+    flush(). Pass write_through=True to write immediately. Call flush()
+    before the program exits. Whatever state the character is in at
+    write-back time is what gets written.
+    
+    Only save() marks a character for writing. Edits made to a loaded
+    character without calling save() are never written (flush() and
+    eviction skip it), but they stay on the cached object: load() keeps
+    returning that same object, so nobody holding it loses their edits.
+    Call discard() to throw them away (e.g. after the player quits
+    without saving); the next load() then reads the save again.
+    
+    A character passed to save() but not yet written is always returned
+    by load(), and it replaces the disk copy when written back, even if
+    the save changed on disk in the meantime.
+    
+    Counters: hits, misses, evictions, writebacks, invalidations
+    """
+    
+    def __init__(self, capacity=128, save_directory="data/save_games", backend=None):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1.")
+        self.capacity = capacity
+        self.save_directory = save_directory
+        self.backend = backend if backend is not None else TextFileBackend(save_directory)
+        self._entries = OrderedDict()  # name -> [character, version token, pending save]
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.invalidations = 0
+    
+    def load(self, character_name):
+        """
+        Get a character, from the cache when its save is unchanged
+        
+        Raises: Same as load_character
+        """
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is not None:
+                if (entry[2] or _has_unsaved_edits(entry[0])
+                        or self.backend.version(character_name) == entry[1]):
+                    self._entries.move_to_end(character_name)
+                    self.hits += 1
+                    return entry[0]
+                # Unedited, and changed on disk by someone else: read it again
+                del self._entries[character_name]
+                self.invalidations += 1
+            
+            self.misses += 1
+            version = self.backend.version(character_name)
+            character = load_character(character_name, backend=self.backend)
+            self._store(character_name, [character, version, False])
+            return character
+    
+    def save(self, character, write_through=False):
+        """
+        Put a character in the cache and mark it for saving
+        
+        Returns: True
+        Raises: Same as save_character (validation errors are raised now,
+                not at write-back time)
+        """
+        validate_character_data(character)
+        with self._lock:
+            name = character['name']
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] is character:
+                entry[2] = True
+                self._entries.move_to_end(name)
+            else:
+                entry = [character, None, True]
+                self._store(name, entry)
+            if write_through:
+                self._write_back(name, entry)
+        return True
+    
+    def flush(self):
+        """
+        Write every character passed to save() that is not written yet
+        
+        Returns: Number of characters written
+        """
+        with self._lock:
+            written = 0
+            for name, entry in list(self._entries.items()):
+                if entry[2]:
+                    self._write_back(name, entry)
+                    written += 1
+            return written
+    
+    def discard(self, character_name):
+        """Drop a character from the cache without saving it (e.g. after delete)"""
+        with self._lock:
+            self._entries.pop(character_name, None)
+    
+    def clear(self):
+        """flush(), then empty the cache"""
+        with self._lock:
+            self.flush()
+            self._entries.clear()
+    
+    def stats(self):
+        """Counters as a dictionary (plus the current size)"""
+        return {
+            'size': len(self._entries), 'capacity': self.capacity,
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            'writebacks': self.writebacks, 'invalidations': self.invalidations,
+        }
+    
+    def __contains__(self, character_name):
+        return character_name in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _store(self, name, entry):
+        """Insert an entry as most recently used, evicting the oldest past capacity"""
+        self._entries[name] = entry
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.capacity:
+            old_name, old_entry = self._entries.popitem(last=False)
+            self.evictions += 1
+            if old_entry[2]:
+                self._write_back(old_name, old_entry)
+    
+    def _write_back(self, name, entry):
+        """Save one entry and remember the new version of its save"""
+        save_character_changes(entry[0], backend=self.backend)
+        entry[1] = self.backend.version(name)
+        entry[2] = False
+        self.writebacks += 1
+
+def _has_unsaved_edits(character):
+    """True if a cached character may have been edited since it was loaded or written"""
+    dirty = character.dirty_fields() if isinstance(character, Character) else None
+    return dirty is None or bool(dirty)
 
 # ============================================================================ 
 # CHARACTER OPERATIONS
@@ -277,13 +1147,54 @@ def gain_experience(character, xp_amount):
         raise CharacterDeadError(f"{character['name']} is dead and cannot gain XP.")
 
     character['experience'] += xp_amount
-    while character['experience'] >= character['level'] * 100:
-        character['experience'] -= character['level'] * 100
-        character['level'] += 1
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
-        character['health'] = character['max_health']
+    level = character['level']
+    experience = character['experience']
+
+    if not (isinstance(level, int) and isinstance(experience, int)) or level < 1:
+        # Odd values (fractional XP, level 0 or below): keep the original loop
+        while character['experience'] >= character['level'] * 100:
+            character['experience'] -= character['level'] * 100
+            character['level'] += 1
+            character['max_health'] += 10
+            character['strength'] += 2
+            character['magic'] += 2
+            character['health'] = character['max_health']
+        return
+
+    levels_gained = _levels_gained(level, experience)
+    if levels_gained == 0:
+        return
+
+    # Same result as levelling up one level at a time, applied in bulk
+    character['experience'] = experience - _xp_for_levels(level, levels_gained)
+    character['level'] = level + levels_gained
+    character['max_health'] += 10 * levels_gained
+    character['strength'] += 2 * levels_gained
+    character['magic'] += 2 * levels_gained
+    character['health'] = character['max_health']
+
+def _xp_for_levels(level, count):
+    """
+    XP needed to go up count levels starting at level.
+    
+    level*100 + (level+1)*100 + ... is an arithmetic series:
+    100 * (count*level + count*(count-1)/2) = 50*count*(2*level + count - 1)
+    """
+    return 50 * count * (2 * level + count - 1)
+
+def _levels_gained(level, experience):
+    """Largest count with _xp_for_levels(level, count) <= experience (level >= 1)"""
+    if experience < level * 100:
+        return 0
+    # count^2 + (2*level - 1)*count <= experience // 50, solved with integer sqrt
+    b = 2 * level - 1
+    count = (math.isqrt(b * b + 4 * (experience // 50)) - b) // 2
+    # Guard against rounding at the boundary
+    while _xp_for_levels(level, count + 1) <= experience:
+        count += 1
+    while count > 0 and _xp_for_levels(level, count) > experience:
+        count -= 1
+    return count
 
 
 def add_gold(character, amount):
@@ -385,10 +1296,13 @@ def validate_character_data(character):
         if not isinstance(character[key], int):
             raise InvalidSaveDataError(f"Field {key} must be an integer")
 
-    list_fields = ["inventory", "active_quests", "completed_quests"]
+    if not isinstance(character["inventory"], (list, Inventory)):
+        raise InvalidSaveDataError("Field inventory must be a list or Inventory")
+
+    list_fields = ["active_quests", "completed_quests"]
     for key in list_fields:
-        if not isinstance(character[key], list):
-            raise InvalidSaveDataError(f"Field {key} must be a list")
+        if not isinstance(character[key], (list, QuestLog)):
+            raise InvalidSaveDataError(f"Field {key} must be a list or QuestLog")
 
     return True
 
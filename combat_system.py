@@ -10,6 +10,10 @@ Handles combat mechanics
 """
 
 import random
+import sys
+from collections import deque
+from types import MappingProxyType
+import game_data
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -21,72 +25,107 @@ from custom_exceptions import (
 # ENEMY DEFINITIONS  
 # ============================================================================  
 
+# Enemy definitions live in this data file; adding an enemy needs no code change
+ENEMY_DATA_FILE = game_data.ENEMY_DATA_FILE
+
+# Fields copied from a data record into the enemy dictionaries battles use
+# (max_health starts equal to health)
+_ENEMY_FIELDS = ('name', 'health', 'max_health', 'strength', 'magic', 'xp_reward', 'gold_reward')
+
+# Compiled registry, built once on first use (see load_enemy_templates)
+_enemy_templates = None     # read-only {enemy_id: read-only enemy template}
+_enemies_by_level = None    # tuple indexed by level -> tuple of templates
+_open_ended_enemies = None  # templates for levels past the end of the table
+
+def load_enemy_templates(filename=ENEMY_DATA_FILE):
+    """
+    Load enemy definitions into the immutable template registry
+    
+    Also precomputes which templates can appear at each character level.
+    Called automatically by create_enemy(); call it again to reload.
+    
+    Returns: Read-only mapping {enemy_id: read-only template}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    global _enemy_templates, _enemies_by_level, _open_ended_enemies
+    
+    records = game_data.load_enemies(filename)
+    
+    templates = {}
+    for enemy_id, record in records.items():
+        # Every field is required by game_data.validate_enemy_data;
+        # max_health is the only one derived (enemies start at full health)
+        template = {field: record['health'] if field == 'max_health' else record[field]
+                    for field in _ENEMY_FIELDS}
+        templates[enemy_id] = MappingProxyType(template)
+    
+    # Table covers every level up to the last bound mentioned in the data;
+    # above that only open-ended (MAX_LEVEL: NONE) enemies remain
+    top = 1
+    for record in records.values():
+        top = max(top, record['min_level'], record['max_level'] or 0)
+    by_level = []
+    for level in range(top + 1):
+        by_level.append(tuple(
+            templates[enemy_id] for enemy_id, record in records.items()
+            if record['min_level'] <= level and (record['max_level'] is None or level <= record['max_level'])
+        ))
+    
+    _enemies_by_level = tuple(by_level)
+    _open_ended_enemies = tuple(templates[enemy_id] for enemy_id, record in records.items()
+                                if record['max_level'] is None)
+    _enemy_templates = MappingProxyType(templates)
+    return _enemy_templates
+
+def get_enemy_templates():
+    """
+    Get the enemy template registry, loading it on first use
+    
+    Returns: Read-only mapping {enemy_id: read-only template}
+    """
+    if _enemy_templates is None:
+        load_enemy_templates()
+    return _enemy_templates
+
 def create_enemy(enemy_type):
     """
     Create an enemy based on type
     
-    Returns: Enemy dictionary
+    Returns: Enemy dictionary (a fresh copy of the registered template)
     Raises: InvalidTargetError if enemy_type not recognized
     """
-    # TODO: Implement enemy creation
-    if enemy_type.lower() == "goblin":
-        enemy = {
-            'name': 'Goblin',
-            'health': 50,
-            'max_health': 50,
-            'strength': 8,
-            'magic': 2,
-            'xp_reward': 25,
-            'gold_reward': 10
-        }
-    elif enemy_type.lower() == "orc":
-        enemy = {
-            'name': 'Orc',
-            'health': 80,
-            'max_health': 80,
-            'strength': 12,
-            'magic': 5,
-            'xp_reward': 50,
-            'gold_reward': 25
-        }
-    elif enemy_type.lower() == "dragon":
-        enemy = {
-            'name': 'Dragon',
-            'health': 200,
-            'max_health': 200,
-            'strength': 25,
-            'magic': 15,
-            'xp_reward': 200,
-            'gold_reward': 100
-        }
-    else:
+    template = get_enemy_templates().get(enemy_type.lower())
+    if template is None:
         # Raise error if the enemy type is not recognized
         raise InvalidTargetError(f"Enemy type '{enemy_type}' is invalid.")
     
-    # Return the created enemy dictionary
-    return enemy
+    # Templates are flat, so a shallow copy gives the battle its own enemy
+    return dict(template)
     
 
 def get_random_enemy_for_level(character_level):
     """
     Get an appropriate enemy for character's level
     
-    Level 1-2: Goblins
-    Level 3-5: Orcs
-    Level 6+: Dragons
+    Level ranges come from MIN_LEVEL/MAX_LEVEL in the enemy data file
+    (default data: 1-2 Goblins, 3-5 Orcs, 6+ Dragons). When several
+    enemies fit a level one of them is picked at random.
     
     Returns: Enemy dictionary
+    Raises: InvalidTargetError if no enemy is defined for the level
     """
-    # TODO: Implement level-appropriate enemy selection
-    if character_level <= 2:
-        enemy_type = "goblin"
-    elif 3 <= character_level <= 5:
-        enemy_type = "orc"
+    get_enemy_templates()
+    level = max(1, character_level)
+    if level < len(_enemies_by_level):
+        candidates = _enemies_by_level[level]
     else:
-        enemy_type = "dragon"
+        candidates = _open_ended_enemies
     
-    # Create and return enemy using create_enemy()
-    return create_enemy(enemy_type)
+    if not candidates:
+        raise InvalidTargetError(f"No enemy is defined for level {character_level}.")
+    if len(candidates) == 1:
+        return dict(candidates[0])
+    return dict(random.choice(candidates))
     
 
 # ============================================================================  
@@ -98,13 +137,22 @@ class SimpleBattle:
     Simple turn-based combat system
     """
     
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, choose_action=None, log=None):
+        """
+        Initialize battle with character and enemy
+        
+        choose_action: optional callable(battle) -> 'attack'|'special'|'run'
+        used to pick the player's action each turn. None means always attack.
+        log: battle log sink (see BATTLE LOG SINKS). None prints to the
+        terminal exactly like display_combat_stats/display_battle_log.
+        """
         # TODO: Implement initialization
         self.character = character  # Store reference to player's character
         self.enemy = enemy          # Store reference to enemy
         self.combat_active = True   # Flag to track if battle is ongoing
         self.turn_counter = 0       # Count turns to manage abilities or AI
+        self.choose_action = choose_action  # Player input / AI hook
+        self.log = log if log is not None else PrintBattleLog()
         # NOTE: We no longer initialize special_cooldown here; handled in use_special_ability()
         
     
@@ -161,24 +209,25 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("Cannot take a turn, combat is not active.")
 
-        display_combat_stats(self.character, self.enemy)
+        if self.log.enabled:
+            self.log_stats()
 
         # For deterministic integration tests, choose 'attack' by default
-        action = 'attack'  # Replace with player input in a real game
+        action = self.choose_action(self) if self.choose_action else 'attack'
 
         if action == 'attack':
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
-            display_battle_log(f"{self.character['name']} attacks {self.enemy['name']} for {damage} damage!")
+            self.log.record(">>> {} attacks {} for {} damage!", self.character['name'], self.enemy['name'], damage)
         elif action == 'special':
             # special ability may raise AbilityOnCooldownError
             result = use_special_ability(self.character, self.enemy)
-            display_battle_log(result)
+            self.log.record(">>> {}", result)
         elif action == 'run':
             if self.attempt_escape():
-                display_battle_log(f"{self.character['name']} successfully escaped!")
+                self.log.record(">>> {} successfully escaped!", self.character['name'])
             else:
-                display_battle_log(f"{self.character['name']} failed to escape.")
+                self.log.record(">>> {} failed to escape.", self.character['name'])
 
         # Decrement special cooldown at end of turn if present
         # TODO: Note: cooldown bookkeeping is optional; we keep it consistent if present.
@@ -198,7 +247,15 @@ class SimpleBattle:
         
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"{self.enemy['name']} attacks {self.character['name']} for {damage} damage!")
+        self.log.record(">>> {} attacks {} for {} damage!", self.enemy['name'], self.character['name'], damage)
+    
+    def log_stats(self):
+        """Send the same two status lines as display_combat_stats to the log"""
+        character, enemy = self.character, self.enemy
+        self.log.record("\n{}: HP={}/{}", character.get('name', 'Player'),
+                        character.get('health', 0), character.get('max_health', 0))
+        self.log.record("{}: HP={}/{}", enemy.get('name', 'Enemy'),
+                        enemy.get('health', 0), enemy.get('max_health', 0))
     
     def calculate_damage(self, attacker, defender):
         """
@@ -264,6 +321,142 @@ class SimpleBattle:
             self.combat_active = False
         return success
 
+def resolve_battle_fast(character, enemy, choose_action=None, log=None):
+    """
+    Resolve a battle without stepping through every turn when possible
+    
+    With no choose_action the fight is attack-only and fully deterministic:
+    each side deals the same damage every hit, so the number of hits each
+    side needs is a ceiling division. Player strikes first, so ties go to
+    the player. Any choose_action may pick special/run (random outcomes),
+    so those battles fall back to SimpleBattle.start_battle().
+    
+    The closed-form path logs nothing but leaves character, enemy and
+    special_cooldown in the same state start_battle() would. log is only
+    used by the fallback loop (pass NullBattleLog() to silence it).
+    
+    Returns: Same dictionary as SimpleBattle.start_battle()
+    Raises: CharacterDeadError if character is already dead
+    """
+    battle = SimpleBattle(character, enemy, choose_action, log)
+    if choose_action is not None:
+        return battle.start_battle()
+    
+    if character.get('health', 0) <= 0:
+        raise CharacterDeadError("Character is already dead!")
+    
+    player_damage = battle.calculate_damage(character, enemy)
+    enemy_damage = battle.calculate_damage(enemy, character)
+    enemy_hp = max(0, enemy.get('health', 0))
+    char_hp = character['health']
+    
+    # -(-a // b) is ceiling division; the player always swings at least once
+    player_hits = max(1, -(-enemy_hp // player_damage))
+    enemy_hits = max(1, -(-char_hp // enemy_damage))
+    
+    if player_hits <= enemy_hits:
+        rounds = player_hits
+        enemy['health'] = 0
+        character['health'] = char_hp - (rounds - 1) * enemy_damage
+    else:
+        rounds = enemy_hits
+        enemy['health'] = enemy_hp - rounds * player_damage
+        character['health'] = 0
+    
+    # Match the loop's bookkeeping: one cooldown tick per player turn
+    if character.get('special_cooldown', 0) > 0:
+        character['special_cooldown'] = max(0, character['special_cooldown'] - rounds)
+    battle.turn_counter = rounds - 1
+    
+    winner = battle.check_battle_end()
+    if winner == 'player':
+        rewards = get_victory_rewards(enemy)
+        return {'winner': 'player', 'xp_gained': rewards['xp'], 'gold_gained': rewards['gold']}
+    return {'winner': 'enemy', 'xp_gained': 0, 'gold_gained': 0}
+
+# ============================================================================  
+# BATTLE LOG SINKS  
+# ============================================================================  
+# A sink receives a str.format template plus its arguments. Formatting is
+# deferred to the sink, so sinks that drop or store messages never build
+# the final strings unless someone reads them.
+
+class NullBattleLog:
+    """Battle log sink that discards everything (fastest for simulations)"""
+    
+    enabled = False
+    
+    def record(self, template, *args):
+        """Drop the message"""
+        pass
+    
+    def flush(self):
+        """Nothing buffered"""
+        pass
+
+class PrintBattleLog(NullBattleLog):
+    """Default sink: prints each message immediately (interactive play)"""
+    
+    enabled = True
+    
+    def record(self, template, *args):
+        """Format and print the message"""
+        print(template.format(*args))
+
+class RingBufferBattleLog(NullBattleLog):
+    """
+    Keeps only the most recent messages in memory
+    
+    Messages are stored unformatted as (template, args) and only turned into
+    strings when lines() is called.
+    """
+    
+    enabled = True
+    
+    def __init__(self, capacity=100):
+        self.entries = deque(maxlen=capacity)
+    
+    def record(self, template, *args):
+        """Store the message, pushing out the oldest when full"""
+        self.entries.append((template, args))
+    
+    def lines(self):
+        """Return the stored messages as formatted strings, oldest first"""
+        return [template.format(*args) for template, args in self.entries]
+    
+    def clear(self):
+        """Forget all stored messages"""
+        self.entries.clear()
+
+class BatchedBattleLog(NullBattleLog):
+    """
+    Buffers messages and writes them to a stream in one call per batch
+    
+    stream defaults to sys.stdout (looked up at flush time). Call flush()
+    when the battle is over to write whatever is left in the buffer.
+    """
+    
+    enabled = True
+    
+    def __init__(self, stream=None, batch_size=100):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.pending = []
+    
+    def record(self, template, *args):
+        """Buffer the message and flush once the batch is full"""
+        self.pending.append((template, args))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Format and write every buffered message"""
+        if not self.pending:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(template.format(*args) for template, args in self.pending) + "\n")
+        self.pending = []
+
 # ============================================================================  
 # SPECIAL ABILITIES  
 # ============================================================================  
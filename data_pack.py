@@ -0,0 +1,306 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Data Pack Module
+
+Compiles quests.txt / items.txt into a binary "pack" file and reads it back
+through mmap, so many processes can share one copy of the data in the OS
+page cache and look records up without parsing the text files.
+
+Pack layout (all integers little-endian):
+- header: magic, version, kind, field count, record count, record size,
+  then the byte offsets/sizes of the record table and string pool
+- record table: one fixed-width record per entry, sorted by id
+  (string fields are (offset, length) into the pool, ints are int64)
+- string pool: UTF-8 text, each distinct string stored once
+
+Lookups by id binary-search the record table, so only the touched
+records are decoded. Only the schema fields below are stored.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping, ItemsView, ValuesView
+import game_data
+from custom_exceptions import (
+    MissingDataFileError,
+    CorruptedDataError
+)
+
+PACK_MAGIC = b"QCPK"
+PACK_VERSION = 1
+
+KIND_QUEST = 1
+KIND_ITEM = 2
+
+# (field name, 's' for string or 'i' for integer); the first field is the id
+SCHEMAS = {
+    KIND_QUEST: (
+        ('quest_id', 's'), ('title', 's'), ('description', 's'),
+        ('reward_xp', 'i'), ('reward_gold', 'i'), ('required_level', 'i'),
+        ('prerequisite', 's'),
+    ),
+    KIND_ITEM: (
+        ('item_id', 's'), ('name', 's'), ('type', 's'), ('effect', 's'),
+        ('cost', 'i'), ('description', 's'),
+    ),
+}
+
+# magic, version, kind, field count, record count, record size,
+# records offset, pool offset, pool size
+_HEADER = struct.Struct("<4sHBBIIQQQ")
+
+# ============================================================================
+# COMPILING PACKS
+# ============================================================================
+
+def compile_pack(records, pack_path, kind):
+    """
+    Write a dictionary of quest or item records to a pack file
+
+    The file is written to a temp file and renamed into place, so processes
+    that already have the old pack mapped keep a consistent view.
+
+    Returns: Number of records written
+    Raises: KeyError if a record is missing a schema field
+    """
+    schema = SCHEMAS[kind]
+    record_struct = _record_struct(schema)
+
+    pool = bytearray()
+    pool_offsets = {}  # str -> (offset, length), so repeated strings are shared
+
+    def add_string(text):
+        if text not in pool_offsets:
+            encoded = text.encode("utf-8")
+            pool_offsets[text] = (len(pool), len(encoded))
+            pool.extend(encoded)
+        return pool_offsets[text]
+
+    # Sort by the UTF-8 bytes of the id, which is the order the reader searches in
+    ordered = sorted(records.values(), key=lambda record: record[schema[0][0]].encode("utf-8"))
+    table = bytearray()
+    for record in ordered:
+        values = []
+        for field, field_type in schema:
+            if field_type == 's':
+                values.extend(add_string(str(record[field])))
+            else:
+                values.append(record[field])
+        table.extend(record_struct.pack(*values))
+
+    records_offset = _HEADER.size
+    pool_offset = records_offset + len(table)
+    header = _HEADER.pack(PACK_MAGIC, PACK_VERSION, kind, len(schema), len(ordered),
+                          record_struct.size, records_offset, pool_offset, len(pool))
+
+    temp_path = f"{pack_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(table)
+            f.write(pool)
+        os.replace(temp_path, pack_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return len(ordered)
+
+def compile_quest_pack(source="data/quests.txt", pack_path="data/quests.pack"):
+    """
+    Parse a quest text file and compile it into a pack
+
+    Returns: Number of quests written
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return compile_pack(game_data.load_quests(source), pack_path, KIND_QUEST)
+
+def compile_item_pack(source="data/items.txt", pack_path="data/items.pack"):
+    """
+    Parse an item text file and compile it into a pack
+
+    Returns: Number of items written
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return compile_pack(game_data.load_items(source), pack_path, KIND_ITEM)
+
+# ============================================================================
+# READING PACKS
+# ============================================================================
+
+class DataPack(Mapping):
+    """
+    Read-only {id: record_dict} mapping backed by a memory-mapped pack
+
+    Behaves like the dictionaries from game_data.load_quests/load_items,
+    so it can be passed to quest_handler and inventory functions as-is.
+    Each lookup decodes a fresh dictionary for that record only.
+    """
+
+    def __init__(self, pack_path):
+        """
+        Open and map a pack file
+
+        Raises: MissingDataFileError if the file does not exist
+                CorruptedDataError if it is not a valid pack
+        """
+        if not os.path.exists(pack_path):
+            raise MissingDataFileError(f"Data pack '{pack_path}' not found.")
+
+        with open(pack_path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CorruptedDataError(f"Data pack '{pack_path}' is empty.")
+
+        try:
+            (magic, version, kind, field_count, self._count, record_size,
+             self._records_offset, self._pool_offset, pool_size) = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self.close()
+            raise CorruptedDataError(f"Data pack '{pack_path}' has a truncated header.")
+
+        schema = SCHEMAS.get(kind)
+        if (magic != PACK_MAGIC or version != PACK_VERSION or schema is None
+                or field_count != len(schema)
+                or self._pool_offset + pool_size > len(self._mm)):
+            self.close()
+            raise CorruptedDataError(f"Data pack '{pack_path}' is not a valid version {PACK_VERSION} pack.")
+
+        self.kind = kind
+        self._schema = schema
+        self._record = _record_struct(schema)
+        if record_size != self._record.size:
+            self.close()
+            raise CorruptedDataError(f"Data pack '{pack_path}' has an unexpected record size.")
+
+    # --- Mapping interface -------------------------------------------------
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._decode(index)
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._id_bytes(index).decode("utf-8")
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        return _PackItemsView(self)
+
+    def values(self):
+        return _PackValuesView(self)
+
+    # --- Resource handling -------------------------------------------------
+
+    def close(self):
+        """Unmap the pack file"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Helpers -------------------------------------------------------------
+
+    def _record_offset(self, index):
+        return self._records_offset + index * self._record.size
+
+    def _string(self, offset, length):
+        start = self._pool_offset + offset
+        return self._mm[start:start + length]
+
+    def _id_bytes(self, index):
+        # The id is always the first field: (offset, length) at the record start
+        offset, length = struct.unpack_from("<II", self._mm, self._record_offset(index))
+        return self._string(offset, length)
+
+    def _find(self, key):
+        """Binary search the sorted record table; returns index or -1"""
+        if not isinstance(key, str):
+            return -1
+        target = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._id_bytes(low) == target:
+            return low
+        return -1
+
+    def _decode(self, index):
+        """Build the record dictionary for one table entry"""
+        values = self._record.unpack_from(self._mm, self._record_offset(index))
+        record = {}
+        position = 0
+        for field, field_type in self._schema:
+            if field_type == 's':
+                record[field] = self._string(values[position], values[position + 1]).decode("utf-8")
+                position += 2
+            else:
+                record[field] = values[position]
+                position += 1
+        return record
+
+class _PackItemsView(ItemsView):
+    """items() that walks the table in order instead of searching per key"""
+
+    def __iter__(self):
+        pack = self._mapping
+        for index in range(len(pack)):
+            record = pack._decode(index)
+            yield record[pack._schema[0][0]], record
+
+class _PackValuesView(ValuesView):
+    """values() that walks the table in order instead of searching per key"""
+
+    def __iter__(self):
+        pack = self._mapping
+        for index in range(len(pack)):
+            yield pack._decode(index)
+
+def open_pack(pack_path):
+    """
+    Open a compiled quest or item pack
+
+    Returns: DataPack (use as a read-only dictionary; close() when done)
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    return DataPack(pack_path)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _record_struct(schema):
+    """Build the fixed-width record layout for a schema"""
+    layout = "".join("II" if field_type == 's' else "q" for field, field_type in schema)
+    return struct.Struct("<" + layout)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== DATA PACK MODULE TEST ===")
+
+    try:
+        print(f"Compiled {compile_quest_pack()} quests")
+        print(f"Compiled {compile_item_pack()} items")
+        with open_pack("data/quests.pack") as quests:
+            print(f"Quest pack has {len(quests)} quests")
+            print(quests.get('first_steps'))
+    except (MissingDataFileError, CorruptedDataError) as e:
+        print(f"Pack error: {e}")
@@ -10,6 +10,11 @@ This module handles loading and validating game data from text files.
 """
 
 import os 
+import sys
+import glob
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
@@ -20,41 +25,36 @@ from custom_exceptions import (
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+# Compiled parse results are kept next to the data files in this folder
+CACHE_DIR_NAME = ".cache"
+
+# Bump when the parsed data layout changes so old cache files are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Enemy definitions ship with the game, so they are found next to this
+# module rather than in the current directory (combat_system reads them
+# without being told where the game was started)
+ENEMY_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "enemies.txt")
+
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
+    use_cache: reuse the compiled cache in data/.cache when the file is unchanged
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
-    if not os.path.exists(filename):
-        # File does not exist → raise custom exception
-        raise MissingDataFileError(f"Quest data file '{filename}' not found.")
+    if use_cache:
+        return load_cached(filename, load_quests)
     
     quests = {}
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            block = []
-            for line in f:
-                line = line.strip()
-                if line == "":
-                    # Blank line indicates end of a quest block
-                    if block:
-                        quest = parse_quest_block(block)
-                        quests[quest['quest_id']] = quest
-                        block = []
-                else:
-                    block.append(line)
-            # Handle last block if file doesn't end with blank line
-            if block:
-                quest = parse_quest_block(block)
-                quests[quest['quest_id']] = quest
-    except UnicodeDecodeError:
-        # File content cannot be read → treat as corrupted
-        raise CorruptedDataError(f"Quest data file '{filename}' is corrupted.")
-    except InvalidDataFormatError:
-        # Re-raise parsing errors
+        for quest in iter_quests(filename):
+            quests[quest['quest_id']] = quest
+    except (MissingDataFileError, CorruptedDataError, InvalidDataFormatError):
+        # Re-raise our own errors unchanged
         raise
     except Exception as e:
         # Any other unexpected error
@@ -62,44 +62,164 @@ def load_quests(filename="data/quests.txt"):
     
     return quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load item data from file
     
+    use_cache: reuse the compiled cache in data/.cache when the file is unchanged
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item data file '{filename}' not found.")
+    if use_cache:
+        return load_cached(filename, load_items)
     
     items = {}
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            block = []
-            for line in f:
-                line = line.strip()
-                if line == "":
-                    # Blank line → end of item block
-                    if block:
-                        item = parse_item_block(block)
-                        items[item['item_id']] = item
-                        block = []
-                else:
-                    block.append(line)
-            # Handle last block if file doesn't end with blank line
-            if block:
-                item = parse_item_block(block)
-                items[item['item_id']] = item
-    except UnicodeDecodeError:
-        raise CorruptedDataError(f"Item data file '{filename}' is corrupted.")
-    except InvalidDataFormatError:
+        for item in iter_items(filename):
+            items[item['item_id']] = item
+    except (MissingDataFileError, CorruptedDataError, InvalidDataFormatError):
         raise
     except Exception as e:
         raise InvalidDataFormatError(f"Error loading item data: {e}")
     
     return items
 
+def load_enemies(filename=ENEMY_DATA_FILE):
+    """
+    Load enemy definitions from file
+    
+    Returns: Dictionary of enemies {enemy_id: enemy_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    enemies = {}
+    try:
+        for enemy in iter_enemies(filename):
+            enemies[enemy['enemy_id']] = enemy
+    except (MissingDataFileError, CorruptedDataError, InvalidDataFormatError):
+        raise
+    except Exception as e:
+        raise InvalidDataFormatError(f"Error loading enemy data: {e}")
+    
+    return enemies
+
+# ============================================================================
+# SHARDED LOADERS
+# ============================================================================
+
+def load_quest_shards(paths="data/quests/*.txt", max_workers=None):
+    """
+    Load quests split across many files, parsing the files in parallel
+    
+    paths: glob pattern or list of file paths. Each file is parsed in a
+    worker process with load_quests(), then the results are merged.
+    max_workers: worker process count (None = one per CPU, 1 = no pool)
+    
+    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError (also for a
+            quest_id defined in more than one file), CorruptedDataError
+    """
+    return _load_shards(paths, load_quests, "Quest", max_workers)
+
+def load_item_shards(paths="data/items/*.txt", max_workers=None):
+    """
+    Load items split across many files, parsing the files in parallel
+    
+    Works like load_quest_shards() but with load_items().
+    
+    Returns: Dictionary of items {item_id: item_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError (also for an
+            item_id defined in more than one file), CorruptedDataError
+    """
+    return _load_shards(paths, load_items, "Item", max_workers)
+
+# ============================================================================
+# STREAMING LOADERS
+# ============================================================================
+# These read one block at a time, so memory use does not grow with file size.
+#
+# errors=None  -> the first bad block raises InvalidDataFormatError, with the
+#                 block's starting line number in the message
+# errors=[]    -> each bad block is recorded as (line_number, message) in the
+#                 list and skipped; loading continues with the next block
+
+def iter_quests(filename="data/quests.txt", errors=None):
+    """
+    Yield validated quest dictionaries one at a time
+    
+    Raises: MissingDataFileError, CorruptedDataError,
+            InvalidDataFormatError (only when errors is None)
+    """
+    return _iter_records(filename, "Quest", parse_quest_block, errors)
+
+def iter_items(filename="data/items.txt", errors=None):
+    """
+    Yield validated item dictionaries one at a time
+    
+    Raises: MissingDataFileError, CorruptedDataError,
+            InvalidDataFormatError (only when errors is None)
+    """
+    return _iter_records(filename, "Item", parse_item_block, errors)
+
+def iter_enemies(filename=ENEMY_DATA_FILE, errors=None):
+    """
+    Yield validated enemy dictionaries one at a time
+    
+    Raises: MissingDataFileError, CorruptedDataError,
+            InvalidDataFormatError (only when errors is None)
+    """
+    return _iter_records(filename, "Enemy", parse_enemy_block, errors)
+
+def load_cached(filename, loader):
+    """
+    Load a data file through a pickled cache of the parsed result
+    
+    The cache file lives in a .cache folder beside the data file and is keyed
+    by the file's absolute path, mtime, size and SHA-256 of its contents.
+    On a match the stored dictionary is returned without parsing or
+    validating anything; any change to the file makes the key differ, so it
+    is parsed again with loader(filename) and the cache is rewritten.
+    A missing, corrupt or unwritable cache never breaks loading.
+    
+    Returns: Whatever loader(filename) returns
+    Raises: Same exceptions as loader
+    """
+    try:
+        stat = os.stat(filename)
+        with open(filename, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return loader(filename)  # Let the loader raise its usual error
+    
+    abs_path = os.path.abspath(filename)
+    key = (CACHE_FORMAT_VERSION, loader.__name__, abs_path,
+           stat.st_mtime_ns, stat.st_size, digest)
+    cache_path = _cache_path(abs_path, loader.__name__)
+    
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, data = pickle.load(f)
+        if cached_key == key:
+            return data
+    except Exception:
+        pass  # No usable cache, parse the file instead
+    
+    data = loader(filename)
+    
+    # Write to a temp file first so readers never see a half-written cache
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    return data
+
 def validate_quest_data(quest_dict):
     """
     Validate that quest dictionary has all required fields
@@ -138,6 +258,31 @@ def validate_item_data(item_dict):
     
     return True
 
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that enemy dictionary has all required fields
+    
+    max_level may be None for enemies that appear at every level above min_level.
+    """
+    required_fields = ['enemy_id', 'name', 'health', 'strength', 'magic',
+                       'xp_reward', 'gold_reward', 'min_level', 'max_level']
+    for field in required_fields:
+        if field not in enemy_dict:
+            raise InvalidDataFormatError(f"Enemy missing required field '{field}'")
+    
+    for numeric_field in ['health', 'strength', 'magic', 'xp_reward', 'gold_reward', 'min_level']:
+        if not isinstance(enemy_dict[numeric_field], int):
+            raise InvalidDataFormatError(f"Enemy field '{numeric_field}' must be an integer")
+    
+    max_level = enemy_dict['max_level']
+    if max_level is not None:
+        if not isinstance(max_level, int):
+            raise InvalidDataFormatError("Enemy field 'max_level' must be an integer or NONE")
+        if max_level < enemy_dict['min_level']:
+            raise InvalidDataFormatError("Enemy 'max_level' cannot be below 'min_level'")
+    
+    return True
+
 def create_default_data_files():
     """
     Create default data files if they don't exist
@@ -171,11 +316,107 @@ def create_default_data_files():
                 "COST:20\n"
                 "DESCRIPTION:Restores 50 health.\n\n"
             )
+    
+    # Default enemy file (the three required enemy types)
+    enemy_file = ENEMY_DATA_FILE
+    os.makedirs(os.path.dirname(enemy_file), exist_ok=True)
+    if not os.path.exists(enemy_file):
+        with open(enemy_file, "w", encoding="utf-8") as f:
+            f.write(
+                "ENEMY_ID:goblin\nNAME:Goblin\nHEALTH:50\nSTRENGTH:8\nMAGIC:2\n"
+                "XP_REWARD:25\nGOLD_REWARD:10\nMIN_LEVEL:1\nMAX_LEVEL:2\n\n"
+                "ENEMY_ID:orc\nNAME:Orc\nHEALTH:80\nSTRENGTH:12\nMAGIC:5\n"
+                "XP_REWARD:50\nGOLD_REWARD:25\nMIN_LEVEL:3\nMAX_LEVEL:5\n\n"
+                "ENEMY_ID:dragon\nNAME:Dragon\nHEALTH:200\nSTRENGTH:25\nMAGIC:15\n"
+                "XP_REWARD:200\nGOLD_REWARD:100\nMIN_LEVEL:6\nMAX_LEVEL:NONE\n\n"
+            )
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_blocks(filename, label):
+    """
+    Yield (starting line number, list of stripped lines) for each block
+    
+    Blocks are separated by blank lines.
+    """
+    if not os.path.exists(filename):
+        # File does not exist → raise custom exception
+        raise MissingDataFileError(f"{label} data file '{filename}' not found.")
+    
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            block = []
+            start_line = 0
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if line == "":
+                    # Blank line indicates end of a block
+                    if block:
+                        yield start_line, block
+                        block = []
+                else:
+                    if not block:
+                        start_line = line_number
+                    block.append(line)
+            # Handle last block if file doesn't end with blank line
+            if block:
+                yield start_line, block
+    except UnicodeDecodeError:
+        # File content cannot be read → treat as corrupted
+        raise CorruptedDataError(f"{label} data file '{filename}' is corrupted.")
+
+def _iter_records(filename, label, parse_block, errors):
+    """Parse each block with parse_block, raising or recording bad blocks"""
+    for start_line, lines in _iter_blocks(filename, label):
+        try:
+            record = parse_block(lines)
+        except InvalidDataFormatError as e:
+            if errors is None:
+                raise InvalidDataFormatError(f"{filename}, line {start_line}: {e}")
+            errors.append((start_line, str(e)))
+            continue
+        yield record
+
+def _load_shards(paths, loader, label, max_workers):
+    """Run loader over every shard file (in processes) and merge the results"""
+    if isinstance(paths, str):
+        shard_files = sorted(glob.glob(paths))
+    else:
+        shard_files = list(paths)
+    if not shard_files:
+        raise MissingDataFileError(f"No {label.lower()} data files found for '{paths}'.")
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if len(shard_files) == 1 or max_workers == 1:
+        results = [loader(path) for path in shard_files]
+    else:
+        # map() keeps shard order, so merging (and error reports) are deterministic
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(loader, shard_files))
+    
+    merged = {}
+    source_file = {}
+    for path, records in zip(shard_files, results):
+        for record_id, record in records.items():
+            if record_id in merged:
+                raise InvalidDataFormatError(
+                    f"{label} '{record_id}' is defined in both "
+                    f"'{source_file[record_id]}' and '{path}'."
+                )
+            merged[record_id] = record
+            source_file[record_id] = path
+    return merged
+
+def _cache_path(abs_path, loader_name):
+    """Build the cache file path for a data file and loader"""
+    path_hash = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:12]
+    base = os.path.basename(abs_path)
+    return os.path.join(os.path.dirname(abs_path), CACHE_DIR_NAME,
+                        f"{base}.{loader_name}.{path_hash}.pickle")
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -185,7 +426,7 @@ def parse_quest_block(lines):
     try:
         for line in lines:
             key, value = line.split(":", 1)  # Split only on first colon
-            key = key.strip().lower()
+            key = sys.intern(key.strip().lower())  # Shared key strings across records
             value = value.strip()
             if key == "reward_xp" or key == "reward_gold" or key == "required_level":
                 value = int(value)  # Convert numeric fields to int
@@ -214,7 +455,7 @@ def parse_item_block(lines):
     try:
         for line in lines:
             key, value = line.split(":", 1)
-            key = key.strip().lower()
+            key = sys.intern(key.strip().lower())  # Shared key strings across records
             value = value.strip()
             if key == "cost":
                 value = int(value)  # Convert cost to integer
@@ -233,6 +474,30 @@ def parse_item_block(lines):
     
     return item
 
+def parse_enemy_block(lines):
+    """
+    Parse a block of lines into an enemy dictionary
+    """
+    enemy = {}
+    numeric_keys = ['health', 'strength', 'magic', 'xp_reward', 'gold_reward', 'min_level']
+    try:
+        for line in lines:
+            key, value = line.split(":", 1)
+            key = sys.intern(key.strip().lower())  # Shared key strings across records
+            value = value.strip()
+            if key in numeric_keys:
+                value = int(value)
+            elif key == "max_level":
+                value = None if value.upper() == "NONE" else int(value)
+            elif key == "enemy_id":
+                value = value.lower()  # create_enemy() lookups are case-insensitive
+            enemy[key] = value
+        validate_enemy_data(enemy)
+    except Exception as e:
+        raise InvalidDataFormatError(f"Failed to parse enemy block: {e}")
+    
+    return enemy
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -260,3 +525,12 @@ if __name__ == "__main__":
         print("Item file not found")
     except InvalidDataFormatError as e:
         print(f"Invalid item format: {e}")
+    
+    # Test loading enemies
+    try:
+        enemies = load_enemies()
+        print(f"Loaded {len(enemies)} enemies")
+    except MissingDataFileError:
+        print("Enemy file not found")
+    except InvalidDataFormatError as e:
+        print(f"Invalid enemy format: {e}")
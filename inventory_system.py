@@ -20,12 +20,113 @@ from custom_exceptions import (
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================ 
+# INVENTORY CONTAINER
+# ============================================================================
+
+class Inventory:
+    """
+    Counted multiset of item ids
+    
+    Stores {item_id: quantity} (in first-added order) plus a running total,
+    so membership, count, add and remove are O(1) instead of O(n) list scans.
+    It supports the list operations the inventory functions use
+    (append, remove, count, in, len, iteration), so the functions below work
+    on both an Inventory and a plain list. Iterating yields each item id
+    once per copy, grouped by item, which is also the save-file format.
+    Capacity (MAX_INVENTORY_SIZE) is still enforced by the functions below.
+    """
+    
+    __slots__ = ("_counts", "_size")
+    
+    def __init__(self, items=()):
+        """Create an inventory, optionally from a list of item ids"""
+        self._counts = {}
+        self._size = 0
+        for item_id in items:
+            self.append(item_id)
+    
+    def append(self, item_id):
+        """Add one copy of an item"""
+        self._counts[item_id] = self._counts.get(item_id, 0) + 1
+        self._size += 1
+    
+    def remove(self, item_id):
+        """
+        Remove one copy of an item
+        
+        Raises: ValueError if the item is not present (same as list.remove)
+        """
+        quantity = self._counts.get(item_id, 0)
+        if quantity == 0:
+            raise ValueError(f"Inventory.remove(x): {item_id!r} not in inventory")
+        if quantity == 1:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = quantity - 1
+        self._size -= 1
+    
+    def count(self, item_id):
+        """Number of copies of an item"""
+        return self._counts.get(item_id, 0)
+    
+    def item_counts(self):
+        """Dictionary {item_id: quantity} in first-added order"""
+        return dict(self._counts)
+    
+    def clear(self):
+        """Remove every item"""
+        self._counts.clear()
+        self._size = 0
+    
+    def copy(self):
+        """Independent copy of this inventory"""
+        duplicate = Inventory()
+        duplicate._counts = dict(self._counts)
+        duplicate._size = self._size
+        return duplicate
+    
+    def to_list(self):
+        """List of item ids (the save-file format)"""
+        return list(self)
+    
+    @classmethod
+    def from_list(cls, items):
+        """Build an inventory from a list of item ids"""
+        return cls(items)
+    
+    def __contains__(self, item_id):
+        return item_id in self._counts
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        for item_id, quantity in self._counts.items():
+            for _ in range(quantity):
+                yield item_id
+    
+    def __eq__(self, other):
+        # Compared as multisets: same items with the same quantities
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, list):
+            return self._counts == Inventory(other)._counts
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"Inventory({self.to_list()!r})"
+
 # ============================================================================ 
 # INVENTORY MANAGEMENT
 # ============================================================================
 
 def add_item_to_inventory(character, item_id):
-    inventory = character.setdefault('inventory', [])
+    inventory = character.get('inventory')
+    if inventory is None:
+        inventory = character['inventory'] = Inventory()
     if len(inventory) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Cannot add item, inventory is full.")
     inventory.append(item_id)
@@ -52,8 +153,8 @@ def get_inventory_space_remaining(character):
 
 def clear_inventory(character):
     inventory = character.get('inventory', [])
-    removed_items = inventory.copy()
-    character['inventory'] = []
+    removed_items = list(inventory)
+    character['inventory'] = Inventory() if isinstance(inventory, Inventory) else []
     return removed_items
 
 # ============================================================================ 
@@ -172,9 +273,12 @@ def apply_stat_effect(character, stat_name, value):
 
 def display_inventory(character, item_data_dict):
     inventory = character.get('inventory', [])
-    counted = {}
-    for item_id in inventory:
-        counted[item_id] = counted.get(item_id, 0) + 1
+    if isinstance(inventory, Inventory):
+        counted = inventory.item_counts()
+    else:
+        counted = {}
+        for item_id in inventory:
+            counted[item_id] = counted.get(item_id, 0) + 1
     
     print(f"{character['name']}'s Inventory:")
     for item_id, qty in counted.items():
@@ -25,8 +25,12 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+quest_index = None  # QuestIndex over all_quests, built once the quests are loaded
 game_running = False
 
+# Loaded characters stay cached, so resuming a session skips re-reading the save
+character_cache = character_manager.CharacterCache()
+
 # ============================================================================ 
 # MAIN MENU
 # ============================================================================
@@ -77,15 +81,21 @@ def load_game():
     
     print("\n=== LOAD GAME ===")
     
-    saved_chars = character_manager.list_saved_characters()
+    # One index read instead of loading every save to show its details
+    summaries = character_manager.list_saved_character_summaries()
+    saved_chars = [summary['name'] for summary in summaries]
     if not saved_chars:
         print("No saved characters found.")
         return
     
     # Display saved characters
     print("Saved Characters:")
-    for i, char_name in enumerate(saved_chars, start=1):
-        print(f"{i}. {char_name}")
+    for i, summary in enumerate(summaries, start=1):
+        if summary['level'] is None:
+            print(f"{i}. {summary['name']} (unreadable save)")
+        else:
+            print(f"{i}. {summary['name']} - Level {summary['level']} {summary['class']}, "
+                  f"{summary['gold']} gold")
     
     while True:
         choice = input(f"Select character to load (1-{len(saved_chars)}): ").strip()
@@ -93,7 +103,7 @@ def load_game():
             idx = int(choice) - 1
             char_name = saved_chars[idx]
             try:
-                current_character = character_manager.load_character(char_name)
+                current_character = character_cache.load(char_name)
                 print(f"Character '{char_name}' loaded successfully!")
                 break
             except (CharacterNotFoundError, SaveFileCorruptedError) as e:
@@ -132,8 +142,13 @@ def game_loop():
             save_game()
             print("Game saved. Exiting to main menu.")
             game_running = False
+            return
         else:
             print("Invalid choice. Please select 1-6.")
+    
+    # Left without saving (e.g. quit after dying): forget the in-memory
+    # character so the next Load Game reads the last save again
+    character_cache.discard(current_character['name'])
 
 def game_menu():
     """
@@ -174,10 +189,13 @@ def view_character_stats():
     print(f"Gold: {current_character.get('gold', 0)}")
     
     # Display quest progress
-    active_quests = quest_handler.get_active_quests(current_character)
+    active_quests = quest_handler.get_active_quests(current_character, quest_index)
     print(f"Active Quests: {len(active_quests)}")
     for q in active_quests:
         print(f"- {q['title']}")
+    # Reward totals are kept on the character from the first view on
+    # (complete_quest then updates them instead of summing again)
+    quest_handler.display_character_quest_progress(current_character, quest_index)
 
 def view_inventory():
     """
@@ -229,7 +247,7 @@ def quest_menu():
     """
     Quest management menu
     """
-    global current_character, all_quests
+    global current_character, quest_index
     
     print("\n=== QUEST MENU ===")
     print("1. View Active Quests")
@@ -243,21 +261,22 @@ def quest_menu():
     choice = input("Select an option: ").strip()
     
     try:
+        # Every lookup goes through quest_index (built once in load_game_data)
         if choice == '1':
-            quest_handler.display_active_quests(current_character)
+            quest_handler.display_quest_list(quest_handler.get_active_quests(current_character, quest_index))
         elif choice == '2':
-            quest_handler.display_available_quests(current_character, all_quests)
+            quest_handler.display_quest_list(quest_handler.get_available_quests(current_character, quest_index))
         elif choice == '3':
-            quest_handler.display_completed_quests(current_character)
+            quest_handler.display_quest_list(quest_handler.get_completed_quests(current_character, quest_index))
         elif choice == '4':
             quest_id = input("Enter quest ID to accept: ").strip()
-            quest_handler.accept_quest(current_character, quest_id, all_quests)
+            quest_handler.accept_quest(current_character, quest_id, quest_index)
         elif choice == '5':
             quest_id = input("Enter quest ID to abandon: ").strip()
             quest_handler.abandon_quest(current_character, quest_id)
         elif choice == '6':
             quest_id = input("Enter quest ID to complete: ").strip()
-            quest_handler.complete_quest(current_character, quest_id)
+            quest_handler.complete_quest(current_character, quest_id, quest_index)
     except QuestError as e:
         print(f"Quest Error: {e}")
 
@@ -331,7 +350,8 @@ def save_game():
     """
     global current_character
     try:
-        character_manager.save_character(current_character)
+        # Appends just the changed fields; falls back to a full save when needed
+        character_cache.save(current_character, write_through=True)
         print(f"Character '{current_character['name']}' saved successfully.")
     except Exception as e:
         print(f"Error saving game: {e}")
@@ -340,19 +360,30 @@ def load_game_data():
     """
     Load all quest and item data from files
     """
-    global all_quests, all_items
+    global all_quests, all_items, quest_index
     
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(use_cache=True)
+        all_items = game_data.load_items(use_cache=True)
+        combat_system.load_enemy_templates()
     except MissingDataFileError:
         print("Data files missing. Creating default files...")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(use_cache=True)
+        all_items = game_data.load_items(use_cache=True)
+        combat_system.load_enemy_templates()
     except InvalidDataFormatError as e:
         print(f"Invalid data format: {e}")
         raise
+    
+    # Build the quest index once and compile its prerequisite graph
+    # (rejects missing prerequisites and cycles)
+    quest_index = quest_handler.QuestIndex(all_quests)
+    try:
+        quest_handler.validate_quest_prerequisites(quest_index)
+    except (QuestNotFoundError, InvalidDataFormatError) as e:
+        print(f"Invalid quest prerequisites: {e}")
+        raise InvalidDataFormatError(str(e))
 
 def handle_character_death():
     """
@@ -410,6 +441,7 @@ def main():
         elif choice == 2:
             load_game()
         elif choice == 3:
+            character_cache.flush()  # Only writes characters passed to save()
             print("\nThanks for playing Quest Chronicles!")
             break
 
@@ -9,12 +9,16 @@ AI Usage: [Document any AI assistance used]
 This module handles quest management, dependencies, and completion.
 """
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, MutableMapping
 from custom_exceptions import (
+    InvalidDataFormatError,
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    CharacterDeadError
 )
 import character_manager
 
@@ -65,12 +69,22 @@ def complete_quest(character, quest_id, quest_data_dict):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
     
     quest = quest_data_dict[quest_id]
+    totals = _current_quest_totals(character, quest_data_dict)
     
     # Remove from active quests
     character['active_quests'].remove(quest_id)
     
     # Add to completed quests
-    character.setdefault('completed_quests', []).append(quest_id)
+    completed = character.setdefault('completed_quests', [])
+    newly_completed = quest_id not in completed
+    completed.append(quest_id)
+    
+    # Keep the running totals in step with the completed quests
+    if totals is not None:
+        if newly_completed:
+            totals.xp += quest['reward_xp']
+            totals.gold += quest['reward_gold']
+        totals.version = completed.version
     
     # Grant rewards
     character_manager.gain_experience(character, quest['reward_xp'])
@@ -107,13 +121,466 @@ def get_completed_quests(character, quest_data_dict):
 def get_available_quests(character, quest_data_dict):
     """
     Get quests that character can currently accept
+    
+    Given a QuestIndex, only quests without a prerequisite up to the
+    character's level, and quests unlocked by a completed quest, are
+    examined. Any other mapping is checked quest by quest. Same result
+    and order either way.
+    """
+    index = _shared_quest_index(quest_data_dict)
+    if index is None:
+        return [quest for qid, quest in quest_data_dict.items()
+                if can_accept_quest(character, qid, quest_data_dict)]
+    return index.available_quests(character)
+
+
+# ============================================================================ 
+# BULK QUEST OPERATIONS
+# ============================================================================
+
+def accept_quests(character, quest_ids, quest_data_dict):
+    """
+    Accept several quests in order
+    
+    Each quest gets the same checks as accept_quest; one that fails is
+    skipped and the rest are still accepted.
+    
+    Returns: List of {'quest_id', 'success', 'error'} dicts, in input order
+             ('error' is the exception, or None on success)
+    """
+    outcomes = []
+    for quest_id in quest_ids:
+        outcome = {'quest_id': quest_id, 'success': False, 'error': None}
+        try:
+            outcome['success'] = accept_quest(character, quest_id, quest_data_dict)
+        except (QuestNotFoundError, InsufficientLevelError,
+                QuestRequirementsNotMetError, QuestAlreadyCompletedError) as e:
+            outcome['error'] = e
+        outcomes.append(outcome)
+    return outcomes
+
+
+def complete_quests(character, quest_ids, quest_data_dict):
+    """
+    Complete several active quests at once
+    
+    Every quest is checked before anything changes: it must exist and be
+    active (a quest listed twice fails the second time). The ones that
+    pass are completed together, with their rewards granted by one
+    gain_experience call and one gold update. The result matches calling
+    complete_quest for each quest in turn.
+    
+    Returns: List of {'quest_id', 'success', 'xp', 'gold', 'error'} dicts,
+             in input order ('error' is the exception, or None on success).
+             If the character is dead, nothing changes and every quest
+             that would have completed gets a CharacterDeadError.
+    """
+    quest_ids = list(quest_ids)
+    return _complete_quests(character, quest_ids, quest_data_dict,
+                            _resolve_quests(quest_ids, quest_data_dict))
+
+
+def complete_quests_for_characters(character_quests, quest_data_dict):
+    """
+    Run complete_quests for many characters (e.g. a world event)
+    
+    character_quests: iterable of (character, quest_ids) pairs
+    
+    Each distinct quest is looked up once for the whole batch, which
+    matters for a DataPack, where every lookup decodes the record.
+    
+    Returns: List of complete_quests outcome lists, one per pair, in order
+    """
+    character_quests = [(character, list(quest_ids)) for character, quest_ids in character_quests]
+    resolved = {}
+    for character, quest_ids in character_quests:
+        _resolve_quests(quest_ids, quest_data_dict, resolved)
+    return [_complete_quests(character, quest_ids, quest_data_dict, resolved)
+            for character, quest_ids in character_quests]
+
+
+def _resolve_quests(quest_ids, quest_data_dict, resolved=None):
+    """Add each quest id's record to resolved, looking it up once (None if it does not exist)"""
+    if resolved is None:
+        resolved = {}
+    for quest_id in quest_ids:
+        if quest_id not in resolved:
+            resolved[quest_id] = quest_data_dict.get(quest_id)
+    return resolved
+
+
+def _complete_quests(character, quest_ids, quest_data_dict, resolved):
+    """complete_quests with the quest records already looked up"""
+    outcomes = []
+    passed = []
+    active = character.get('active_quests', [])
+    accepted = set()
+    for quest_id in quest_ids:
+        outcome = {'quest_id': quest_id, 'success': False, 'xp': 0, 'gold': 0, 'error': None}
+        if resolved[quest_id] is None:
+            outcome['error'] = QuestNotFoundError(f"Quest '{quest_id}' not found.")
+        elif quest_id not in active or quest_id in accepted:
+            outcome['error'] = QuestNotActiveError(f"Quest '{quest_id}' is not active.")
+        else:
+            accepted.add(quest_id)
+            passed.append(outcome)
+        outcomes.append(outcome)
+    
+    if not passed:
+        return outcomes
+    if character['health'] <= 0:
+        error = CharacterDeadError(f"{character['name']} is dead and cannot gain XP.")
+        for outcome in passed:
+            outcome['error'] = error
+        return outcomes
+    
+    totals = _current_quest_totals(character, quest_data_dict)
+    completed = character.setdefault('completed_quests', [])
+    total_xp = 0
+    total_gold = 0
+    for outcome in passed:
+        quest_id = outcome['quest_id']
+        quest = resolved[quest_id]
+        active.remove(quest_id)
+        if totals is not None and quest_id not in completed:
+            totals.xp += quest['reward_xp']
+            totals.gold += quest['reward_gold']
+        completed.append(quest_id)
+        outcome.update(success=True, xp=quest['reward_xp'], gold=quest['reward_gold'])
+        total_xp += quest['reward_xp']
+        total_gold += quest['reward_gold']
+    if totals is not None:
+        totals.version = completed.version
+    
+    # Level ups only depend on the total XP, so one grant matches granting each reward in turn
+    character_manager.gain_experience(character, total_xp)
+    character['gold'] = character.get('gold', 0) + total_gold
+    return outcomes
+
+
+# ============================================================================ 
+# QUEST INDEX
+# ============================================================================
+
+class QuestIndex(Mapping):
+    """
+    Lookup tables over a quest dictionary for fast availability checks
+    
+    - roots: quests with no prerequisite, sorted by required_level, so
+      the ones a character's level allows are one bisect away
+    - by_prerequisite: prerequisite id -> quests it unlocks
+    - position: quest id -> position in the dictionary, to keep results
+      in the dictionary's order
+    - levels: every quest id sorted by required_level, for level range
+      queries
+    
+    Only ids and levels are kept, never the quest records themselves, so
+    an index over a DataPack does not copy the pack into Python dicts;
+    records are looked up in quest_data for the quests a query returns.
+    
+    A QuestIndex is also a read-only mapping over its quest data, so it
+    can be passed to every function that takes quest data, and those that
+    can use the index do. Build one when the quests are loaded and pass it
+    around; it describes the quests as they were when it was built, so
+    build a new one after editing quests in place.
+    """
+    
+    def __init__(self, quest_data_dict):
+        self.quest_data = quest_data_dict
+        self.position = {}
+        self.by_prerequisite = {}
+        levels = []
+        roots = []
+        for position, (qid, quest) in enumerate(quest_data_dict.items()):
+            self.position[qid] = position
+            levels.append((quest['required_level'], position, qid))
+            prereq = quest.get('prerequisite', 'NONE')
+            if prereq == 'NONE':
+                roots.append((quest['required_level'], position, qid))
+            else:
+                self.by_prerequisite.setdefault(prereq, []).append(qid)
+        roots.sort()
+        self._root_levels = [level for level, position, qid in roots]
+        self._root_ids = [qid for level, position, qid in roots]
+        
+        levels.sort()
+        self._levels = [level for level, position, qid in levels]
+        self._level_ids = [qid for level, position, qid in levels]
+        self._graph = None
+    
+    # --- Mapping interface (the quest data itself) ------------------------
+    
+    def __getitem__(self, quest_id):
+        return self.quest_data[quest_id]
+    
+    def __contains__(self, quest_id):
+        return quest_id in self.quest_data
+    
+    def __iter__(self):
+        return iter(self.quest_data)
+    
+    def __len__(self):
+        return len(self.quest_data)
+    
+    def items(self):
+        return self.quest_data.items()
+    
+    def values(self):
+        return self.quest_data.values()
+    
+    # --- Queries -----------------------------------------------------------
+    
+    def prerequisite_graph(self):
+        """
+        The PrerequisiteGraph of these quests, compiled on first use
+        
+        Raises: QuestNotFoundError, InvalidDataFormatError (see PrerequisiteGraph)
+        """
+        if self._graph is None:
+            self._graph = PrerequisiteGraph(self.quest_data)
+        return self._graph
+    
+    def available_quest_ids(self, character):
+        """Ids of the quests the character can accept, in dictionary order"""
+        level = character.get('level', 1)
+        completed = _quest_id_set(character.get('completed_quests', []))
+        active = _quest_id_set(character.get('active_quests', []))
+        quests = self.quest_data
+        
+        candidates = self._root_ids[:bisect_right(self._root_levels, level)]
+        for done_id in completed:
+            for qid in self.by_prerequisite.get(done_id, ()):
+                if quests[qid]['required_level'] <= level:
+                    candidates.append(qid)
+        
+        available = [qid for qid in candidates if qid not in completed and qid not in active]
+        available.sort(key=self.position.__getitem__)
+        return available
+    
+    def available_quests(self, character):
+        """Quest data for available_quest_ids"""
+        quests = self.quest_data
+        return [quests[qid] for qid in self.available_quest_ids(character)]
+    
+    def quests_by_level(self, min_level, max_level):
+        """
+        Quests with min_level <= required_level <= max_level
+        
+        Two bisects find the range; the k matches are then put back in
+        dictionary order, so the cost is O(log n + k log k) instead of a
+        scan over every quest.
+        """
+        start = bisect_left(self._levels, min_level)
+        end = bisect_right(self._levels, max_level)
+        if start >= end:
+            return []
+        matches = self._level_ids[start:end]
+        matches.sort(key=self.position.__getitem__)
+        quests = self.quest_data
+        return [quests[qid] for qid in matches]
+
+class PrerequisiteGraph:
+    """
+    Compiled prerequisite graph of a quest dictionary
+    
+    Built once in O(V+E): checks every prerequisite exists, rejects
+    cycles, and records each quest's prerequisite depth and a
+    topological order (every quest after its prerequisite). Chains are
+    memoized, so asking for the same chain again is a dictionary lookup.
+    
+    Raises (when built):
+        QuestNotFoundError: if a prerequisite is not a known quest
+        InvalidDataFormatError: if prerequisites form a cycle (the message
+            shows the whole cycle, e.g. "a -> b -> a")
+    """
+    
+    def __init__(self, quest_data_dict):
+        self.parent = {}
+        for qid, quest in quest_data_dict.items():
+            prereq = quest.get('prerequisite', 'NONE')
+            if prereq != 'NONE' and prereq not in quest_data_dict:
+                raise QuestNotFoundError(f"Quest '{qid}' has invalid prerequisite '{prereq}'")
+            self.parent[qid] = prereq if prereq != 'NONE' else None
+        
+        # Each quest has at most one prerequisite, so walking up from every
+        # unvisited quest visits each quest once; a quest seen again on the
+        # current walk closes a cycle
+        self.depth = {}
+        self.order = []
+        for start in self.parent:
+            if start in self.depth:
+                continue
+            path = []
+            on_path = {}
+            current = start
+            while current is not None and current not in self.depth:
+                if current in on_path:
+                    cycle = path[on_path[current]:] + [current]
+                    raise InvalidDataFormatError(
+                        f"Quest prerequisites form a cycle: {' -> '.join(reversed(cycle))}"
+                    )
+                on_path[current] = len(path)
+                path.append(current)
+                current = self.parent[current]
+            # path runs from start up to the first known (or root) quest
+            depth = self.depth[current] if current is not None else -1
+            for qid in reversed(path):
+                depth += 1
+                self.depth[qid] = depth
+                self.order.append(qid)
+        self._chains = {}
+    
+    def chain(self, quest_id):
+        """
+        Prerequisite chain ending at quest_id, root quest first
+        
+        Returns: tuple of quest ids
+        Raises: QuestNotFoundError if the quest does not exist
+        """
+        chain = self._chains.get(quest_id)
+        if chain is None:
+            if quest_id not in self.parent:
+                raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
+            # Walk up until the root or a chain already built, then reverse once
+            reversed_ids = []
+            current = quest_id
+            prefix = ()
+            while current is not None:
+                known = self._chains.get(current)
+                if known is not None:
+                    prefix = known
+                    break
+                reversed_ids.append(current)
+                current = self.parent[current]
+            reversed_ids.reverse()
+            chain = prefix + tuple(reversed_ids)
+            self._chains[quest_id] = chain
+        return chain
+
+def get_quest_index(quest_data_dict):
+    """
+    Get a QuestIndex for quest data
+    
+    A QuestIndex is returned as it is; anything else gets a new index on
+    every call. Indexes are never cached behind the caller's back: build
+    one with QuestIndex(quests) once the quests are loaded and pass it
+    around instead of the quest data.
+    """
+    index = _shared_quest_index(quest_data_dict)
+    return index if index is not None else QuestIndex(quest_data_dict)
+
+def get_prerequisite_graph(quest_data_dict):
+    """
+    Get the compiled PrerequisiteGraph for quest data
+    
+    Comes from the QuestIndex when given one; compiled afresh for any
+    other mapping.
+    
+    Raises: QuestNotFoundError, InvalidDataFormatError (see PrerequisiteGraph)
+    """
+    index = _shared_quest_index(quest_data_dict)
+    if index is None:
+        return PrerequisiteGraph(quest_data_dict)
+    return index.prerequisite_graph()
+
+def _shared_quest_index(quest_data_dict):
+    """The caller's QuestIndex, or None when plain quest data was passed"""
+    return quest_data_dict if isinstance(quest_data_dict, QuestIndex) else None
+
+def _quest_id_set(quest_ids):
+    """QuestLogs already have set-speed membership; plain lists get copied into a set"""
+    if isinstance(quest_ids, character_manager.QuestLog):
+        return quest_ids
+    return set(quest_ids)
+
+def _walk_prerequisite_chain(quest_id, quest_data_dict):
+    """
+    One prerequisite chain, root first, without compiling the whole graph
+    
+    Raises: QuestNotFoundError, InvalidDataFormatError (same messages as
+            PrerequisiteGraph)
+    """
+    reversed_ids = []
+    on_chain = {}
+    current = quest_id
+    while current != 'NONE':
+        if current in on_chain:
+            cycle = reversed_ids[on_chain[current]:] + [current]
+            raise InvalidDataFormatError(
+                f"Quest prerequisites form a cycle: {' -> '.join(reversed(cycle))}"
+            )
+        quest = quest_data_dict.get(current)
+        if quest is None:
+            raise QuestNotFoundError(f"Quest '{reversed_ids[-1]}' has invalid prerequisite '{current}'")
+        on_chain[current] = len(reversed_ids)
+        reversed_ids.append(current)
+        current = quest.get('prerequisite', 'NONE')
+    reversed_ids.reverse()
+    return reversed_ids
+
+# ============================================================================ 
+# QUEST REWARD TOTALS
+# ============================================================================
+
+class _QuestTotals:
+    """
+    Running XP/gold totals for one character's completed quests
+    
+    Only kept for quest data that cannot change in place (a QuestIndex or
+    a read-only mapping such as a DataPack). Valid while that same quest
+    data object and the same completed QuestLog (same version) are used;
+    anything else makes _get_quest_totals rebuild them.
     """
-    available = []
-    for qid, quest in quest_data_dict.items():
-        if can_accept_quest(character, qid, quest_data_dict):
-            available.append(quest)
-    return available
+    
+    __slots__ = ("quest_data", "completed", "version", "xp", "gold")
+    
+    def __init__(self, quest_data_dict, completed):
+        self.quest_data = quest_data_dict
+        self.completed = completed
+        self.version = completed.version
+        self.xp, self.gold = _sum_quest_rewards(completed, quest_data_dict)
+    
+    def is_current(self, quest_data_dict, completed):
+        return (self.quest_data is quest_data_dict
+                and self.completed is completed
+                and self.version == completed.version)
 
+def _get_quest_totals(character, quest_data_dict):
+    """
+    Current _QuestTotals for a character, building them if needed
+    
+    Returns: _QuestTotals, or None when totals cannot be kept: for plain
+             dictionary characters, completed quests kept in a list, or
+             quest data that may be edited in place (a plain dict)
+    """
+    if not isinstance(character, character_manager.Character) or isinstance(quest_data_dict, MutableMapping):
+        return None
+    completed = character.get('completed_quests')
+    if not isinstance(completed, character_manager.QuestLog):
+        return None
+    totals = character.quest_totals
+    if totals is None or not totals.is_current(quest_data_dict, completed):
+        totals = _QuestTotals(quest_data_dict, completed)
+        character.quest_totals = totals
+    return totals
+
+def _current_quest_totals(character, quest_data_dict):
+    """The character's totals if they are already built and current, else None"""
+    totals = getattr(character, 'quest_totals', None)
+    if totals is not None and totals.is_current(quest_data_dict, character.get('completed_quests')):
+        return totals
+    return None
+
+def _sum_quest_rewards(quest_ids, quest_data_dict):
+    """(xp, gold) summed over the quests that exist in quest_data_dict"""
+    total_xp = 0
+    total_gold = 0
+    for qid in quest_ids:
+        quest = quest_data_dict.get(qid)
+        if quest:
+            total_xp += quest['reward_xp']
+            total_gold += quest['reward_gold']
+    return total_xp, total_gold
 
 # ============================================================================ 
 # QUEST TRACKING
@@ -154,21 +621,18 @@ def can_accept_quest(character, quest_id, quest_data_dict):
 def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     """
     Get the full chain of prerequisites for a quest
+    
+    Returns: List of quest ids, root quest first, ending with quest_id
+    Raises: QuestNotFoundError if the quest (or a prerequisite) does not exist
+            InvalidDataFormatError if prerequisites form a cycle
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
     
-    chain = []
-    current_id = quest_id
-    
-    while current_id != 'NONE':
-        chain.insert(0, current_id)
-        prereq = quest_data_dict[current_id].get('prerequisite', 'NONE')
-        if prereq == current_id:
-            break  # Avoid infinite loop
-        current_id = prereq
-    
-    return chain
+    index = _shared_quest_index(quest_data_dict)
+    if index is None:
+        return _walk_prerequisite_chain(quest_id, quest_data_dict)
+    return list(index.prerequisite_graph().chain(quest_id))
 
 
 # ============================================================================ 
@@ -184,18 +648,52 @@ def get_quest_completion_percentage(character, quest_data_dict):
 
 
 def get_total_quest_rewards_earned(character, quest_data_dict):
-    total_xp = 0
-    total_gold = 0
-    for qid in character.get('completed_quests', []):
-        quest = quest_data_dict.get(qid)
-        if quest:
-            total_xp += quest['reward_xp']
-            total_gold += quest['reward_gold']
+    """
+    XP and gold from the character's completed quests
+    
+    For a Character whose completed quests are a QuestLog, given a
+    QuestIndex or a read-only mapping, the totals are kept on the
+    character (see _QuestTotals): built with one pass over the completed
+    quests the first time, then updated by complete_quest. A character
+    that was just loaded has no totals yet; they are rebuilt on the first
+    call. Plain quest dicts are summed on every call.
+    """
+    totals = _get_quest_totals(character, quest_data_dict)
+    if totals is None:
+        total_xp, total_gold = _sum_quest_rewards(character.get('completed_quests', []), quest_data_dict)
+    else:
+        total_xp, total_gold = totals.xp, totals.gold
     return {'total_xp': total_xp, 'total_gold': total_gold}
 
 
+def get_quest_progress(character, quest_data_dict):
+    """
+    Quest counts, completion percentage and reward totals in one dictionary
+    
+    Returns: Dictionary with 'active', 'completed', 'percentage',
+             'total_xp' and 'total_gold'
+    """
+    progress = {
+        'active': len(character.get('active_quests', [])),
+        'completed': len(character.get('completed_quests', [])),
+        'percentage': get_quest_completion_percentage(character, quest_data_dict),
+    }
+    progress.update(get_total_quest_rewards_earned(character, quest_data_dict))
+    return progress
+
+
 def get_quests_by_level(quest_data_dict, min_level, max_level):
-    return [q for q in quest_data_dict.values() if min_level <= q['required_level'] <= max_level]
+    """
+    Quests whose required level is in [min_level, max_level]
+    
+    Answered with two bisects when given a QuestIndex (see
+    QuestIndex.quests_by_level); any other mapping is scanned. Same order
+    as the dictionary either way.
+    """
+    index = _shared_quest_index(quest_data_dict)
+    if index is None:
+        return [q for q in quest_data_dict.values() if min_level <= q['required_level'] <= max_level]
+    return index.quests_by_level(min_level, max_level)
 
 
 # ============================================================================ 
@@ -217,16 +715,13 @@ def display_quest_list(quest_list):
 
 
 def display_character_quest_progress(character, quest_data_dict):
-    active = len(character.get('active_quests', []))
-    completed = len(character.get('completed_quests', []))
-    percentage = get_quest_completion_percentage(character, quest_data_dict)
-    rewards = get_total_quest_rewards_earned(character, quest_data_dict)
+    progress = get_quest_progress(character, quest_data_dict)
     
     print("\n=== QUEST PROGRESS ===")
-    print(f"Active Quests: {active}")
-    print(f"Completed Quests: {completed}")
-    print(f"Completion: {percentage:.1f}%")
-    print(f"Total XP Earned: {rewards['total_xp']}, Total Gold Earned: {rewards['total_gold']}")
+    print(f"Active Quests: {progress['active']}")
+    print(f"Completed Quests: {progress['completed']}")
+    print(f"Completion: {progress['percentage']:.1f}%")
+    print(f"Total XP Earned: {progress['total_xp']}, Total Gold Earned: {progress['total_gold']}")
 
 
 # ============================================================================ 
@@ -234,10 +729,15 @@ def display_character_quest_progress(character, quest_data_dict):
 # ============================================================================
 
 def validate_quest_prerequisites(quest_data_dict):
-    for qid, quest in quest_data_dict.items():
-        prereq = quest.get('prerequisite', 'NONE')
-        if prereq != 'NONE' and prereq not in quest_data_dict:
-            raise QuestNotFoundError(f"Quest '{qid}' has invalid prerequisite '{prereq}'")
+    """
+    Check that every prerequisite exists and that there are no cycles
+    
+    Compiles the PrerequisiteGraph for quest_data_dict (kept on the
+    QuestIndex when given one, see get_prerequisite_graph).
+    
+    Raises: QuestNotFoundError, InvalidDataFormatError
+    """
+    get_prerequisite_graph(quest_data_dict)
     return True
 
 
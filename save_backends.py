@@ -0,0 +1,653 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Backends Module
+
+Storage backends for character save data. character_manager turns a
+character into save bytes (and back); a backend only stores those bytes
+under the character's name.
+
+- TextFileBackend: one {name}_save.txt file per character (the default)
+- SQLiteBackend: every save in one SQLite database (WAL journal, batched
+  transactions), for servers with very many characters
+
+Both raise the same custom exceptions, so callers do not care which one
+is in use. Each also keeps an append-only delta log per character for
+incremental saves (storing a full save clears that character's log), and
+an index of save summaries (name, class, level, gold, saved_at) so a
+character-select screen does not have to load every save.
+
+migrate_saves() copies saves between any two backends; run this file
+directly for a command-line migration tool.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError
+)
+
+SAVE_SUFFIX = "_save.txt"
+DELTA_SUFFIX = "_save.delta"
+INDEX_FILENAME = "save_index.jsonl"
+
+# The text index is rewritten without superseded lines once it passes this
+# size (and again each time it doubles from its last compacted size)
+INDEX_COMPACT_BYTES = 256 * 1024
+
+SUMMARY_FIELDS = ("name", "class", "level", "gold", "saved_at")
+
+# ============================================================================
+# TEXT FILE BACKEND
+# ============================================================================
+
+class TextFileBackend:
+    """
+    Stores each character in {save_directory}/{name}_save.txt
+
+    Writes are atomic (temp file + os.replace); fsync=True also flushes
+    each save to disk before it replaces the old one. Delta logs live
+    next to the save in {name}_save.delta.
+
+    Save summaries go in {save_directory}/save_index.jsonl, a journal of
+    one JSON object per line (the last line for a name wins; deleted
+    characters get a {"name": ..., "deleted": true} line). Each update is
+    a single append, and the journal is compacted (atomically rewritten)
+    as it grows. A torn last line is ignored.
+    """
+
+    def __init__(self, save_directory="data/save_games", fsync=False, max_workers=8):
+        self.save_directory = save_directory
+        self.fsync = fsync
+        self.max_workers = max_workers  # Threads used by write_many/read_many
+
+    def path_for(self, name):
+        """Full path of a character's save file"""
+        return os.path.join(self.save_directory, f"{name}{SAVE_SUFFIX}")
+
+    def delta_path_for(self, name):
+        """Full path of a character's delta log"""
+        return os.path.join(self.save_directory, f"{name}{DELTA_SUFFIX}")
+
+    def write(self, name, data):
+        """Store save bytes for one character"""
+        os.makedirs(self.save_directory, exist_ok=True)
+        write_file_atomic(self.path_for(name), data, self.fsync)
+        self.clear_deltas(name)
+        _bump_generation(self._generation_key(name))
+
+    def write_many(self, entries):
+        """
+        Store several (name, data) pairs
+
+        Creates the folder once, then writes the files from a thread pool
+        so the file I/O overlaps.
+
+        Returns: List with None (saved) or the exception for each entry
+        """
+        os.makedirs(self.save_directory, exist_ok=True)
+
+        def write_one(entry):
+            name, data = entry
+            try:
+                write_file_atomic(self.path_for(name), data, self.fsync)
+                self.clear_deltas(name)
+                _bump_generation(self._generation_key(name))
+            except Exception as e:
+                return e
+            return None
+
+        return _run_in_threads(write_one, entries, self.max_workers)
+
+    def read(self, name):
+        """
+        Get the save bytes for one character
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError
+        """
+        filepath = self.path_for(name)
+        if not os.path.exists(filepath):
+            raise CharacterNotFoundError(f"Save file for '{name}' not found.")
+        try:
+            with open(filepath, "rb") as f:
+                return f.read()
+        except Exception as e:
+            raise SaveFileCorruptedError(f"Could not read save file: {e}")
+
+    def read_many(self, names):
+        """
+        Get the save bytes for several characters, reading in a thread pool
+
+        Returns: List with the bytes or the exception for each name
+        """
+        def read_one(name):
+            try:
+                return self.read(name)
+            except Exception as e:
+                return e
+
+        return _run_in_threads(read_one, names, self.max_workers)
+
+    def append_delta(self, name, data):
+        """
+        Append one delta record to a character's log (one write call)
+
+        Returns: Size of the log in bytes after the append
+        """
+        os.makedirs(self.save_directory, exist_ok=True)
+        with open(self.delta_path_for(name), "ab") as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+            size = f.tell()
+        _bump_generation(self._generation_key(name))
+        return size
+
+    def read_deltas(self, name):
+        """Get a character's whole delta log (b"" if there is none)"""
+        try:
+            with open(self.delta_path_for(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return b""
+        except OSError as e:
+            raise SaveFileCorruptedError(f"Could not read delta log: {e}")
+
+    def clear_deltas(self, name):
+        """Remove a character's delta log, if any"""
+        try:
+            os.remove(self.delta_path_for(name))
+        except FileNotFoundError:
+            return
+        _bump_generation(self._generation_key(name))
+
+    def version(self, name):
+        """
+        Token that changes whenever the save or its delta log changes
+
+        The generation counts writes made in this process, so a rewrite
+        with the same size inside the file system's timestamp granularity
+        is still seen; (mtime_ns, size) catch writes by other processes.
+
+        Returns: (generation, mtime_ns and size of both files), or None
+                 if there is no save
+        """
+        try:
+            save_stat = os.stat(self.path_for(name))
+        except FileNotFoundError:
+            return None
+        try:
+            delta_stat = os.stat(self.delta_path_for(name))
+            delta_token = (delta_stat.st_mtime_ns, delta_stat.st_size)
+        except FileNotFoundError:
+            delta_token = None
+        return (_generation(self._generation_key(name)), save_stat.st_mtime_ns, save_stat.st_size,
+                delta_token)
+
+    def saved_times(self):
+        """
+        Time of every character's last full save, from one folder scan
+
+        Returns: Dictionary of name -> seconds since the epoch
+        """
+        try:
+            entries = os.scandir(self.save_directory)
+        except FileNotFoundError:
+            return {}
+        times = {}
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(SAVE_SUFFIX):
+                    try:
+                        times[entry.name[:-len(SAVE_SUFFIX)]] = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        pass  # Deleted during the scan
+        return times
+
+    def update_summaries(self, summaries):
+        """Record summaries (dicts with SUMMARY_FIELDS) in the index with one append"""
+        lines = "".join(json.dumps(summary, separators=(",", ":")) + "\n" for summary in summaries)
+        if lines:
+            self._append_index(lines)
+
+    def read_summaries(self):
+        """
+        Get every summary in the index
+
+        Returns: Dictionary of name -> summary dict (empty if there is no index)
+        """
+        with _index_lock(self.index_path):
+            return self._read_index()
+
+    @property
+    def index_path(self):
+        """Full path of the save index"""
+        return os.path.join(self.save_directory, INDEX_FILENAME)
+
+    def _append_index(self, lines):
+        """Append journal lines, compacting the index when it has grown enough"""
+        os.makedirs(self.save_directory, exist_ok=True)
+        path = self.index_path
+        with _index_lock(path):
+            with open(path, "ab+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    # Start on a fresh line if the last append was torn
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        lines = "\n" + lines
+                f.write(lines.encode("utf-8"))
+                size = f.tell()
+            key = os.path.abspath(path)
+            if size > max(INDEX_COMPACT_BYTES, 2 * _index_compacted_sizes.get(key, 0)):
+                summaries = self._read_index()
+                data = "".join(json.dumps(summary, separators=(",", ":")) + "\n"
+                               for summary in summaries.values()).encode("utf-8")
+                write_file_atomic(path, data, self.fsync)
+                _index_compacted_sizes[key] = len(data)
+
+    def _read_index(self):
+        """Parse the journal into name -> summary (caller holds the index lock)"""
+        summaries = {}
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        name = record["name"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn or damaged line
+                    if record.get("deleted"):
+                        summaries.pop(name, None)
+                    else:
+                        summaries[name] = record
+        except FileNotFoundError:
+            pass
+        return summaries
+
+    def exists(self, name):
+        """True if the character has a save"""
+        return os.path.exists(self.path_for(name))
+
+    def list_names(self):
+        """Names of all saved characters"""
+        if not os.path.exists(self.save_directory):
+            return []
+        return [f[:-len(SAVE_SUFFIX)] for f in os.listdir(self.save_directory)
+                if f.endswith(SAVE_SUFFIX)]
+
+    def delete(self, name):
+        """
+        Remove a character's save
+
+        Raises: CharacterNotFoundError
+        """
+        filepath = self.path_for(name)
+        if not os.path.exists(filepath):
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        os.remove(filepath)
+        self.clear_deltas(name)
+        _bump_generation(self._generation_key(name))
+        self._append_index(json.dumps({"name": name, "deleted": True}, separators=(",", ":")) + "\n")
+
+    def close(self):
+        """Nothing to release"""
+        pass
+
+    def _generation_key(self, name):
+        """Key of a character's write counter (shared by backends on the same folder)"""
+        return os.path.abspath(self.path_for(name))
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+class SQLiteBackend:
+    """
+    Stores every character's save bytes in one SQLite table
+
+    Uses a WAL journal (readers never block the writer), one reused
+    connection (sqlite3 caches the prepared statements below), and a
+    single transaction per write_many() batch. A lock makes the
+    connection safe to share between threads.
+    """
+
+    _UPSERT = ("INSERT INTO saves (name, data, saved_at) VALUES (?, ?, ?) "
+               "ON CONFLICT(name) DO UPDATE SET data = excluded.data, saved_at = excluded.saved_at")
+    _SELECT = "SELECT data FROM saves WHERE name = ?"
+    _CLEAR_DELTAS = "DELETE FROM deltas WHERE name = ?"
+
+    def __init__(self, db_path="data/save_games.db"):
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS saves ("
+                "name TEXT PRIMARY KEY, data BLOB NOT NULL, saved_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS deltas ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS deltas_by_name ON deltas (name, seq)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "name TEXT PRIMARY KEY, class TEXT, level INTEGER, gold INTEGER, saved_at REAL)"
+            )
+            self._conn.commit()
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Could not open save database '{db_path}': {e}")
+
+    def write(self, name, data):
+        """Store save bytes for one character"""
+        error = self.write_many([(name, data)])[0]
+        if error is not None:
+            raise error
+
+    def write_many(self, entries):
+        """
+        Store several (name, data) pairs in one transaction
+
+        Returns: List with None (saved) or the exception for each entry
+                 (the transaction is all-or-nothing)
+        """
+        now = time.time()
+        rows = [(name, data, now) for name, data in entries]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(self._UPSERT, rows)
+                self._conn.executemany(self._CLEAR_DELTAS, [(row[0],) for row in rows])
+        except sqlite3.Error as e:
+            return [e] * len(rows)
+        for row in rows:
+            _bump_generation(self._generation_key(row[0]))
+        return [None] * len(rows)
+
+    def read(self, name):
+        """
+        Get the save bytes for one character
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(self._SELECT, (name,)).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Could not read save for '{name}': {e}")
+        if row is None:
+            raise CharacterNotFoundError(f"Save file for '{name}' not found.")
+        return bytes(row[0])
+
+    def read_many(self, names):
+        """
+        Get the save bytes for several characters with batched SELECTs
+
+        Returns: List with the bytes or the exception for each name
+        """
+        names = list(names)
+        found = {}
+        try:
+            with self._lock:
+                # Stay under SQLite's limit on ? parameters per statement
+                for start in range(0, len(names), 500):
+                    chunk = names[start:start + 500]
+                    query = f"SELECT name, data FROM saves WHERE name IN ({','.join('?' * len(chunk))})"
+                    for name, data in self._conn.execute(query, chunk):
+                        found[name] = bytes(data)
+        except sqlite3.DatabaseError as e:
+            return [SaveFileCorruptedError(f"Could not read saves: {e}")] * len(names)
+        return [found[name] if name in found
+                else CharacterNotFoundError(f"Save file for '{name}' not found.")
+                for name in names]
+
+    def append_delta(self, name, data):
+        """
+        Append one delta record to a character's log
+
+        Returns: Size of the log in bytes after the append
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO deltas (name, data) VALUES (?, ?)", (name, data))
+            size = int(self._conn.execute(
+                "SELECT TOTAL(LENGTH(data)) FROM deltas WHERE name = ?", (name,)
+            ).fetchone()[0])
+        _bump_generation(self._generation_key(name))
+        return size
+
+    def read_deltas(self, name):
+        """Get a character's whole delta log (b"" if there is none)"""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT data FROM deltas WHERE name = ? ORDER BY seq", (name,)
+                ).fetchall()
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Could not read delta log for '{name}': {e}")
+        return b"".join(bytes(row[0]) for row in rows)
+
+    def clear_deltas(self, name):
+        """Remove a character's delta log, if any"""
+        with self._lock, self._conn:
+            self._conn.execute(self._CLEAR_DELTAS, (name,))
+        _bump_generation(self._generation_key(name))
+
+    def version(self, name):
+        """
+        Token that changes whenever the save or its delta log changes
+
+        As for TextFileBackend, the generation counts writes made in this
+        process (two saves can share a saved_at timestamp).
+
+        Returns: (generation, saved_at, newest delta number), or None if
+                 there is no save
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT saved_at, (SELECT MAX(seq) FROM deltas WHERE name = ?) "
+                "FROM saves WHERE name = ?", (name, name)
+            ).fetchone()
+        return (_generation(self._generation_key(name)),) + tuple(row) if row is not None else None
+
+    def saved_times(self):
+        """
+        Time of every character's last full save, from one query
+
+        Returns: Dictionary of name -> seconds since the epoch
+        """
+        with self._lock:
+            return dict(self._conn.execute("SELECT name, saved_at FROM saves"))
+
+    def update_summaries(self, summaries):
+        """Record summaries (dicts with SUMMARY_FIELDS) in one transaction"""
+        rows = [tuple(summary[field] for field in SUMMARY_FIELDS) for summary in summaries]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (name, class, level, gold, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def read_summaries(self):
+        """
+        Get every summary in the index
+
+        Returns: Dictionary of name -> summary dict
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, class, level, gold, saved_at FROM summaries ORDER BY name"
+            ).fetchall()
+        return {row[0]: dict(zip(SUMMARY_FIELDS, row)) for row in rows}
+
+    def exists(self, name):
+        """True if the character has a save"""
+        with self._lock:
+            return self._conn.execute(self._SELECT, (name,)).fetchone() is not None
+
+    def list_names(self):
+        """Names of all saved characters"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM saves ORDER BY name")]
+
+    def delete(self, name):
+        """
+        Remove a character's save
+
+        Raises: CharacterNotFoundError
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM saves WHERE name = ?", (name,))
+            self._conn.execute(self._CLEAR_DELTAS, (name,))
+            self._conn.execute("DELETE FROM summaries WHERE name = ?", (name,))
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        _bump_generation(self._generation_key(name))
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _generation_key(self, name):
+        """Key of a character's write counter (shared by backends on the same database)"""
+        return (os.path.abspath(self.db_path), name)
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def open_backend(location):
+    """
+    Open a backend from a path
+
+    Paths ending in .db/.sqlite/.sqlite3 open a SQLiteBackend; anything
+    else is treated as a save folder for a TextFileBackend.
+    """
+    if location.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteBackend(location)
+    return TextFileBackend(location)
+
+def migrate_saves(source, destination, batch_size=500):
+    """
+    Copy every save from one backend to another
+
+    Save bytes are copied unchanged, in batches of batch_size per
+    write_many() call (one transaction each for SQLite), followed by each
+    character's delta log and index summary. Summaries are stamped with
+    the time of the copy, so they are not older than the new saves.
+
+    Returns: Number of saves copied
+    """
+    copied = 0
+    names = source.list_names()
+    summaries = source.read_summaries()
+    for start in range(0, len(names), batch_size):
+        batch = []
+        for name, data in zip(names[start:start + batch_size],
+                              source.read_many(names[start:start + batch_size])):
+            if isinstance(data, Exception):
+                raise data
+            batch.append((name, data))
+        for error in destination.write_many(batch):
+            if error is not None:
+                raise error
+        saved_at = time.time()
+        for name, data in batch:
+            deltas = source.read_deltas(name)
+            if deltas:
+                destination.append_delta(name, deltas)
+        destination.update_summaries([dict(summaries[name], saved_at=saved_at)
+                                      for name, data in batch if name in summaries])
+        copied += len(batch)
+    return copied
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+_index_locks = {}  # index path -> lock shared by every TextFileBackend in this process
+_index_locks_guard = threading.Lock()
+_index_compacted_sizes = {}  # index path -> size after its last compaction
+_generations = {}  # generation key -> writes to that character made in this process
+_generations_guard = threading.Lock()
+
+def _index_lock(path):
+    """The lock serialising index appends/compaction for one save folder"""
+    path = os.path.abspath(path)
+    with _index_locks_guard:
+        lock = _index_locks.get(path)
+        if lock is None:
+            lock = _index_locks[path] = threading.Lock()
+        return lock
+
+def _bump_generation(key):
+    """Count one more write to a character's save or delta log"""
+    with _generations_guard:
+        _generations[key] = _generations.get(key, 0) + 1
+
+def _generation(key):
+    """Writes counted for a character so far (0 if none)"""
+    return _generations.get(key, 0)
+
+def _run_in_threads(function, values, max_workers):
+    """map() function over values in a thread pool (inline for 0-1 values)"""
+    values = list(values)
+    if len(values) <= 1 or max_workers <= 1:
+        return [function(value) for value in values]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(values))) as pool:
+        return list(pool.map(function, values))
+
+def write_file_atomic(filepath, data, fsync=False):
+    """
+    Replace a file's contents so readers see either the old or new version.
+
+    Writes data (bytes) to a temp file next to filepath (same filesystem,
+    so the rename is atomic), optionally fsyncs it, then os.replace()s it
+    into place. The temp file is removed if anything fails.
+    """
+    # pid + thread id keeps concurrent writers from sharing a temp file
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# ============================================================================
+# COMMAND LINE MIGRATION TOOL
+# ============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Copy character saves between a save folder and a SQLite database."
+    )
+    parser.add_argument("source", help="save folder or .db file to copy from")
+    parser.add_argument("destination", help="save folder or .db file to copy to")
+    args = parser.parse_args()
+
+    source_backend = open_backend(args.source)
+    destination_backend = open_backend(args.destination)
+    try:
+        count = migrate_saves(source_backend, destination_backend)
+        print(f"Migrated {count} saves from {args.source} to {args.destination}")
+    finally:
+        source_backend.close()
+        destination_backend.close()
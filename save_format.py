@@ -0,0 +1,331 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Format Module
+
+Compact binary encoding for character saves.
+
+Layout (all integers little-endian):
+- header: magic b"QCSV", format version (u16), extra field count (u16)
+- core block: the twelve fields every character has, in one fixed struct
+    level, health, max_health, strength, magic, experience, gold (int64)
+    byte lengths of name and class (u32 each)
+    for inventory, active_quests, completed_quests: item count and
+    byte length (u32 each)
+  followed by the UTF-8 text of name, class and the three lists (list
+  items are joined by NUL bytes, so ids may contain commas but not NUL)
+- extra fields (equipped_weapon, special_cooldown, ...), one record each:
+    key length (u8), key (UTF-8), type tag (u8), payload length (u32),
+    payload
+
+Extra field payloads by type tag:
+- TYPE_NONE: empty
+- TYPE_INT:  int64
+- TYPE_STR:  UTF-8 text
+- TYPE_LIST: item count (u32), then the items joined by NUL bytes
+- TYPE_BOOL: one byte, 0 or 1
+
+Extra fields carry their own name and payload length, so a reader skips
+type tags it does not know and keeps field names it does not know. New
+optional fields never need a format change; the version number goes up
+when the core block changes or a new type tag is added (version 2 added
+TYPE_BOOL), so an older reader reports the save as too new instead of
+dropping the fields it cannot decode.
+
+Delta logs (incremental saves) are a sequence of records appended after
+a snapshot:
+- payload length (u32), CRC-32 of the snapshot it applies to (u32),
+  CRC-32 of the payload (u32)
+- payload: changed field count (u16) + field records as above, then
+  removed key count (u16) + keys (u8 length + UTF-8)
+
+A record whose payload CRC does not match (a torn write) ends the log;
+records for a different snapshot are stale and skipped.
+"""
+
+import struct
+import zlib
+from custom_exceptions import InvalidSaveDataError
+
+SAVE_MAGIC = b"QCSV"
+SAVE_FORMAT_VERSION = 2
+
+TYPE_NONE = 0
+TYPE_INT = 1
+TYPE_STR = 2
+TYPE_LIST = 3
+TYPE_BOOL = 4
+
+# Core block fields (must match character_manager.CHARACTER_FIELDS)
+CORE_INT_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+CORE_LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+CORE_FIELDS = frozenset(("name", "class") + CORE_INT_FIELDS + CORE_LIST_FIELDS)
+
+_HEADER = struct.Struct("<4sHH")
+_CORE = struct.Struct("<7q2I6I")
+_FIELD_HEADER = struct.Struct("<BI")  # type tag, payload length
+_INT = struct.Struct("<q")
+_U32 = struct.Struct("<I")
+_U16 = struct.Struct("<H")
+_DELTA_HEADER = struct.Struct("<III")  # payload length, snapshot CRC, payload CRC
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def encode_character(character):
+    """
+    Encode a character mapping into binary save bytes
+
+    Every core field must be present. Other values may be None, bool, int,
+    str, or a sequence of str.
+
+    Returns: bytes
+    Raises: InvalidSaveDataError if a field is missing or has an unsupported type
+    """
+    try:
+        ints = [character[field] for field in CORE_INT_FIELDS]
+        name = character["name"].encode("utf-8")
+        character_class = character["class"].encode("utf-8")
+        lists = [_join_list(character[field], field) for field in CORE_LIST_FIELDS]
+    except KeyError as e:
+        raise InvalidSaveDataError(f"Missing field in character: {e}")
+    except AttributeError:
+        raise InvalidSaveDataError("Character name and class must be text.")
+
+    try:
+        core = _CORE.pack(*ints, len(name), len(character_class),
+                          lists[0][0], len(lists[0][1]),
+                          lists[1][0], len(lists[1][1]),
+                          lists[2][0], len(lists[2][1]))
+    except struct.error:
+        raise InvalidSaveDataError("Numeric fields in character contain invalid values.")
+
+    extra = []
+    for key in character:
+        if key not in CORE_FIELDS:
+            extra.append(_encode_extra_field(key, character[key]))
+    if len(extra) > 0xFFFF:
+        raise InvalidSaveDataError("Too many fields for one save.")
+
+    return b"".join([_HEADER.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION, len(extra)), core,
+                     name, character_class, lists[0][1], lists[1][1], lists[2][1]] + extra)
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def is_binary_save(data):
+    """True if data starts with the binary save magic"""
+    return data[:len(SAVE_MAGIC)] == SAVE_MAGIC
+
+def decode_character(data):
+    """
+    Decode binary save bytes into a dictionary of fields
+
+    Core fields come first (lists come back as lists), then extra fields
+    in save order. Extra fields with an unknown type tag are skipped.
+
+    Returns: Dictionary of field name -> value
+    Raises: InvalidSaveDataError if the data is truncated, has the wrong
+            magic, or comes from a newer format version
+    """
+    data = bytes(data)
+    try:
+        magic, version, extra_count = _HEADER.unpack_from(data, 0)
+        core = _CORE.unpack_from(data, _HEADER.size)
+    except struct.error:
+        raise InvalidSaveDataError("Save data is too short for a binary save.")
+    if magic != SAVE_MAGIC:
+        raise InvalidSaveDataError("Save data is not a binary save.")
+    if version > SAVE_FORMAT_VERSION:
+        raise InvalidSaveDataError(
+            f"Save format version {version} is newer than this game supports ({SAVE_FORMAT_VERSION})."
+        )
+
+    position = _HEADER.size + _CORE.size
+    name_end = position + core[7]
+    class_end = name_end + core[8]
+    if class_end + core[10] + core[12] + core[14] > len(data):
+        raise InvalidSaveDataError("Save data is truncated.")
+
+    try:
+        fields = {"name": data[position:name_end].decode("utf-8"),
+                  "class": data[name_end:class_end].decode("utf-8")}
+        fields.update(zip(CORE_INT_FIELDS, core[:7]))
+        position = class_end
+        for index, field in enumerate(CORE_LIST_FIELDS):
+            count, length = core[9 + 2 * index], core[10 + 2 * index]
+            fields[field] = _split_list(data[position:position + length], count, field)
+            position += length
+
+        for _ in range(extra_count):
+            key, value, known, position = _decode_extra_field(data, position)
+            if known:
+                fields[key] = value
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise InvalidSaveDataError(f"Save data is corrupted: {e}")
+
+    if position != len(data):
+        raise InvalidSaveDataError("Save data has trailing bytes.")
+    return fields
+
+# ============================================================================
+# DELTA LOGS
+# ============================================================================
+
+def snapshot_checksum(data):
+    """CRC-32 identifying a snapshot, stored in every delta written after it"""
+    return zlib.crc32(data)
+
+def encode_delta(snapshot_crc, changes, removed=()):
+    """
+    Encode one delta record
+
+    changes: mapping of field name -> new value (same types as extra fields)
+    removed: field names deleted from the character
+
+    Returns: bytes (one complete record, ready to append)
+    Raises: InvalidSaveDataError if a value has an unsupported type
+    """
+    parts = [_U16.pack(len(changes))]
+    parts.extend(_encode_extra_field(key, value) for key, value in changes.items())
+    parts.append(_U16.pack(len(removed)))
+    for key in removed:
+        key_bytes = key.encode("utf-8")
+        parts.append(bytes((len(key_bytes),)) + key_bytes)
+    payload = b"".join(parts)
+    return _DELTA_HEADER.pack(len(payload), snapshot_crc, zlib.crc32(payload)) + payload
+
+def decode_deltas(log, snapshot_crc):
+    """
+    Decode a delta log, keeping only records written after this snapshot
+
+    Returns: (deltas, intact)
+             deltas: list of (changes dict, removed list), oldest first
+             intact: False if the log ends in a torn or corrupted record
+    """
+    log = bytes(log)
+    deltas = []
+    position = 0
+    while position < len(log):
+        try:
+            length, base_crc, payload_crc = _DELTA_HEADER.unpack_from(log, position)
+        except struct.error:
+            return deltas, False
+        start = position + _DELTA_HEADER.size
+        payload = log[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != payload_crc:
+            return deltas, False
+        position = start + length
+        if base_crc != snapshot_crc:
+            continue  # Written against an older snapshot
+
+        try:
+            deltas.append(_decode_delta_payload(payload))
+        except (IndexError, struct.error, UnicodeDecodeError, InvalidSaveDataError):
+            return deltas, False
+    return deltas, True
+
+def _decode_delta_payload(payload):
+    """Decode the changed fields and removed keys of one delta record"""
+    changes = {}
+    count = _U16.unpack_from(payload, 0)[0]
+    position = _U16.size
+    for _ in range(count):
+        key, value, known, position = _decode_extra_field(payload, position)
+        if known:
+            changes[key] = value
+
+    removed = []
+    count = _U16.unpack_from(payload, position)[0]
+    position += _U16.size
+    for _ in range(count):
+        key_length = payload[position]
+        removed.append(payload[position + 1:position + 1 + key_length].decode("utf-8"))
+        position += 1 + key_length
+
+    if position != len(payload):
+        raise InvalidSaveDataError("Delta record has trailing bytes.")
+    return changes, removed
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _join_list(values, field):
+    """Return (item count, NUL-joined UTF-8 bytes) for a sequence of strings"""
+    values = list(values)
+    try:
+        joined = "\x00".join(values)
+    except TypeError:
+        raise InvalidSaveDataError(f"Field '{field}' can only contain text values.")
+    if joined.count("\x00") != max(len(values) - 1, 0):
+        raise InvalidSaveDataError(f"Field '{field}' contains a NUL character.")
+    return len(values), joined.encode("utf-8")
+
+def _split_list(payload, count, field):
+    """Inverse of _join_list"""
+    if count == 0:
+        if payload:
+            raise InvalidSaveDataError(f"Empty list field '{field}' has trailing bytes.")
+        return []
+    values = payload.decode("utf-8").split("\x00")
+    if len(values) != count:
+        raise InvalidSaveDataError(f"List field '{field}' has the wrong number of items.")
+    return values
+
+def _encode_extra_field(key, value):
+    """Encode one self-describing extra field record"""
+    key_bytes = key.encode("utf-8")
+    if len(key_bytes) > 255:
+        raise InvalidSaveDataError(f"Save field name too long: {key[:20]}...")
+
+    if value is None:
+        tag, payload = TYPE_NONE, b""
+    elif isinstance(value, bool):  # Before int: bool is an int subclass
+        tag, payload = TYPE_BOOL, bytes((value,))
+    elif isinstance(value, int):
+        tag, payload = TYPE_INT, _INT.pack(value)
+    elif isinstance(value, str):
+        tag, payload = TYPE_STR, value.encode("utf-8")
+    elif isinstance(value, (list, tuple)) or hasattr(value, "to_list"):
+        count, joined = _join_list(value, key)
+        tag, payload = TYPE_LIST, _U32.pack(count) + joined
+    else:
+        raise InvalidSaveDataError(
+            f"Cannot save field '{key}' of type {type(value).__name__}."
+        )
+
+    return bytes((len(key_bytes),)) + key_bytes + _FIELD_HEADER.pack(tag, len(payload)) + payload
+
+def _decode_extra_field(data, position):
+    """
+    Decode one extra field record starting at position
+
+    Returns: (key, value, known, next position); known is False for a
+             type tag from a newer game, whose payload is skipped
+    """
+    key_length = data[position]
+    position += 1
+    key = data[position:position + key_length].decode("utf-8")
+    position += key_length
+    tag, length = _FIELD_HEADER.unpack_from(data, position)
+    position += _FIELD_HEADER.size
+    end = position + length
+    if end > len(data):
+        raise InvalidSaveDataError(f"Save data is truncated in field '{key}'.")
+
+    if tag == TYPE_NONE:
+        return key, None, True, end
+    if tag == TYPE_INT:
+        return key, _INT.unpack_from(data, position)[0], True, end
+    if tag == TYPE_STR:
+        return key, data[position:end].decode("utf-8"), True, end
+    if tag == TYPE_LIST:
+        count = _U32.unpack_from(data, position)[0]
+        return key, _split_list(data[position + _U32.size:end], count, key), True, end
+    if tag == TYPE_BOOL:
+        if length != 1 or data[position] > 1:
+            raise InvalidSaveDataError(f"Invalid boolean in field '{key}'.")
+        return key, data[position] == 1, True, end
+    return key, None, False, end
@@ -0,0 +1,60 @@
+"""
+Test Battle Simulator
+Tests that batch battle results match SimpleBattle exactly
+"""
+
+import pytest
+import sys
+import os
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+import battle_simulator
+import combat_system
+from custom_exceptions import CharacterDeadError
+
+def run_simple_battle(char, enemy):
+    """Run one SimpleBattle quietly and return (result, battle)"""
+    battle = combat_system.SimpleBattle(char, enemy)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = battle.start_battle()
+    return result, battle
+
+def test_batch_matches_simple_battle():
+    """Test winner, turns, rewards and remaining health against the loop"""
+    rng = random.Random(42)
+    characters = []
+    enemies = []
+    for _ in range(300):
+        characters.append({'name': 'Hero', 'health': rng.randint(1, 150), 'strength': rng.randint(0, 30)})
+        enemies.append({'name': 'Foe', 'health': rng.randint(0, 250), 'strength': rng.randint(0, 40),
+                        'xp_reward': rng.randint(0, 100), 'gold_reward': rng.randint(0, 50)})
+    
+    batch = battle_simulator.simulate_battle_pairs(characters, enemies)
+    
+    for i, (char, enemy) in enumerate(zip(characters, enemies)):
+        result, battle = run_simple_battle(dict(char), dict(enemy))
+        assert battle_simulator.WINNER_NAMES[int(batch['winner'][i])] == result['winner']
+        assert int(batch['xp_gained'][i]) == result['xp_gained']
+        assert int(batch['gold_gained'][i]) == result['gold_gained']
+        assert int(batch['turns'][i]) - 1 == battle.turn_counter
+        assert int(batch['character_health'][i]) == battle.character['health']
+        assert int(batch['enemy_health'][i]) == battle.enemy['health']
+
+def test_batch_rejects_dead_characters():
+    """Test that a dead character raises like start_battle does"""
+    with pytest.raises(CharacterDeadError):
+        battle_simulator.simulate_battles([0, 10], [5, 5], [10, 10], [5, 5])
+
+def test_batch_rejects_mismatched_lengths():
+    """Test that stat arrays must line up"""
+    with pytest.raises(ValueError):
+        battle_simulator.simulate_battles([10, 10], [5], [10, 10], [5, 5])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,522 @@
+"""
+Test Character Manager
+Tests the compact character model and character operations
+"""
+
+import pytest
+import asyncio
+import random
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import save_backends
+import save_format
+from custom_exceptions import InvalidSaveDataError, CharacterNotFoundError
+
+# ============================================================================
+# CHARACTER MODEL TESTS
+# ============================================================================
+
+def test_character_behaves_like_dict():
+    """Test the dictionary-style interface of Character"""
+    char = character_manager.create_character("SlotTest", "Warrior")
+    
+    assert isinstance(char, character_manager.Character)
+    assert char['class'] == "Warrior"
+    assert 'equipped_weapon' not in char
+    assert char.get('equipped_weapon') is None
+    assert char.setdefault('special_cooldown', 0) == 0
+    assert 'special_cooldown' in char
+    
+    with pytest.raises(KeyError):
+        char['equipped_armor']
+    
+    # Keys outside the known fields still work
+    char['defense'] = 3
+    assert char['defense'] == 3
+    assert list(char)[-1] == 'defense'
+    
+    plain = char.to_dict()
+    assert char == plain
+    assert len(char) == len(plain)
+
+def test_character_has_no_instance_dict():
+    """Test that Character really uses __slots__"""
+    char = character_manager.create_character("SlotTest", "Mage")
+    
+    assert not hasattr(char, '__dict__')
+
+def test_character_works_with_item_effects():
+    """Test that inventory functions work on a Character"""
+    char = character_manager.create_character("GearTest", "Rogue")
+    inventory_system.add_item_to_inventory(char, "ring")
+    inventory_system.equip_weapon(char, "ring", {'type': 'weapon', 'effect': 'luck:2'})
+    
+    assert char['equipped_weapon'] == "ring"
+    assert char['luck'] == 2
+
+def test_quest_log_acts_like_ordered_list():
+    """Test QuestLog membership, removal and ordering"""
+    quests = character_manager.QuestLog(["b", "a"])
+    quests.append("c")
+    quests.append("a")  # Already present: ignored
+
+    assert quests == ["b", "a", "c"]
+    assert "a" in quests and "z" not in quests
+    assert quests[-1] == "c"
+
+    quests.remove("a")
+    assert list(quests) == ["b", "c"]
+    with pytest.raises(ValueError):
+        quests.remove("a")
+    assert quests.copy() == quests and quests.copy() is not quests
+
+def test_quest_logs_survive_save_and_load(tmp_path):
+    """Test that quest logs round-trip in both save formats and delta logs"""
+    char = character_manager.create_character("QuestLogTest", "Mage")
+    assert isinstance(char['active_quests'], character_manager.QuestLog)
+    char['active_quests'].extend(["second", "first"])
+    char['completed_quests'].append("tutorial")
+
+    for save_format_name in (character_manager.SAVE_FORMAT_BINARY, character_manager.SAVE_FORMAT_TEXT):
+        character_manager.save_character(char, str(tmp_path), save_format=save_format_name)
+        loaded = character_manager.load_character("QuestLogTest", str(tmp_path))
+        assert isinstance(loaded['active_quests'], character_manager.QuestLog)
+        assert loaded['active_quests'] == ["second", "first"]
+        assert loaded == char
+
+    char['active_quests'].remove("second")
+    character_manager.save_character_changes(char, str(tmp_path))
+    loaded = character_manager.load_character("QuestLogTest", str(tmp_path))
+    assert isinstance(loaded['active_quests'], character_manager.QuestLog)
+    assert loaded['active_quests'] == ["first"]
+    assert character_manager.validate_character_data(loaded)
+
+# ============================================================================
+# EXPERIENCE TESTS
+# ============================================================================
+
+def reference_gain_experience(character, xp_amount):
+    """The original one-level-at-a-time loop"""
+    character['experience'] += xp_amount
+    while character['experience'] >= character['level'] * 100:
+        character['experience'] -= character['level'] * 100
+        character['level'] += 1
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+
+def test_gain_experience_matches_loop():
+    """Test the closed-form level-up against the loop on random inputs"""
+    rng = random.Random(163)
+    for _ in range(2000):
+        char = character_manager.create_character("XpTest", "Warrior")
+        char['level'] = rng.randint(1, 60)
+        char['experience'] = rng.randint(0, char['level'] * 100 - 1)
+        char['health'] = rng.randint(1, char['max_health'])
+        xp = rng.choice([rng.randint(0, 500), rng.randint(0, 50_000), rng.randint(0, 2_000_000)])
+        expected = char.to_dict()
+        reference_gain_experience(expected, xp)
+        
+        character_manager.gain_experience(char, xp)
+        
+        assert char == expected
+
+def test_gain_experience_huge_grant_is_fast():
+    """Test that a huge XP grant does not level up one level at a time"""
+    char = character_manager.create_character("Admin", "Mage")
+    
+    character_manager.gain_experience(char, 10 ** 15)
+    
+    assert character_manager._xp_for_levels(1, char['level'] - 1) <= 10 ** 15
+    assert char['experience'] < char['level'] * 100
+    assert char['strength'] == 8 + 2 * (char['level'] - 1)
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_crash_before_rename_keeps_old_save(tmp_path, monkeypatch):
+    """Test that a crash after writing but before the rename is harmless"""
+    char = character_manager.create_character("CrashTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    
+    char['gold'] = 999
+    def crash(src, dst):
+        raise OSError("simulated crash")
+    monkeypatch.setattr(save_backends.os, "replace", crash)
+    
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path))
+    monkeypatch.undo()
+    
+    assert sorted(os.listdir(tmp_path)) == ["CrashTest_save.txt", save_backends.INDEX_FILENAME]
+    assert character_manager.load_character("CrashTest", str(tmp_path))['gold'] == 100
+
+def test_crash_during_write_keeps_old_save(tmp_path, monkeypatch):
+    """Test that a crash mid-write never leaves a torn save file"""
+    char = character_manager.create_character("TornTest", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    
+    char['level'] = 7
+    def crash(fd):
+        raise OSError("simulated power loss")
+    monkeypatch.setattr(save_backends.os, "fsync", crash)
+    
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path), fsync=True)
+    monkeypatch.undo()
+    
+    assert sorted(os.listdir(tmp_path)) == ["TornTest_save.txt", save_backends.INDEX_FILENAME]
+    assert character_manager.load_character("TornTest", str(tmp_path))['level'] == 1
+    
+    character_manager.save_character(char, str(tmp_path), fsync=True)
+    assert character_manager.load_character("TornTest", str(tmp_path))['level'] == 7
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_save_round_trip_keeps_all_fields(tmp_path):
+    """Test that binary saves keep optional fields, extra keys and commas"""
+    char = character_manager.create_character("BinTest", "Cleric")
+    char['inventory'].append("sword,of,commas")
+    char['inventory'].append("health_potion")
+    char['inventory'].append("health_potion")
+    char['equipped_weapon'] = "sword,of,commas"
+    char['equipped_armor'] = None
+    char['special_cooldown'] = 2
+    char['defense'] = 4
+    char['blessed'] = True
+    char['cursed'] = False
+    
+    character_manager.save_character(char, str(tmp_path),
+                                     save_format=character_manager.SAVE_FORMAT_BINARY)
+    with open(tmp_path / "BinTest_save.txt", "rb") as f:
+        assert f.read(4) == save_format.SAVE_MAGIC
+    loaded = character_manager.load_character("BinTest", str(tmp_path))
+    
+    assert loaded == char
+    assert loaded['inventory'].count("health_potion") == 2
+    assert loaded['equipped_armor'] is None
+    assert loaded['blessed'] is True and loaded['cursed'] is False
+    assert type(loaded['defense']) is int
+
+def test_text_saves_still_load(tmp_path):
+    """Test that load_character detects and reads the old text format"""
+    char = character_manager.create_character("TextTest", "Rogue")
+    char['inventory'].append("iron_sword")
+    
+    character_manager.save_character(char, str(tmp_path),
+                                     save_format=character_manager.SAVE_FORMAT_TEXT)
+    with open(tmp_path / "TextTest_save.txt") as f:
+        assert f.readline() == "NAME: TextTest\n"
+    
+    assert character_manager.load_character("TextTest", str(tmp_path)) == char
+
+def test_binary_save_skips_unknown_field_types():
+    """Test that extra fields with a type tag from a newer version are skipped"""
+    char = character_manager.create_character("Future", "Mage")
+    char['special_cooldown'] = 1
+    data = save_format.encode_character(char)
+    future_field = b"\x05sigil" + bytes((99,)) + (3).to_bytes(4, "little") + b"abc"
+    data = data[:6] + (2).to_bytes(2, "little") + data[8:] + future_field
+    
+    loaded = character_manager.decode_save_data(data)
+    
+    assert loaded == char
+    assert 'sigil' not in loaded
+    # Saves written before TYPE_BOOL existed (version 1) still load
+    assert character_manager.decode_save_data(data[:4] + (1).to_bytes(2, "little") + data[6:]) == char
+
+def test_binary_save_rejects_bad_data():
+    """Test truncated, newer-version and incomplete binary saves"""
+    char = character_manager.create_character("BadBin", "Mage")
+    data = character_manager.encode_save_data(char, character_manager.SAVE_FORMAT_BINARY)
+    
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_save_data(data[:-3])
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_save_data(data[:4] + (99).to_bytes(2, "little") + data[6:])
+    with pytest.raises(InvalidSaveDataError):
+        save_format.encode_character({'name': "BadBin"})
+
+# ============================================================================
+# DELTA SAVE TESTS
+# ============================================================================
+
+def test_dirty_fields_track_in_place_changes():
+    """Test that assignments and in-place list changes are both tracked"""
+    char = character_manager.create_character("DirtyTest", "Rogue")
+    assert char.dirty_fields() is None
+    
+    char.mark_clean()
+    char['gold'] += 5
+    char['inventory'].append("health_potion")
+    char['active_quests'].append("first_steps")
+    
+    assert char.dirty_fields() == {'gold', 'inventory', 'active_quests'}
+    char.mark_clean()
+    assert char.dirty_fields() == set()
+
+def test_delta_saves_append_and_replay(tmp_path):
+    """Test that changed fields are appended to the log and replayed on load"""
+    char = character_manager.create_character("DeltaTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    snapshot = (tmp_path / "DeltaTest_save.txt").read_bytes()
+    
+    char['health'] -= 30
+    char['inventory'].append("iron_sword")
+    character_manager.save_character_changes(char, str(tmp_path))
+    char['gold'] = 250
+    char['special_cooldown'] = 2
+    character_manager.save_character_changes(char, str(tmp_path))
+    
+    assert (tmp_path / "DeltaTest_save.txt").read_bytes() == snapshot
+    assert (tmp_path / "DeltaTest_save.delta").exists()
+    loaded = character_manager.load_character("DeltaTest", str(tmp_path))
+    assert loaded == char
+    
+    # The loaded character keeps appending to the same log
+    loaded['experience'] = 40
+    character_manager.save_character_changes(loaded, str(tmp_path))
+    assert character_manager.load_character("DeltaTest", str(tmp_path))['experience'] == 40
+
+def test_delta_log_compacts_past_limit(tmp_path):
+    """Test that a full save replaces the log once it grows too large"""
+    char = character_manager.create_character("CompactTest", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    
+    for gold in range(200):
+        char['gold'] = gold
+        character_manager.save_character_changes(char, str(tmp_path), max_log_bytes=500)
+        assert not os.path.exists(tmp_path / "CompactTest_save.delta") or \
+            os.path.getsize(tmp_path / "CompactTest_save.delta") <= 500
+    
+    assert character_manager.load_character("CompactTest", str(tmp_path))['gold'] == 199
+
+def test_torn_delta_tail_is_ignored(tmp_path):
+    """Test that a half-written last record is dropped and compacted away"""
+    char = character_manager.create_character("TornDelta", "Cleric")
+    character_manager.save_character(char, str(tmp_path))
+    char['gold'] = 111
+    character_manager.save_character_changes(char, str(tmp_path))
+    char['gold'] = 222
+    character_manager.save_character_changes(char, str(tmp_path))
+    
+    log_path = tmp_path / "TornDelta_save.delta"
+    log_path.write_bytes(log_path.read_bytes()[:-2])
+    loaded = character_manager.load_character("TornDelta", str(tmp_path))
+    assert loaded['gold'] == 111
+    
+    loaded['level'] = 2
+    character_manager.save_character_changes(loaded, str(tmp_path))
+    assert not log_path.exists()
+    reloaded = character_manager.load_character("TornDelta", str(tmp_path))
+    assert (reloaded['gold'], reloaded['level']) == (111, 2)
+
+def test_stale_deltas_are_skipped(tmp_path):
+    """Test that a log left behind by an older snapshot is not replayed"""
+    char = character_manager.create_character("StaleTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    char['gold'] = 5
+    character_manager.save_character_changes(char, str(tmp_path))
+    stale_log = (tmp_path / "StaleTest_save.delta").read_bytes()
+    
+    char['gold'] = 900
+    character_manager.save_character(char, str(tmp_path))
+    (tmp_path / "StaleTest_save.delta").write_bytes(stale_log)
+    
+    assert character_manager.load_character("StaleTest", str(tmp_path))['gold'] == 900
+
+@pytest.mark.parametrize("use_sqlite", [False, True])
+def test_delta_save_after_another_full_save_is_not_lost(tmp_path, use_sqlite):
+    """Test that a delta is not written against a snapshot replaced by another copy"""
+    backend = save_backends.SQLiteBackend(str(tmp_path / "saves.db")) if use_sqlite else None
+    directory = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("Hero", "Warrior"),
+                                     directory, backend=backend)
+    a = character_manager.load_character("Hero", directory, backend=backend)
+    b = character_manager.load_character("Hero", directory, backend=backend)
+
+    b['level'] = 2
+    character_manager.save_character(b, directory, backend=backend)
+    a['gold'] = 999
+    assert character_manager.save_character_changes(a, directory, backend=backend)
+
+    assert character_manager.load_character("Hero", directory, backend=backend)['gold'] == 999
+
+    # a now matches the save on disk again, so its next change is a delta
+    a['gold'] = 5
+    character_manager.save_character_changes(a, directory, backend=backend)
+    assert character_manager.load_character("Hero", directory, backend=backend)['gold'] == 5
+    if not use_sqlite:
+        assert (tmp_path / "Hero_save.delta").exists()
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+def test_cache_hits_and_misses(tmp_path, monkeypatch):
+    """Test that a second load comes from the cache without reading the save"""
+    character_manager.save_character(character_manager.create_character("CacheHit", "Mage"), str(tmp_path))
+    cache = character_manager.CharacterCache(capacity=4, save_directory=str(tmp_path))
+    
+    first = cache.load("CacheHit")
+    def no_read(name):
+        raise AssertionError("cached load should not read the save")
+    monkeypatch.setattr(cache.backend, "read", no_read)
+    
+    assert cache.load("CacheHit") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cache_reloads_when_save_changes(tmp_path):
+    """Test that a clean cached character is reloaded after an outside save"""
+    char = character_manager.create_character("CacheStale", "Rogue")
+    character_manager.save_character(char, str(tmp_path))
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+    cache.load("CacheStale")
+    
+    char['gold'] = 4321
+    character_manager.save_character(char, str(tmp_path))
+    save_path = tmp_path / "CacheStale_save.txt"
+    os.utime(save_path, ns=(1, 1))  # Make sure the version token differs
+    
+    assert cache.load("CacheStale")['gold'] == 4321
+    assert cache.invalidations == 1
+
+def test_cache_writes_back_on_eviction_and_flush(tmp_path):
+    """Test write-back of characters passed to save()"""
+    cache = character_manager.CharacterCache(capacity=2, save_directory=str(tmp_path))
+    heroes = [character_manager.create_character(f"Lru{i}", "Warrior") for i in range(3)]
+    
+    cache.save(heroes[0])
+    cache.save(heroes[1])
+    assert os.listdir(tmp_path) == []
+    cache.save(heroes[2])  # Evicts Lru0, which is written now
+    
+    assert sorted(os.listdir(tmp_path)) == ["Lru0_save.txt", save_backends.INDEX_FILENAME]
+    assert (cache.evictions, cache.writebacks) == (1, 1)
+    assert "Lru0" not in cache
+    
+    heroes[1]['gold'] = 7
+    assert cache.flush() == 2
+    assert character_manager.load_character("Lru1", str(tmp_path))['gold'] == 7
+    
+    # A character saved again after flush() is written on the next flush
+    loaded = cache.load("Lru2")
+    loaded['level'] = 3
+    cache.save(loaded)
+    assert cache.flush() == 1
+    assert character_manager.load_character("Lru2", str(tmp_path))['level'] == 3
+    assert cache.flush() == 0
+
+def test_cache_never_writes_edits_that_were_not_saved(tmp_path):
+    """Test quitting without saving: edits stay on the object but are never written"""
+    character_manager.save_character(character_manager.create_character("Quitter", "Cleric"), str(tmp_path))
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+    
+    playing = cache.load("Quitter")
+    playing['health'] = 0  # Dies, then quits without saving
+    
+    # Anyone else loading gets the live object, not a copy missing its edits
+    assert cache.load("Quitter") is playing
+    assert cache.flush() == 0
+    assert character_manager.load_character("Quitter", str(tmp_path))['health'] > 0
+    
+    cache.discard("Quitter")
+    reloaded = cache.load("Quitter")
+    assert reloaded is not playing
+    assert reloaded['health'] > 0
+
+def test_cache_sees_same_size_rewrite(tmp_path):
+    """Test a rewrite with the same size and timestamp as the cached save"""
+    char = character_manager.create_character("SameSize", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+    save_path = tmp_path / "SameSize_save.txt"
+    stamp = os.stat(save_path).st_mtime_ns
+    cache.load("SameSize")
+    
+    char['gold'] = 999 - char['gold'] % 10  # Same number of digits
+    character_manager.save_character(char, str(tmp_path))
+    os.utime(save_path, ns=(stamp, stamp))
+    
+    assert cache.load("SameSize")['gold'] == char['gold']
+
+# ============================================================================
+# ASYNC SAVE / LOAD TESTS
+# ============================================================================
+
+class SlowBackend(save_backends.TextFileBackend):
+    """Text backend whose writes take a while and are counted"""
+    
+    def __init__(self, save_directory):
+        super().__init__(save_directory)
+        self.writes = 0
+        self.active = 0
+        self.most_active = 0
+        self._count_lock = threading.Lock()
+    
+    def write(self, name, data):
+        with self._count_lock:
+            self.writes += 1
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        time.sleep(0.05)
+        super().write(name, data)
+        with self._count_lock:
+            self.active -= 1
+
+def test_async_saves_of_one_character_are_coalesced(tmp_path):
+    """Test that a burst of saves of one character becomes two writes"""
+    backend = SlowBackend(str(tmp_path))
+    char = character_manager.create_character("AsyncHero", "Mage")
+    
+    async def burst():
+        saves = []
+        for gold in range(10):
+            char['gold'] = gold
+            saves.append(asyncio.create_task(
+                character_manager.async_save_character(char, backend=backend)))
+            await asyncio.sleep(0)
+        assert all(await asyncio.gather(*saves))
+        return await character_manager.async_load_character("AsyncHero", backend=backend)
+    
+    loaded = asyncio.run(burst())
+    
+    assert backend.writes == 2  # The first save, then the newest queued data
+    assert loaded['gold'] == 9
+
+def test_async_io_is_bounded(tmp_path, monkeypatch):
+    """Test that at most ASYNC_IO_LIMIT writes run at once"""
+    monkeypatch.setattr(character_manager, "ASYNC_IO_LIMIT", 3)
+    backend = SlowBackend(str(tmp_path))
+    heroes = [character_manager.create_character(f"Bounded{i}", "Rogue") for i in range(9)]
+    
+    async def save_all():
+        await asyncio.gather(*(character_manager.async_save_character(h, backend=backend)
+                               for h in heroes))
+        return await character_manager.async_list_saved_characters(backend=backend)
+    
+    names = asyncio.run(save_all())
+    
+    assert backend.most_active == 3
+    assert sorted(names) == sorted(h['name'] for h in heroes)
+
+def test_async_api_raises_same_exceptions(tmp_path):
+    """Test that async calls raise the custom exceptions of the sync API"""
+    with pytest.raises(CharacterNotFoundError):
+        asyncio.run(character_manager.async_load_character("Nobody", str(tmp_path)))
+    with pytest.raises(InvalidSaveDataError):
+        asyncio.run(character_manager.async_save_character({'name': "Broken"}, str(tmp_path)))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,165 @@
+"""
+Test Combat System
+Tests fast battle resolution and battle helpers
+"""
+
+import pytest
+import sys
+import os
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+from custom_exceptions import CharacterDeadError
+
+# ============================================================================
+# ENEMY REGISTRY TESTS
+# ============================================================================
+
+def test_create_enemy_returns_independent_copies():
+    """Test that damaging one enemy does not change the template"""
+    first = combat_system.create_enemy("Goblin")
+    first['health'] = 0
+    second = combat_system.create_enemy("goblin")
+    
+    assert second['health'] == 50
+    assert second['max_health'] == 50
+    with pytest.raises(TypeError):
+        combat_system.get_enemy_templates()['goblin']['health'] = 1
+
+def test_enemy_templates_use_their_own_stats(tmp_path):
+    """Test that only max_health is derived from health when loading enemies"""
+    enemy_file = tmp_path / "enemies.txt"
+    enemy_file.write_text("ENEMY_ID: imp\nNAME: Imp\nHEALTH: 30\nSTRENGTH: 4\nMAGIC: 9\n"
+                          "XP_REWARD: 12\nGOLD_REWARD: 3\nMIN_LEVEL: 1\nMAX_LEVEL: 2\n")
+    
+    try:
+        templates = combat_system.load_enemy_templates(str(enemy_file))
+    finally:
+        combat_system.load_enemy_templates()
+    
+    assert dict(templates['imp']) == {'name': "Imp", 'health': 30, 'max_health': 30, 'strength': 4,
+                                      'magic': 9, 'xp_reward': 12, 'gold_reward': 3}
+    assert combat_system.ENEMY_DATA_FILE == combat_system.game_data.ENEMY_DATA_FILE
+
+def test_enemy_level_table():
+    """Test that level ranges follow the data file"""
+    assert combat_system.get_random_enemy_for_level(0)['name'] == "Goblin"
+    assert combat_system.get_random_enemy_for_level(2)['name'] == "Goblin"
+    assert combat_system.get_random_enemy_for_level(3)['name'] == "Orc"
+    assert combat_system.get_random_enemy_for_level(6)['name'] == "Dragon"
+    assert combat_system.get_random_enemy_for_level(500)['name'] == "Dragon"
+
+def test_new_enemy_type_from_data_file(tmp_path):
+    """Test that an enemy added to the data file needs no code changes"""
+    enemy_file = tmp_path / "enemies.txt"
+    enemy_file.write_text(
+        "ENEMY_ID: slime\nNAME: Slime\nHEALTH: 10\nSTRENGTH: 1\nMAGIC: 0\n"
+        "XP_REWARD: 1\nGOLD_REWARD: 1\nMIN_LEVEL: 1\nMAX_LEVEL: NONE\n"
+    )
+    try:
+        combat_system.load_enemy_templates(str(enemy_file))
+        assert combat_system.create_enemy("slime")['name'] == "Slime"
+        assert combat_system.get_random_enemy_for_level(40)['name'] == "Slime"
+    finally:
+        combat_system.load_enemy_templates()
+
+# ============================================================================
+# FAST RESOLUTION TESTS
+# ============================================================================
+
+def test_resolve_battle_fast_matches_loop():
+    """Test that the closed-form path matches start_battle exactly"""
+    rng = random.Random(7)
+    for _ in range(300):
+        char = {'name': 'Hero', 'health': rng.randint(1, 150), 'max_health': 150,
+                'strength': rng.randint(0, 30), 'special_cooldown': rng.randint(0, 4)}
+        enemy = {'name': 'Foe', 'health': rng.randint(0, 250), 'max_health': 250,
+                 'strength': rng.randint(0, 40), 'xp_reward': 30, 'gold_reward': 12}
+        loop_char, loop_enemy = dict(char), dict(enemy)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = combat_system.SimpleBattle(loop_char, loop_enemy).start_battle()
+        result = combat_system.resolve_battle_fast(char, enemy)
+        
+        assert result == expected
+        assert char == loop_char
+        assert enemy == loop_enemy
+
+def test_resolve_battle_fast_weak_character_vs_dragon():
+    """Test the min-1 damage case that makes the loop run for many turns"""
+    char = {'name': 'Weakling', 'health': 5000, 'max_health': 5000, 'strength': 0}
+    dragon = combat_system.create_enemy("dragon")
+    
+    result = combat_system.resolve_battle_fast(char, dragon)
+    
+    assert result['winner'] == 'player'
+    assert dragon['health'] == 0
+    assert char['health'] == 5000 - (200 - 1) * 25
+
+def test_resolve_battle_fast_falls_back_to_loop():
+    """Test that a custom action picker uses the normal turn loop"""
+    char = {'name': 'Runner', 'health': 100, 'strength': 10}
+    enemy = combat_system.create_enemy("orc")
+    
+    def always_run(battle):
+        return 'run'
+    
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = combat_system.resolve_battle_fast(char, enemy, choose_action=always_run)
+    
+    assert result['winner'] in ('escaped', 'enemy')
+
+def test_resolve_battle_fast_dead_character():
+    """Test that a dead character cannot fight"""
+    char = {'name': 'Ghost', 'health': 0, 'strength': 10}
+    
+    with pytest.raises(CharacterDeadError):
+        combat_system.resolve_battle_fast(char, combat_system.create_enemy("goblin"))
+
+# ============================================================================
+# BATTLE LOG SINK TESTS
+# ============================================================================
+
+def test_null_log_is_silent(capsys):
+    """Test that a NullBattleLog battle prints nothing"""
+    char = {'name': 'Hero', 'health': 120, 'max_health': 120, 'strength': 15}
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"),
+                                        log=combat_system.NullBattleLog())
+    result = battle.start_battle()
+    
+    assert result['winner'] == 'player'
+    assert capsys.readouterr().out == ""
+
+def test_ring_buffer_log_keeps_latest_messages():
+    """Test that the ring buffer keeps only the newest formatted lines"""
+    log = combat_system.RingBufferBattleLog(capacity=3)
+    char = {'name': 'Hero', 'health': 120, 'max_health': 120, 'strength': 15}
+    combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log=log).start_battle()
+    
+    lines = log.lines()
+    assert len(lines) == 3
+    assert lines[-1] == ">>> Hero attacks Goblin for 13 damage!"
+
+def test_batched_log_matches_print_output(capsys):
+    """Test that batched output is identical to the default print output"""
+    def fight(log):
+        char = {'name': 'Hero', 'health': 120, 'max_health': 120, 'strength': 15}
+        combat_system.SimpleBattle(char, combat_system.create_enemy("orc"), log=log).start_battle()
+    
+    fight(None)
+    printed = capsys.readouterr().out
+    
+    stream = io.StringIO()
+    log = combat_system.BatchedBattleLog(stream, batch_size=4)
+    fight(log)
+    log.flush()
+    
+    assert stream.getvalue() == printed
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+"""
+Test Game Data Loading
+Tests data caching and alternative loaders
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import data_pack
+import quest_handler
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError, CorruptedDataError
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+QUEST_FILE = os.path.join(DATA_DIR, "quests.txt")
+ITEM_FILE = os.path.join(DATA_DIR, "items.txt")
+
+QUEST_TEXT = (
+    "QUEST_ID: first_steps\nTITLE: First Steps\nDESCRIPTION: Start\n"
+    "REWARD_XP: 50\nREWARD_GOLD: 25\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n"
+)
+
+# ============================================================================
+# PARSE CACHE TESTS
+# ============================================================================
+
+def test_cached_load_skips_parsing(tmp_path, monkeypatch):
+    """Test that a warm cache returns data without parsing the file"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(QUEST_TEXT)
+    
+    cold = game_data.load_quests(str(quest_file), use_cache=True)
+    assert os.listdir(tmp_path / game_data.CACHE_DIR_NAME)
+    
+    def fail(lines):
+        raise AssertionError("warm load should not parse")
+    monkeypatch.setattr(game_data, "parse_quest_block", fail)
+    
+    assert game_data.load_quests(str(quest_file), use_cache=True) == cold
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    """Test that editing the data file forces a fresh parse"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(QUEST_TEXT)
+    game_data.load_quests(str(quest_file), use_cache=True)
+    
+    quest_file.write_text(QUEST_TEXT.replace("REWARD_XP: 50", "REWARD_XP: 99"))
+    quests = game_data.load_quests(str(quest_file), use_cache=True)
+    
+    assert quests['first_steps']['reward_xp'] == 99
+
+def test_cached_load_keeps_errors(tmp_path):
+    """Test that caching does not hide missing or invalid files"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_items(str(tmp_path / "missing.txt"), use_cache=True)
+    
+    bad_file = tmp_path / "bad.txt"
+    bad_file.write_text("not valid data")
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(str(bad_file), use_cache=True)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_is_lazy_and_matches_load(tmp_path):
+    """Test that the generator yields the same records as load_quests"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(QUEST_TEXT + QUEST_TEXT.replace("first_steps", "second_steps"))
+    
+    records = game_data.iter_quests(str(quest_file))
+    first = next(records)
+    
+    assert first['quest_id'] == 'first_steps'
+    assert [first] + list(records) == list(game_data.load_quests(str(quest_file)).values())
+
+def test_iter_items_collects_errors_with_line_numbers(tmp_path):
+    """Test that bad blocks are reported and skipped when errors is a list"""
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(
+        "ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\nEFFECT: health:5\n"
+        "COST: 5\nDESCRIPTION: Heals\n\n"
+        "ITEM_ID: broken\nNAME: Broken\nTYPE: junk\nEFFECT: health:5\n"
+        "COST: 5\nDESCRIPTION: Bad type\n\n"
+        "ITEM_ID: sword\nNAME: Sword\nTYPE: weapon\nEFFECT: strength:5\n"
+        "COST: nope\nDESCRIPTION: Bad cost\n"
+    )
+    errors = []
+    items = list(game_data.iter_items(str(item_file), errors=errors))
+    
+    assert [item['item_id'] for item in items] == ['potion']
+    assert [line for line, message in errors] == [8, 15]
+
+def test_load_reports_line_number_of_bad_block(tmp_path):
+    """Test that the dictionary loaders still stop at the first bad block"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(QUEST_TEXT + "QUEST_ID: oops\nREWARD_XP: lots\n")
+    
+    with pytest.raises(InvalidDataFormatError, match="line 9"):
+        game_data.load_quests(str(quest_file))
+
+# ============================================================================
+# SHARDED LOADER TESTS
+# ============================================================================
+
+def test_load_quest_shards_merges_files(tmp_path):
+    """Test that shards parsed in worker processes merge into one dict"""
+    (tmp_path / "a.txt").write_text(QUEST_TEXT)
+    (tmp_path / "b.txt").write_text(QUEST_TEXT.replace("first_steps", "second_steps"))
+    
+    quests = game_data.load_quest_shards(str(tmp_path / "*.txt"), max_workers=2)
+    
+    assert sorted(quests) == ['first_steps', 'second_steps']
+    assert quests['second_steps']['reward_xp'] == 50
+
+def test_load_quest_shards_detects_duplicates(tmp_path):
+    """Test that the same quest_id in two shards is rejected"""
+    (tmp_path / "a.txt").write_text(QUEST_TEXT)
+    (tmp_path / "b.txt").write_text(QUEST_TEXT)
+    
+    with pytest.raises(InvalidDataFormatError, match="first_steps"):
+        game_data.load_quest_shards(str(tmp_path / "*.txt"), max_workers=1)
+
+def test_load_item_shards_no_files(tmp_path):
+    """Test that an empty pattern is reported as missing data"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_item_shards(str(tmp_path / "*.txt"))
+
+# ============================================================================
+# DATA PACK TESTS
+# ============================================================================
+
+def test_data_pack_matches_text_data(tmp_path):
+    """Test that a compiled pack reads back exactly like the text loaders"""
+    quest_pack = str(tmp_path / "quests.pack")
+    item_pack = str(tmp_path / "items.pack")
+    data_pack.compile_quest_pack(QUEST_FILE, quest_pack)
+    data_pack.compile_item_pack(ITEM_FILE, item_pack)
+    
+    with data_pack.open_pack(quest_pack) as quests, data_pack.open_pack(item_pack) as items:
+        assert dict(quests) == game_data.load_quests(QUEST_FILE)
+        assert dict(items.items()) == game_data.load_items(ITEM_FILE)
+        assert 'first_steps' in quests
+        assert 'no_such_quest' not in quests
+        assert quests.get('no_such_quest') is None
+
+def test_data_pack_works_with_quest_handler(tmp_path):
+    """Test that quest_handler functions accept a pack unchanged"""
+    pack_path = str(tmp_path / "quests.pack")
+    data_pack.compile_quest_pack(QUEST_FILE, pack_path)
+    char = {'name': 'Packer', 'level': 1, 'health': 50, 'max_health': 50, 'strength': 5, 'magic': 5,
+            'active_quests': [], 'completed_quests': [], 'experience': 0, 'gold': 0}
+    
+    with data_pack.open_pack(pack_path) as quests:
+        available = quest_handler.get_available_quests(char, quests)
+        assert [q['quest_id'] for q in available] == ['first_steps']
+        quest_handler.accept_quest(char, 'first_steps', quests)
+        quest_handler.complete_quest(char, 'first_steps', quests)
+    
+    assert char['completed_quests'] == ['first_steps']
+
+def test_data_pack_rejects_bad_files(tmp_path):
+    """Test that missing or non-pack files raise data errors"""
+    with pytest.raises(MissingDataFileError):
+        data_pack.open_pack(str(tmp_path / "missing.pack"))
+    
+    bad_file = tmp_path / "bad.pack"
+    bad_file.write_bytes(b"definitely not a pack file, just some text padding" * 2)
+    with pytest.raises(CorruptedDataError):
+        data_pack.open_pack(str(bad_file))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""
+Test Inventory System
+Tests the counted Inventory container and its list compatibility
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from custom_exceptions import InventoryFullError, ItemNotFoundError
+
+def test_inventory_counts_and_removal():
+    """Test O(1) count/has/remove on the Inventory container"""
+    char = character_manager.create_character("BagTest", "Warrior")
+    for item_id in ["potion", "sword", "potion"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    
+    assert isinstance(char['inventory'], inventory_system.Inventory)
+    assert inventory_system.count_item(char, "potion") == 2
+    assert inventory_system.has_item(char, "sword")
+    assert inventory_system.get_inventory_space_remaining(char) == inventory_system.MAX_INVENTORY_SIZE - 3
+    
+    inventory_system.remove_item_from_inventory(char, "sword")
+    assert not inventory_system.has_item(char, "sword")
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.remove_item_from_inventory(char, "sword")
+    
+    assert inventory_system.clear_inventory(char) == ["potion", "potion"]
+    assert len(char['inventory']) == 0
+
+def test_inventory_capacity():
+    """Test that MAX_INVENTORY_SIZE still applies"""
+    char = {'inventory': inventory_system.Inventory(["gem"] * inventory_system.MAX_INVENTORY_SIZE)}
+    
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "gem")
+
+def test_inventory_display_order(capsys):
+    """Test that display groups items in first-added order"""
+    char = {'name': 'Hero', 'inventory': inventory_system.Inventory(["b", "a", "b"])}
+    inventory_system.display_inventory(char, {})
+    
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1:] == ["- b (unknown) x2", "- a (unknown) x1"]
+
+def test_inventory_save_round_trip(tmp_path):
+    """Test that inventories convert to and from the save-file list"""
+    char = character_manager.create_character("BagSave", "Cleric")
+    for item_id in ["potion", "staff", "potion"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("BagSave", str(tmp_path))
+    
+    assert isinstance(loaded['inventory'], inventory_system.Inventory)
+    assert loaded['inventory'] == ["potion", "potion", "staff"]
+    assert loaded['inventory'].to_list() == ["potion", "potion", "staff"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
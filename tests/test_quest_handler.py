@@ -0,0 +1,273 @@
+"""
+Test Quest Handler
+Tests the quest indexes, reward totals and bulk operations against the straightforward versions
+"""
+
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import data_pack
+import quest_handler
+from custom_exceptions import (
+    InvalidDataFormatError,
+    QuestNotFoundError,
+    QuestNotActiveError,
+    QuestRequirementsNotMetError,
+    CharacterDeadError
+)
+
+def make_quests(count, rng):
+    """Random quest dictionary where prerequisites point at earlier quests"""
+    quests = {}
+    for i in range(count):
+        prereq = 'NONE'
+        if i and rng.random() < 0.6:
+            prereq = f"q{rng.randrange(i)}"
+        quests[f"q{i}"] = {
+            'quest_id': f"q{i}", 'title': f"Quest {i}", 'description': "...",
+            'reward_xp': rng.randint(10, 500), 'reward_gold': rng.randint(5, 200),
+            'required_level': rng.randint(1, 20), 'prerequisite': prereq,
+        }
+    return quests
+
+def test_available_quests_match_brute_force():
+    """Test that the index returns exactly what checking every quest returns"""
+    rng = random.Random(20)
+    quests = make_quests(400, rng)
+    index = quest_handler.QuestIndex(quests)
+    for _ in range(200):
+        char = character_manager.create_character("Indexer", "Rogue")
+        char['level'] = rng.randint(1, 20)
+        char['completed_quests'] = rng.sample(list(quests), rng.randint(0, 150))
+        not_done = [qid for qid in quests if qid not in char['completed_quests']]
+        char['active_quests'] = rng.sample(not_done, rng.randint(0, 20))
+        
+        expected = [q for qid, q in quests.items()
+                    if quest_handler.can_accept_quest(char, qid, quests)]
+        
+        assert quest_handler.get_available_quests(char, index) == expected
+        assert quest_handler.get_available_quests(char, quests) == expected
+
+def test_quest_index_reuse(tmp_path):
+    """Test that only a QuestIndex is reused, and that dict edits are seen"""
+    quests = make_quests(30, random.Random(1))
+    index = quest_handler.QuestIndex(quests)
+    assert quest_handler.get_quest_index(index) is index
+    assert dict(index) == quests
+    assert quest_handler.get_quest_index(quests) is not quest_handler.get_quest_index(quests)
+    
+    # A plain dict edited in place (same size) is answered from the edit
+    quests['q0'] = dict(quests['q0'], required_level=99, prerequisite='NONE')
+    assert quest_handler.get_quests_by_level(quests, 99, 99) == [quests['q0']]
+    char = character_manager.create_character("Editor", "Mage")
+    char['level'] = 50
+    assert quests['q0'] not in quest_handler.get_available_quests(char, quests)
+    
+    # Nothing is cached behind the caller's back, not even for read-only packs
+    path = str(tmp_path / "quests.pack")
+    data_pack.compile_pack(quests, path, data_pack.KIND_QUEST)
+    with data_pack.open_pack(path) as pack:
+        assert quest_handler.get_quest_index(pack) is not quest_handler.get_quest_index(pack)
+        assert (quest_handler.get_available_quests(char, pack)
+                == quest_handler.get_available_quests(char, quest_handler.QuestIndex(pack)))
+
+def test_quests_by_level_match_scan():
+    """Test level range queries against filtering every quest"""
+    rng = random.Random(24)
+    quests = make_quests(500, rng)
+    index = quest_handler.QuestIndex(quests)
+    for _ in range(200):
+        low, high = rng.randint(-2, 22), rng.randint(-2, 22)
+        expected = [q for q in quests.values() if low <= q['required_level'] <= high]
+
+        assert quest_handler.get_quests_by_level(index, low, high) == expected
+        assert quest_handler.get_quests_by_level(quests, low, high) == expected
+
+class CountingQuests(dict):
+    """Quest dictionary that counts record lookups by id"""
+    lookups = 0
+
+    def __getitem__(self, quest_id):
+        self.lookups += 1
+        return dict.__getitem__(self, quest_id)
+
+def test_quest_index_keeps_ids_not_records():
+    """Test that level queries look records up instead of keeping copies"""
+    quests = CountingQuests(make_quests(300, random.Random(5)))
+    index = quest_handler.QuestIndex(quests)
+    assert not any(isinstance(value, list) and value and isinstance(value[0], dict)
+                   for value in vars(index).values())
+
+    quests.lookups = 0
+    found = index.quests_by_level(3, 4)
+
+    assert found == [q for q in quests.values() if 3 <= q['required_level'] <= 4]
+    assert quests.lookups == len(found)
+
+def chain_quests(links):
+    """Quest dictionary from {quest_id: prerequisite}"""
+    return {qid: {'quest_id': qid, 'title': qid, 'description': "", 'reward_xp': 1,
+                  'reward_gold': 1, 'required_level': 1, 'prerequisite': prereq}
+            for qid, prereq in links.items()}
+
+def test_prerequisite_chain_and_depth():
+    """Test chains, depths and topological order of the compiled graph"""
+    quests = chain_quests({'c': 'b', 'a': 'NONE', 'b': 'a', 'd': 'a', 'e': 'NONE'})
+    
+    graph = quest_handler.get_prerequisite_graph(quests)
+    
+    assert quest_handler.get_quest_prerequisite_chain('c', quests) == ['a', 'b', 'c']
+    assert quest_handler.get_quest_prerequisite_chain('e', quests) == ['e']
+    assert graph.depth == {'a': 0, 'b': 1, 'c': 2, 'd': 1, 'e': 0}
+    position = {qid: i for i, qid in enumerate(graph.order)}
+    assert sorted(graph.order) == sorted(quests)
+    assert all(position[graph.parent[q]] < position[q] for q in quests if graph.parent[q])
+
+def test_prerequisite_cycle_is_reported_with_path():
+    """Test that an A -> B -> C -> A cycle raises instead of hanging"""
+    quests = chain_quests({'start': 'NONE', 'a': 'c', 'b': 'a', 'c': 'b', 'tail': 'b'})
+    
+    with pytest.raises(InvalidDataFormatError) as error:
+        quest_handler.validate_quest_prerequisites(quests)
+    assert "a -> b -> c -> a" in str(error.value)
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.get_quest_prerequisite_chain('tail', quests)
+    
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.validate_quest_prerequisites(chain_quests({'loop': 'loop'}))
+
+def test_missing_prerequisite_is_reported():
+    """Test that a prerequisite that is not a quest is rejected"""
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.validate_quest_prerequisites(chain_quests({'a': 'ghost'}))
+
+def test_long_chain_is_linear():
+    """Test a 50k-deep chain (the old insert(0) walk was quadratic)"""
+    links = {'q0': 'NONE'}
+    links.update({f"q{i}": f"q{i - 1}" for i in range(1, 50_000)})
+    quests = chain_quests(links)
+    
+    graph = quest_handler.PrerequisiteGraph(quests)
+    
+    assert graph.depth['q49999'] == 49_999
+    assert len(quest_handler.get_quest_prerequisite_chain('q5000', quests)) == 5001
+
+def scanned_rewards(character, quests):
+    """Reward totals computed the original way, from the completed list"""
+    return quest_handler.get_total_quest_rewards_earned(character.to_dict(), quests)
+
+def test_reward_totals_follow_completed_quests(tmp_path):
+    """Test that running totals match a full scan through completes and reloads"""
+    rng = random.Random(23)
+    quests = quest_handler.QuestIndex(make_quests(300, rng))
+    char = character_manager.create_character("Totals", "Cleric")
+    char['level'] = 20
+
+    assert quest_handler.get_total_quest_rewards_earned(char, quests) == {'total_xp': 0, 'total_gold': 0}
+    totals = char.quest_totals
+    for qid in rng.sample([q for q in quests if quests[q]['prerequisite'] == 'NONE'], 40):
+        char['active_quests'].append(qid)
+        quest_handler.complete_quest(char, qid, quests)
+        assert char.quest_totals is totals
+        assert quest_handler.get_total_quest_rewards_earned(char, quests) == scanned_rewards(char, quests)
+
+    # Changes made outside complete_quest make the totals rebuild
+    char['completed_quests'].remove(next(iter(char['completed_quests'])))
+    assert quest_handler.get_total_quest_rewards_earned(char, quests) == scanned_rewards(char, quests)
+    assert char.quest_totals is not totals
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Totals", str(tmp_path))
+    assert loaded.quest_totals is None
+    progress = quest_handler.get_quest_progress(loaded, quests)
+    assert progress['completed'] == 39
+    assert progress['total_xp'] == scanned_rewards(char, quests)['total_xp']
+    
+    # Rebuilt by that first query, then kept up to date by complete_quest
+    totals = loaded.quest_totals
+    assert totals is not None
+    qid = next(q for q in quests if q not in loaded['completed_quests'])
+    loaded['active_quests'].append(qid)
+    quest_handler.complete_quest(loaded, qid, quests)
+    assert loaded.quest_totals is totals
+    assert quest_handler.get_total_quest_rewards_earned(loaded, quests) == scanned_rewards(loaded, quests)
+
+def test_reward_totals_see_edits_to_plain_quest_dicts():
+    """Test that totals are not cached against a dict that can change in place"""
+    quests = make_quests(10, random.Random(4))
+    char = character_manager.create_character("Editor", "Rogue")
+    char['active_quests'].append('q0')
+    quest_handler.complete_quest(char, 'q0', quests)
+    
+    quests['q0'] = dict(quests['q0'], reward_xp=12345)
+    
+    assert quest_handler.get_total_quest_rewards_earned(char, quests)['total_xp'] == 12345
+    assert char.quest_totals is None
+
+def test_complete_quests_matches_one_at_a_time():
+    """Test bulk completion against calling complete_quest in turn"""
+    rng = random.Random(25)
+    quests = make_quests(200, rng)
+    for _ in range(50):
+        bulk = character_manager.create_character("Bulk", "Warrior")
+        bulk['active_quests'].extend(rng.sample(list(quests), 40))
+        single = bulk.copy()
+        single['active_quests'] = bulk['active_quests'].copy()
+        single['completed_quests'] = bulk['completed_quests'].copy()
+        quest_ids = rng.sample(list(quests), 30) + ['missing'] + list(bulk['active_quests'])[:3]
+
+        outcomes = quest_handler.complete_quests(bulk, quest_ids, quests)
+
+        for quest_id, outcome in zip(quest_ids, outcomes):
+            assert outcome['quest_id'] == quest_id
+            try:
+                rewards = quest_handler.complete_quest(single, quest_id, quests)
+            except (QuestNotFoundError, QuestNotActiveError) as e:
+                assert type(outcome['error']) is type(e)
+                assert not outcome['success']
+            else:
+                assert outcome['success'] and outcome['error'] is None
+                assert (outcome['xp'], outcome['gold']) == (rewards['xp'], rewards['gold'])
+        assert bulk == single
+        assert quest_handler.get_total_quest_rewards_earned(bulk, quests) == scanned_rewards(bulk, quests)
+
+def test_complete_quests_leaves_dead_character_unchanged():
+    """Test that a dead character gets errors and no partial changes"""
+    quests = make_quests(20, random.Random(3))
+    char = character_manager.create_character("Ghost", "Mage")
+    char['active_quests'].extend(["q1", "q2"])
+    char['health'] = 0
+    before = char.to_dict()
+    before['active_quests'] = before['active_quests'].copy()
+
+    outcomes = quest_handler.complete_quests(char, ["q1", "q2", "q3"], quests)
+
+    assert [type(o['error']) for o in outcomes] == [CharacterDeadError, CharacterDeadError, QuestNotActiveError]
+    assert char == before
+
+def test_bulk_quest_operations_across_characters():
+    """Test accept_quests and the cross-character batch"""
+    quests = chain_quests({'a': 'NONE', 'b': 'a', 'c': 'NONE'})
+    heroes = [character_manager.create_character(f"Hero{i}", "Rogue") for i in range(3)]
+
+    accepted = quest_handler.accept_quests(heroes[0], ['a', 'b', 'c', 'a'], quests)
+    assert [o['success'] for o in accepted] == [True, False, True, False]
+    assert isinstance(accepted[1]['error'], QuestRequirementsNotMetError)
+    for hero in heroes[1:]:
+        quest_handler.accept_quests(hero, ['a'], quests)
+
+    results = quest_handler.complete_quests_for_characters(
+        ((hero, ['a', 'c']) for hero in heroes), quests)
+
+    assert [[o['success'] for o in outcomes] for outcomes in results] == [
+        [True, True], [True, False], [True, False]]
+    assert all(hero['completed_quests'] == ['a'] for hero in heroes[1:])
+    assert heroes[0]['completed_quests'] == ['a', 'c']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
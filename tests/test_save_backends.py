@@ -0,0 +1,235 @@
+"""
+Test Save Backends
+Tests the text-file and SQLite save storage and migration between them
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+from custom_exceptions import CharacterNotFoundError
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = save_backends.SQLiteBackend(str(tmp_path / "saves.db"))
+    yield backend
+    backend.close()
+
+def test_sqlite_backend_round_trip(sqlite_backend):
+    """Test save/load/list/delete through the SQLite backend"""
+    char = character_manager.create_character("SqlHero", "Mage")
+    char['gold'] = 321
+    
+    character_manager.save_character(char, backend=sqlite_backend)
+    loaded = character_manager.load_character("SqlHero", backend=sqlite_backend)
+    
+    assert loaded == char
+    assert character_manager.list_saved_characters(backend=sqlite_backend) == ["SqlHero"]
+    
+    character_manager.delete_character("SqlHero", backend=sqlite_backend)
+    assert character_manager.list_saved_characters(backend=sqlite_backend) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SqlHero", backend=sqlite_backend)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SqlHero", backend=sqlite_backend)
+
+def test_sqlite_backend_uses_wal(sqlite_backend):
+    """Test that the database runs in WAL journal mode"""
+    mode = sqlite_backend._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    
+    assert mode.lower() == "wal"
+
+def test_migrate_between_backends(tmp_path, sqlite_backend):
+    """Test copying saves from files to SQLite and back"""
+    text_backend = save_backends.TextFileBackend(str(tmp_path / "saves"))
+    for name in ["Ann", "Bo", "Cy"]:
+        character_manager.save_character(character_manager.create_character(name, "Rogue"),
+                                         backend=text_backend)
+    
+    assert save_backends.migrate_saves(text_backend, sqlite_backend, batch_size=2) == 3
+    assert sqlite_backend.list_names() == ["Ann", "Bo", "Cy"]
+    
+    restored = save_backends.open_backend(str(tmp_path / "restored"))
+    save_backends.migrate_saves(sqlite_backend, restored)
+    assert sorted(restored.list_names()) == ["Ann", "Bo", "Cy"]
+    assert character_manager.load_character("Bo", backend=restored)['class'] == "Rogue"
+
+def test_sqlite_delta_log(sqlite_backend):
+    """Test incremental saves, migration and deletion with the SQLite backend"""
+    char = character_manager.create_character("SqlDelta", "Rogue")
+    character_manager.save_character(char, backend=sqlite_backend)
+    char['gold'] = 42
+    character_manager.save_character_changes(char, backend=sqlite_backend)
+    
+    assert sqlite_backend.read_deltas("SqlDelta")
+    assert character_manager.load_character("SqlDelta", backend=sqlite_backend)['gold'] == 42
+    
+    character_manager.delete_character("SqlDelta", backend=sqlite_backend)
+    assert sqlite_backend.read_deltas("SqlDelta") == b""
+
+def test_migrate_keeps_delta_logs(tmp_path, sqlite_backend):
+    """Test that migration copies unsaved-to-snapshot changes too"""
+    text_backend = save_backends.TextFileBackend(str(tmp_path / "saves"))
+    char = character_manager.create_character("Mover", "Mage")
+    character_manager.save_character(char, backend=text_backend)
+    char['experience'] = 77
+    character_manager.save_character_changes(char, backend=text_backend)
+    
+    save_backends.migrate_saves(text_backend, sqlite_backend)
+    
+    assert character_manager.load_character("Mover", backend=sqlite_backend)['experience'] == 77
+
+@pytest.mark.parametrize("use_sqlite", [False, True])
+def test_batch_save_and_load(tmp_path, sqlite_backend, use_sqlite):
+    """Test that batch save/load report per-character results without stopping"""
+    backend = sqlite_backend if use_sqlite else save_backends.TextFileBackend(str(tmp_path / "saves"))
+    heroes = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(20)]
+    broken = {'name': "Broken"}
+    
+    results = character_manager.save_characters(heroes[:10] + [broken] + heroes[10:], backend=backend)
+    
+    assert [r['success'] for r in results] == [True] * 10 + [False] + [True] * 10
+    assert results[10]['error'] is not None
+    assert results[0] == {'name': "Hero0", 'success': True, 'error': None}
+    
+    loaded = character_manager.load_characters(["Hero3", "Nobody", "Hero19"], backend=backend)
+    
+    assert [r['name'] for r in loaded] == ["Hero3", "Nobody", "Hero19"]
+    assert loaded[0]['character'] == heroes[3]
+    assert loaded[2]['character'] == heroes[19]
+    assert not loaded[1]['success']
+    assert isinstance(loaded[1]['error'], CharacterNotFoundError)
+
+def test_batch_save_empty():
+    """Test that saving nothing touches nothing"""
+    assert character_manager.save_characters([], save_directory="does/not/exist") == []
+    assert not os.path.exists("does/not/exist")
+
+# ============================================================================
+# SAVE INDEX TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("use_sqlite", [False, True])
+def test_summaries_follow_saves_and_deletes(tmp_path, sqlite_backend, use_sqlite, monkeypatch):
+    """Test that the index is kept up to date and read without loading saves"""
+    backend = sqlite_backend if use_sqlite else save_backends.TextFileBackend(str(tmp_path / "saves"))
+    mage = character_manager.create_character("Zed", "Mage")
+    character_manager.save_character(mage, backend=backend)
+    character_manager.save_characters([character_manager.create_character("Amy", "Cleric"),
+                                       character_manager.create_character("Bob", "Rogue")],
+                                      backend=backend)
+    mage['level'] = 4
+    mage['gold'] = 90
+    character_manager.save_character_changes(mage, backend=backend)
+    character_manager.delete_character("Bob", backend=backend)
+    
+    def no_load(*args, **kwargs):
+        raise AssertionError("summaries should come from the index")
+    monkeypatch.setattr(character_manager, "load_characters", no_load)
+    summaries = character_manager.list_saved_character_summaries(backend=backend)
+    
+    # Delta saves leave the summary at the last full save
+    assert [(s['name'], s['class'], s['level'], s['gold']) for s in summaries] == [
+        ("Amy", "Cleric", 1, 100), ("Zed", "Mage", 1, 100)]
+    assert all(isinstance(s['saved_at'], float) for s in summaries)
+    
+    character_manager.save_character(mage, backend=backend)
+    summaries = character_manager.list_saved_character_summaries(backend=backend)
+    assert (summaries[1]['level'], summaries[1]['gold']) == (4, 90)
+
+def test_missing_index_is_rebuilt(tmp_path):
+    """Test that saves made before the index existed are indexed once"""
+    backend = save_backends.TextFileBackend(str(tmp_path))
+    for name in ["Old1", "Old2"]:
+        character_manager.save_character(character_manager.create_character(name, "Warrior"),
+                                         backend=backend)
+    os.remove(backend.index_path)
+    (tmp_path / "Junk_save.txt").write_text("not a save")
+    
+    summaries = character_manager.list_saved_character_summaries(str(tmp_path))
+    
+    assert [s['name'] for s in summaries] == ["Junk", "Old1", "Old2"]
+    assert summaries[0]['level'] is None
+    assert summaries[1]['level'] == 1
+    assert set(backend.read_summaries()) == {"Old1", "Old2"}
+
+@pytest.mark.parametrize("use_sqlite", [False, True])
+def test_summary_older_than_save_is_rebuilt(tmp_path, sqlite_backend, use_sqlite, monkeypatch):
+    """Test a crash between replacing a save and appending its summary"""
+    backend = sqlite_backend if use_sqlite else save_backends.TextFileBackend(str(tmp_path / "saves"))
+    hero = character_manager.create_character("Crasher", "Warrior")
+    character_manager.save_character(hero, backend=backend)
+
+    hero['level'] = 9
+    def crash(summaries):
+        raise OSError("simulated crash")
+    monkeypatch.setattr(backend, "update_summaries", crash)
+    with pytest.raises(OSError):
+        character_manager.save_character(hero, backend=backend)
+    monkeypatch.undo()
+    if not use_sqlite:
+        # Coarse file timestamps: make sure the save is visibly newer
+        stamp = backend.read_summaries()["Crasher"]['saved_at'] + 1
+        os.utime(backend.path_for("Crasher"), (stamp, stamp))
+
+    summaries = character_manager.list_saved_character_summaries(backend=backend)
+
+    assert summaries[0]['level'] == 9
+    assert backend.read_summaries()["Crasher"]['level'] == 9
+
+def test_deleting_every_save_leaves_only_tombstones(tmp_path):
+    """Test that deletes are recorded in the index without listing the folder"""
+    backend = save_backends.TextFileBackend(str(tmp_path))
+    for name in ["Gone1", "Gone2"]:
+        character_manager.save_character(character_manager.create_character(name, "Mage"), backend=backend)
+
+    def no_listing(*args, **kwargs):
+        raise AssertionError("delete should not list the save folder")
+    backend.list_names = no_listing
+    character_manager.delete_character("Gone1", backend=backend)
+    character_manager.delete_character("Gone2", backend=backend)
+
+    assert os.listdir(tmp_path) == [save_backends.INDEX_FILENAME]
+    assert backend.read_summaries() == {}
+    assert character_manager.list_saved_character_summaries(backend=backend) == []
+
+def test_migrated_summaries_are_not_stale(tmp_path, sqlite_backend, monkeypatch):
+    """Test that migration stamps summaries so they are not rebuilt"""
+    text_backend = save_backends.TextFileBackend(str(tmp_path / "saves"))
+    character_manager.save_characters([character_manager.create_character(name, "Cleric")
+                                       for name in ["Mia", "Ned"]], backend=sqlite_backend)
+    
+    save_backends.migrate_saves(sqlite_backend, text_backend)
+    
+    def no_load(*args, **kwargs):
+        raise AssertionError("migrated summaries should not be rebuilt")
+    monkeypatch.setattr(character_manager, "load_characters", no_load)
+    summaries = character_manager.list_saved_character_summaries(backend=text_backend)
+    assert [(s['name'], s['level']) for s in summaries] == [("Mia", 1), ("Ned", 1)]
+
+def test_text_index_compacts_and_skips_torn_lines(tmp_path, monkeypatch):
+    """Test that superseded journal lines are compacted away"""
+    monkeypatch.setattr(save_backends, "INDEX_COMPACT_BYTES", 2000)
+    backend = save_backends.TextFileBackend(str(tmp_path))
+    char = character_manager.create_character("Grinder", "Rogue")
+    for gold in range(100):
+        char['gold'] = gold
+        character_manager.save_character(char, backend=backend)
+    
+    assert os.path.getsize(backend.index_path) < 2000
+    with open(backend.index_path, "a") as f:
+        f.write('{"name": "Torn", "cla')
+    assert backend.read_summaries()["Grinder"]['gold'] == 99
+    assert "Torn" not in backend.read_summaries()
+    
+    # The next append starts on a new line instead of joining the torn one
+    char['gold'] = 5
+    character_manager.save_character(char, backend=backend)
+    assert backend.read_summaries()["Grinder"]['gold'] == 5
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])